@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
@@ -7,17 +7,20 @@ from app.models.activity import ActivityLog
 from app.models.user import User, UserRole
 from app.schemas.activity import ActivityLog as ActivityLogSchema
 from app.core.dependencies import get_current_user
+from app.core.pagination import paginate
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ActivityLogSchema])
 def get_activity_logs(
+    response: Response,
     entity_type: Optional[str] = Query(None, description="Filter by entity type (finding, audit, project, etc.)"),
     entity_id: Optional[int] = Query(None, description="Filter by entity ID"),
     action: Optional[str] = Query(None, description="Filter by action"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -38,11 +41,11 @@ def get_activity_logs(
         else:
             raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Order by most recent first
-    query = query.order_by(ActivityLog.created_at.desc())
-    
-    # Apply pagination
-    logs = query.offset(skip).limit(limit).all()
+    # Most recent first, paginated on (created_at, id)
+    logs = paginate(
+        query, [ActivityLog.created_at, ActivityLog.id], response,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
     
     # Format response
     result = []
@@ -61,10 +64,12 @@ def get_activity_logs(
 
 @router.get("/{entity_type}/{entity_id}", response_model=List[ActivityLogSchema])
 def get_entity_activity_logs(
+    response: Response,
     entity_type: str,
     entity_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -72,9 +77,12 @@ def get_entity_activity_logs(
     query = db.query(ActivityLog).options(joinedload(ActivityLog.user)).filter(
         ActivityLog.entity_type == entity_type,
         ActivityLog.entity_id == entity_id
-    ).order_by(ActivityLog.created_at.desc())
+    )
     
-    logs = query.offset(skip).limit(limit).all()
+    logs = paginate(
+        query, [ActivityLog.created_at, ActivityLog.id], response,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
     
     # Format response
     result = []
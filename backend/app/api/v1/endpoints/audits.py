@@ -1,37 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from typing import List, Optional
 from app.db.database import get_db
 from app.models.audit import Audit, AuditStatus
 from app.models.project import Project
-from app.models.template import Template, TemplateItem
+from app.models.template import Template
 from app.models.finding import Finding
-from app.models.user import User, UserRole
+from app.models.user import User
 from app.schemas.audit import Audit as AuditSchema, AuditCreate, AuditUpdate
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, project_access_clause
 from app.core.activity_logger import log_activity
-from app.core.notification_service import create_notification
+from app.core.notification_service import create_notifications_for
+from app.core.finding_stats import record_findings_added, record_findings_removed
+from app.core.template_findings import create_findings_from_template
+from app.core.audit_copy import copy_audit_findings
+from app.core.pagination import paginate
+from app.core.bulk_delete import delete_audits
+from app.services.file_reaper import file_reaper
 from app.models.notification import NotificationType
 
 router = APIRouter()
 
 def check_project_access(user: User, project_id: int, db: Session):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    row = db.query(
+        Project,
+        project_access_clause(user, Project.id).label("allowed")
+    ).filter(Project.id == project_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    if user.role == UserRole.PLATFORM_ADMIN:
-        return project
-    elif user.role == UserRole.ORG_ADMIN:
-        if project.organization_id != user.organization_id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-        return project
-    else:
-        # Auditor can only access assigned projects
-        project_ids = [pu.project_id for pu in user.project_assignments]
-        if project_id not in project_ids:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-        return project
+    if not row.allowed:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return row.Project
 
 @router.post("/", response_model=AuditSchema, status_code=status.HTTP_201_CREATED)
 def create_audit(
@@ -66,8 +66,7 @@ def create_audit(
     
     # Create findings from template if provided
     if audit.template_id:
-        from app.core.i18n import get_template_field
-        template = db.query(Template).filter(Template.id == audit.template_id).first()
+        template = db.query(Template.id).filter(Template.id == audit.template_id).first()
         if template:
             # Get language from request (default to 'tr')
             lang = audit.language if audit.language else "tr"
@@ -75,24 +74,9 @@ def create_audit(
             if lang not in ["tr", "en"]:
                 lang = "tr"
             
-            # Debug: Log the language being used
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Creating findings from template {audit.template_id} with language: {lang}")
-            
-            findings_count = 0
-            for item in template.items:
-                finding = Finding(
-                    audit_id=db_audit.id,
-                    title=get_template_field(item, "default_title", lang),
-                    description=get_template_field(item, "default_description", lang),
-                    control_reference=item.control_reference,
-                    severity=item.default_severity,
-                    status=item.default_status,
-                    recommendation=get_template_field(item, "default_recommendation", lang)
-                )
-                db.add(finding)
-                findings_count += 1
+            # Findings are projected from the template items in SQL, in one statement
+            findings_count = create_findings_from_template(db, audit.template_id, db_audit.id, lang)
+            record_findings_added(db, Finding.audit_id == db_audit.id)
             
             # Log template findings creation
             log_activity(
@@ -110,8 +94,10 @@ def create_audit(
 
 @router.get("/", response_model=List[AuditSchema])
 def read_audits(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
     project_id: int = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -123,16 +109,9 @@ def read_audits(
         query = query.filter(Audit.project_id == project_id)
     else:
         # Filter by accessible projects
-        if current_user.role == UserRole.PLATFORM_ADMIN:
-            pass  # See all
-        elif current_user.role == UserRole.ORG_ADMIN:
-            project_ids = [p.id for p in db.query(Project).filter(Project.organization_id == current_user.organization_id).all()]
-            query = query.filter(Audit.project_id.in_(project_ids))
-        else:
-            project_ids = [pu.project_id for pu in current_user.project_assignments]
-            query = query.filter(Audit.project_id.in_(project_ids))
+        query = query.filter(project_access_clause(current_user, Audit.project_id))
     
-    audits = query.offset(skip).limit(limit).all()
+    audits = paginate(query, [Audit.id], response, cursor=cursor, skip=skip, limit=limit)
     return audits
 
 @router.get("/{audit_id}", response_model=AuditSchema)
@@ -185,20 +164,20 @@ def update_audit(
         # Create notification if status changed
         if "status" in changes:
             new_status = update_data.get("status")
-            # Notify project users about status change
+            # Notify project users about status change (recipients resolved in SQL at commit)
             from app.models.project import ProjectUser
-            project_users = db.query(ProjectUser).filter(ProjectUser.project_id == db_audit.project_id).all()
-            for project_user in project_users:
-                if project_user.user_id != current_user.id:
-                    create_notification(
-                        db=db,
-                        user_id=project_user.user_id,
-                        notification_type=NotificationType.AUDIT_STATUS_CHANGED,
-                        title="Denetim Durumu Değişti",
-                        message=f'"{db_audit.name}" denetiminin durumu "{new_status.value}" olarak güncellendi',
-                        related_entity_type="audit",
-                        related_entity_id=db_audit.id
-                    )
+            create_notifications_for(
+                db=db,
+                recipients=select(ProjectUser.user_id).where(
+                    ProjectUser.project_id == db_audit.project_id,
+                    ProjectUser.user_id != current_user.id
+                ),
+                notification_type=NotificationType.AUDIT_STATUS_CHANGED,
+                title="Denetim Durumu Değişti",
+                message=f'"{db_audit.name}" denetiminin durumu "{new_status.value}" olarak güncellendi',
+                related_entity_type="audit",
+                related_entity_id=db_audit.id
+            )
     
     db.commit()
     db.refresh(db_audit)
@@ -228,14 +207,19 @@ def delete_audit(
         details={"name": audit_name}
     )
     
-    db.delete(db_audit)
+    record_findings_removed(db, Finding.audit_id == audit_id)
+    released_files, _ = delete_audits(db, Audit.id == audit_id)
     db.commit()
+    if released_files:
+        file_reaper.wake()
     return None
 
 @router.post("/{audit_id}/copy", response_model=AuditSchema, status_code=status.HTTP_201_CREATED)
 def copy_audit(
     audit_id: int,
     new_name: str,
+    include_evidences: bool = Query(False, description="Also copy the findings' evidences (files are shared, not duplicated)"),
+    include_comments: bool = Query(False, description="Also copy the findings' comments"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -267,32 +251,23 @@ def copy_audit(
         details={"source_audit_id": audit_id, "source_name": source_audit.name}
     )
     
-    # Copy findings
-    findings_count = 0
-    for finding in source_audit.findings:
-        new_finding = Finding(
-            audit_id=new_audit.id,
-            title=finding.title,
-            description=finding.description,
-            control_reference=finding.control_reference,
-            severity=finding.severity,
-            status=finding.status,
-            recommendation=finding.recommendation,
-            assigned_to_user_id=finding.assigned_to_user_id,
-            due_date=finding.due_date
-        )
-        db.add(new_finding)
-        findings_count += 1
+    # Copy findings server-side, in one INSERT ... SELECT statement
+    copied = copy_audit_findings(db, audit_id, new_audit.id, include_evidences, include_comments)
     
     # Log findings copy
-    if findings_count > 0:
+    if copied["findings"] > 0:
+        record_findings_added(db, Finding.audit_id == new_audit.id)
         log_activity(
             db=db,
             entity_type="audit",
             entity_id=new_audit.id,
             action="findings_copied",
             user_id=current_user.id,
-            details={"findings_count": findings_count}
+            details={
+                "findings_count": copied["findings"],
+                "evidences_count": copied["evidences"],
+                "comments_count": copied["comments"]
+            }
         )
     
     db.commit()
@@ -4,10 +4,11 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 from app.db.database import get_db
 from app.models.user import User
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
 from app.core.config import settings
 from app.schemas.auth import Token, Login
 from app.core.dependencies import get_current_user
+from app.core.user_cache import user_cache
 
 router = APIRouter()
 
@@ -17,7 +18,10 @@ async def login(
     db: Session = Depends(get_db)
 ):
     user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Return the connection to the pool before waiting on bcrypt; a burst of logins
+    # must not pin every pooled connection while hashes are queued
+    db.close()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -51,11 +55,13 @@ async def change_password(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    if not verify_password(current_password, current_user.hashed_password):
+    hashed_password = current_user.hashed_password
+    db.rollback()  # release the connection while bcrypt runs
+    if not await verify_password_async(current_password, hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect current password")
     
-    from app.core.security import get_password_hash
-    current_user.hashed_password = get_password_hash(new_password)
+    current_user.hashed_password = await get_password_hash_async(new_password)
     db.commit()
+    user_cache.invalidate_user(current_user.id)
     return {"message": "Password updated successfully"}
 
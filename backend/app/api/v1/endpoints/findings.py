@@ -1,12 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, Response, BackgroundTasks
+from sqlalchemy.orm import Session, joinedload, selectinload, noload
+from typing import List, Optional, Set
 import os
-import uuid
 from app.db.database import get_db
 from app.models.finding import Finding, Evidence, FindingComment
-from app.models.audit import Audit
 from app.models.user import User, UserRole
 from app.schemas.finding import (
     Finding as FindingSchema, 
@@ -15,38 +12,57 @@ from app.schemas.finding import (
     Evidence as EvidenceSchema, 
     EvidenceCreate,
     FindingComment as FindingCommentSchema,
-    FindingCommentCreate
+    FindingCommentCreate,
+    serialize_findings_json,
+    finding_comment_list_adapter
 )
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, check_audit_access, audit_access_clause
 from app.core.config import settings
 from app.core.activity_logger import log_activity
 from app.core.notification_service import create_notification
+from app.core.finding_stats import record_findings_added, record_findings_removed
+from app.core.pagination import paginate, NEXT_CURSOR_HEADER
+from app.core.evidence_storage import (
+    store_upload, file_too_large, release_evidence_files, absolute_path, evidence_etag,
+    rendition_file_path
+)
+from app.core.file_responses import file_response
+from app.services.evidence_renditions import is_raster_image, generate_renditions, get_rendition
+from app.services.file_reaper import file_reaper
 from app.models.notification import NotificationType
 
 router = APIRouter()
 
-def check_audit_access(user: User, audit_id: int, db: Session):
-    audit = db.query(Audit).filter(Audit.id == audit_id).first()
-    if not audit:
-        raise HTTPException(status_code=404, detail="Audit not found")
-    
-    from app.models.project import Project
-    project = db.query(Project).filter(Project.id == audit.project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    if user.role == UserRole.PLATFORM_ADMIN:
-        return audit
-    elif user.role == UserRole.ORG_ADMIN:
-        if project.organization_id != user.organization_id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-        return audit
+# Relationships that list endpoints can embed via ?include=
+FINDING_INCLUDES = ("comments", "evidences")
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    requested = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = requested - set(FINDING_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(FINDING_INCLUDES)}"
+        )
+    return requested
+
+def finding_load_options(includes: Set[str] = frozenset(FINDING_INCLUDES)) -> list:
+    """
+    Loader profile for finding responses.
+    Collections are fetched with selectinload (one batched IN query per relationship)
+    instead of joinedload, so comment rows never multiply finding rows and
+    LIMIT/OFFSET apply to findings directly. Excluded relationships are not loaded at all.
+    """
+    options = [selectinload(Finding.assigned_to)]
+    if "comments" in includes:
+        options.append(selectinload(Finding.comments).selectinload(FindingComment.user))
+    else:
+        options.append(noload(Finding.comments))
+    if "evidences" in includes:
+        options.append(selectinload(Finding.evidences))
     else:
-        # Auditor can only access assigned projects
-        project_ids = [pu.project_id for pu in user.project_assignments]
-        if audit.project_id not in project_ids:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-        return audit
+        options.append(noload(Finding.evidences))
+    return options
 
 @router.post("/", response_model=FindingSchema, status_code=status.HTTP_201_CREATED)
 def create_finding(
@@ -64,6 +80,7 @@ def create_finding(
         db_finding.assigned_to_user_id = assigned_to_user_id
     db.add(db_finding)
     db.flush()
+    record_findings_added(db, Finding.id == db_finding.id)
     
     # Log activity
     log_activity(
@@ -93,98 +110,50 @@ def create_finding(
     finding_id = db_finding.id
     
     # Reload with relationships
-    db_finding = db.query(Finding).options(
-        joinedload(Finding.assigned_to),
-        joinedload(Finding.comments).joinedload(FindingComment.user)
-    ).filter(Finding.id == finding_id).first()
+    db_finding = db.query(Finding).options(*finding_load_options()).filter(Finding.id == finding_id).first()
     
     if not db_finding:
         raise HTTPException(status_code=404, detail="Finding not found after create")
     
-    # Format response
-    finding_dict = {
-        **{k: v for k, v in db_finding.__dict__.items() if not k.startswith('_')},
-        "assigned_to": {
-            "id": db_finding.assigned_to.id,
-            "full_name": db_finding.assigned_to.full_name,
-            "email": db_finding.assigned_to.email
-        } if db_finding.assigned_to else None,
-        "comments": [
-            {
-                **{k: v for k, v in comment.__dict__.items() if not k.startswith('_')},
-                "user": {
-                    "id": comment.user.id,
-                    "full_name": comment.user.full_name,
-                    "email": comment.user.email
-                } if comment.user else None
-            }
-            for comment in (db_finding.comments or [])
-        ] if db_finding.comments else []
-    }
-    return FindingSchema(**finding_dict)
+    return FindingSchema.model_validate(db_finding)
 
 @router.get("/", response_model=List[FindingSchema])
 def read_findings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    include: Optional[str] = Query(
+        ",".join(FINDING_INCLUDES),
+        description="Comma-separated relationships to embed (comments, evidences); empty to skip both"
+    ),
     audit_id: int = None,
     assigned_to_user_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(Finding).options(
-        joinedload(Finding.assigned_to),
-        joinedload(Finding.comments).joinedload(FindingComment.user)
-    )
+    query = db.query(Finding).options(*finding_load_options(parse_include(include)))
     
     if audit_id:
         check_audit_access(current_user, audit_id, db)
         query = query.filter(Finding.audit_id == audit_id)
     else:
         # Filter by accessible audits
-        from app.models.project import Project
-        if current_user.role == UserRole.PLATFORM_ADMIN:
-            pass  # See all
-        elif current_user.role == UserRole.ORG_ADMIN:
-            project_ids = [p.id for p in db.query(Project).filter(Project.organization_id == current_user.organization_id).all()]
-            audit_ids = [a.id for a in db.query(Audit).filter(Audit.project_id.in_(project_ids)).all()]
-            query = query.filter(Finding.audit_id.in_(audit_ids))
-        else:
-            project_ids = [pu.project_id for pu in current_user.project_assignments]
-            audit_ids = [a.id for a in db.query(Audit).filter(Audit.project_id.in_(project_ids)).all()]
-            query = query.filter(Finding.audit_id.in_(audit_ids))
+        query = query.filter(audit_access_clause(current_user, Finding.audit_id))
     
     # Filter by assigned user if provided
     if assigned_to_user_id:
         query = query.filter(Finding.assigned_to_user_id == assigned_to_user_id)
     
-    findings = query.offset(skip).limit(limit).all()
-    
-    # Format response with user info
-    result = []
-    for finding in findings:
-        finding_dict = {
-            **{k: v for k, v in finding.__dict__.items() if not k.startswith('_')},
-            "assigned_to": {
-                "id": finding.assigned_to.id,
-                "full_name": finding.assigned_to.full_name,
-                "email": finding.assigned_to.email
-            } if finding.assigned_to else None,
-            "comments": [
-                {
-                    **{k: v for k, v in comment.__dict__.items() if not k.startswith('_')},
-                    "user": {
-                        "id": comment.user.id,
-                        "full_name": comment.user.full_name,
-                        "email": comment.user.email
-                    } if comment.user else None
-                }
-                for comment in (finding.comments or [])
-            ] if finding.comments else []
-        }
-        result.append(FindingSchema(**finding_dict))
-    
-    return result
+    findings = paginate(query, [Finding.id], response, cursor=cursor, skip=skip, limit=limit)
+    
+    # Serialize straight to JSON bytes; response_model still documents the schema
+    next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return Response(
+        content=serialize_findings_json(findings),
+        media_type="application/json",
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    )
 
 @router.get("/{finding_id}", response_model=FindingSchema)
 def read_finding(
@@ -192,36 +161,13 @@ def read_finding(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    finding = db.query(Finding).options(
-        joinedload(Finding.assigned_to),
-        joinedload(Finding.comments).joinedload(FindingComment.user)
-    ).filter(Finding.id == finding_id).first()
+    finding = db.query(Finding).options(*finding_load_options()).filter(Finding.id == finding_id).first()
     if not finding:
         raise HTTPException(status_code=404, detail="Finding not found")
     
     check_audit_access(current_user, finding.audit_id, db)
     
-    # Format response with user info
-    finding_dict = {
-        **{k: v for k, v in finding.__dict__.items() if not k.startswith('_')},
-        "assigned_to": {
-            "id": finding.assigned_to.id,
-            "full_name": finding.assigned_to.full_name,
-            "email": finding.assigned_to.email
-        } if finding.assigned_to else None,
-        "comments": [
-            {
-                **{k: v for k, v in comment.__dict__.items() if not k.startswith('_')},
-                "user": {
-                    "id": comment.user.id,
-                    "full_name": comment.user.full_name,
-                    "email": comment.user.email
-                } if comment.user else None
-            }
-            for comment in (finding.comments or [])
-        ] if finding.comments else []
-    }
-    return FindingSchema(**finding_dict)
+    return FindingSchema.model_validate(finding)
 
 @router.put("/{finding_id}", response_model=FindingSchema)
 def update_finding(
@@ -230,7 +176,8 @@ def update_finding(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_finding = db.query(Finding).filter(Finding.id == finding_id).first()
+    # Locked until commit: the old severity/status below must be the ones the rollup holds
+    db_finding = db.query(Finding).filter(Finding.id == finding_id).with_for_update().first()
     if not db_finding:
         raise HTTPException(status_code=404, detail="Finding not found")
     
@@ -240,6 +187,14 @@ def update_finding(
     old_assigned_to = db_finding.assigned_to_user_id
     old_status = db_finding.status
     
+    # Severity/status changes move the finding between rollup buckets
+    stats_changed = any(
+        field in ("severity", "status") and getattr(db_finding, field) != value
+        for field, value in update_data.items()
+    )
+    if stats_changed:
+        record_findings_removed(db, Finding.id == db_finding.id)
+    
     changes = {}
     for field, value in update_data.items():
         old_value = getattr(db_finding, field, None)
@@ -247,6 +202,10 @@ def update_finding(
             changes[field] = {"old": str(old_value), "new": str(value)}
             setattr(db_finding, field, value)
     
+    if stats_changed:
+        db.flush()
+        record_findings_added(db, Finding.id == db_finding.id)
+    
     # Log activity
     if changes:
         log_activity(
@@ -292,35 +251,12 @@ def update_finding(
     finding_id = db_finding.id
     
     # Reload with relationships
-    db_finding = db.query(Finding).options(
-        joinedload(Finding.assigned_to),
-        joinedload(Finding.comments).joinedload(FindingComment.user)
-    ).filter(Finding.id == finding_id).first()
+    db_finding = db.query(Finding).options(*finding_load_options()).filter(Finding.id == finding_id).first()
     
     if not db_finding:
         raise HTTPException(status_code=404, detail="Finding not found after update")
     
-    # Format response
-    finding_dict = {
-        **{k: v for k, v in db_finding.__dict__.items() if not k.startswith('_')},
-        "assigned_to": {
-            "id": db_finding.assigned_to.id,
-            "full_name": db_finding.assigned_to.full_name,
-            "email": db_finding.assigned_to.email
-        } if db_finding.assigned_to else None,
-        "comments": [
-            {
-                **{k: v for k, v in comment.__dict__.items() if not k.startswith('_')},
-                "user": {
-                    "id": comment.user.id,
-                    "full_name": comment.user.full_name,
-                    "email": comment.user.email
-                } if comment.user else None
-            }
-            for comment in (db_finding.comments or [])
-        ] if db_finding.comments else []
-    }
-    return FindingSchema(**finding_dict)
+    return FindingSchema.model_validate(db_finding)
 
 @router.delete("/{finding_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_finding(
@@ -337,11 +273,8 @@ def delete_finding(
     finding_title = db_finding.title
     finding_id_val = db_finding.id
     
-    # Delete associated evidence files
-    for evidence in db_finding.evidences:
-        file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    # Release evidence files (unlinked after commit when no other evidence shares them)
+    released_files = release_evidence_files(db, Evidence.finding_id == finding_id_val)
     
     # Log activity before deletion
     log_activity(
@@ -353,13 +286,17 @@ def delete_finding(
         details={"title": finding_title}
     )
     
+    record_findings_removed(db, Finding.id == finding_id_val)
     db.delete(db_finding)
     db.commit()
+    if released_files:
+        file_reaper.wake()
     return None
 
 @router.post("/{finding_id}/evidences", response_model=EvidenceSchema, status_code=status.HTTP_201_CREATED)
 def upload_evidence(
     finding_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     description: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -371,9 +308,9 @@ def upload_evidence(
     
     check_audit_access(current_user, finding.audit_id, db)
     
-    # Validate file size
+    # Reject early when the client declared the size; store_upload enforces it while streaming
     if file.size and file.size > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=400, detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB")
+        raise file_too_large()
     
     # Validate file extension
     if not file.filename:
@@ -414,53 +351,85 @@ def upload_evidence(
         "application/octet-stream"  # Some files may not have specific MIME type
     ]
     
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
-    
-    # Ensure upload directory exists
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    
-    # Save file
-    with open(file_path, "wb") as buffer:
-        content = file.file.read()
-        buffer.write(content)
+    # Stream into the content-addressed store (chunked, hashed, deduplicated)
+    stored = store_upload(db, file.file)
     
     # Create evidence record
     evidence = Evidence(
         finding_id=finding_id,
-        file_path=unique_filename,
+        file_path=stored.file_path,
         file_name=file.filename,
-        file_size=len(content),
+        file_size=stored.file_size,
+        sha256=stored.sha256,
         description=description
     )
     db.add(evidence)
     db.commit()
     db.refresh(evidence)
+    
+    # Thumbnail and report-sized copies are produced after the response is sent
+    if is_raster_image(file.filename):
+        background_tasks.add_task(generate_renditions, stored.file_path)
     return evidence
 
+@router.get("/evidences/{evidence_id}/thumbnail")
+def get_evidence_thumbnail(
+    evidence_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    row = db.query(Evidence, Finding.audit_id).join(
+        Finding, Evidence.finding_id == Finding.id
+    ).filter(Evidence.id == evidence_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+    evidence, audit_id = row
+    
+    check_audit_access(current_user, audit_id, db)
+    
+    thumbnail_path = get_rendition(evidence.file_path, evidence.file_name, "thumb")
+    if not thumbnail_path:
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+    
+    return file_response(
+        request,
+        rendition_file_path(evidence.file_path, "thumb"),
+        thumbnail_path,
+        file_name=f"{os.path.splitext(evidence.file_name)[0]}.jpg",
+        etag=evidence_etag(evidence, thumbnail_path, variant="thumb"),
+        media_type="image/jpeg",
+        disposition="inline"
+    )
+
 @router.get("/evidences/{evidence_id}/download")
 def download_evidence(
     evidence_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    evidence = db.query(Evidence).filter(Evidence.id == evidence_id).first()
-    if not evidence:
+    row = db.query(Evidence, Finding.audit_id).join(
+        Finding, Evidence.finding_id == Finding.id
+    ).filter(Evidence.id == evidence_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Evidence not found")
+    evidence, audit_id = row
     
-    finding = db.query(Finding).filter(Finding.id == evidence.finding_id).first()
-    check_audit_access(current_user, finding.audit_id, db)
+    check_audit_access(current_user, audit_id, db)
     
     # Get file path
-    file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
+    file_path = absolute_path(evidence.file_path)
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(
+    # Streamed with ETag/304/Range support, or handed to the proxy (EVIDENCE_SERVE_MODE)
+    return file_response(
+        request,
+        evidence.file_path,
         file_path,
-        media_type="application/octet-stream",
-        filename=evidence.file_name
+        file_name=evidence.file_name,
+        etag=evidence_etag(evidence, file_path)
     )
 
 @router.delete("/evidences/{evidence_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -469,17 +438,17 @@ def delete_evidence(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    evidence = db.query(Evidence).filter(Evidence.id == evidence_id).first()
-    if not evidence:
+    row = db.query(Evidence, Finding.audit_id).join(
+        Finding, Evidence.finding_id == Finding.id
+    ).filter(Evidence.id == evidence_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Evidence not found")
+    evidence, audit_id = row
     
-    finding = db.query(Finding).filter(Finding.id == evidence.finding_id).first()
-    check_audit_access(current_user, finding.audit_id, db)
+    check_audit_access(current_user, audit_id, db)
     
-    # Delete file
-    file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    # Release the file (unlinked after commit when no other evidence shares it)
+    released_files = release_evidence_files(db, Evidence.id == evidence_id)
     
     # Log activity
     log_activity(
@@ -488,11 +457,13 @@ def delete_evidence(
         entity_id=evidence_id,
         action="deleted",
         user_id=current_user.id,
-        details={"finding_id": finding.id, "file_name": evidence.file_name}
+        details={"finding_id": evidence.finding_id, "file_name": evidence.file_name}
     )
     
     db.delete(evidence)
     db.commit()
+    if released_files:
+        file_reaper.wake()
     return None
 
 # Comments endpoints
@@ -544,16 +515,7 @@ def create_comment(
     if db_comment.user:
         db.refresh(db_comment.user)
     
-    # Format response
-    comment_dict = {
-        **{k: v for k, v in db_comment.__dict__.items() if not k.startswith('_')},
-        "user": {
-            "id": db_comment.user.id,
-            "full_name": db_comment.user.full_name,
-            "email": db_comment.user.email
-        } if db_comment.user else None
-    }
-    return FindingCommentSchema(**comment_dict)
+    return FindingCommentSchema.model_validate(db_comment)
 
 @router.get("/{finding_id}/comments", response_model=List[FindingCommentSchema])
 def get_comments(
@@ -571,20 +533,7 @@ def get_comments(
         joinedload(FindingComment.user)
     ).filter(FindingComment.finding_id == finding_id).order_by(FindingComment.created_at).all()
     
-    # Format response
-    result = []
-    for comment in comments:
-        comment_dict = {
-            **{k: v for k, v in comment.__dict__.items() if not k.startswith('_')},
-            "user": {
-                "id": comment.user.id,
-                "full_name": comment.user.full_name,
-                "email": comment.user.email
-            } if comment.user else None
-        }
-        result.append(FindingCommentSchema(**comment_dict))
-    
-    return result
+    return finding_comment_list_adapter.validate_python(comments, from_attributes=True)
 
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_comment(
@@ -592,16 +541,18 @@ def delete_comment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    comment = db.query(FindingComment).filter(FindingComment.id == comment_id).first()
-    if not comment:
+    row = db.query(FindingComment, Finding.audit_id).join(
+        Finding, FindingComment.finding_id == Finding.id
+    ).filter(FindingComment.id == comment_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Comment not found")
+    comment, audit_id = row
     
     # Only allow deletion by comment owner or admin
     if comment.user_id != current_user.id and current_user.role not in [UserRole.PLATFORM_ADMIN, UserRole.ORG_ADMIN]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    finding = db.query(Finding).filter(Finding.id == comment.finding_id).first()
-    check_audit_access(current_user, finding.audit_id, db)
+    check_audit_access(current_user, audit_id, db)
     
     # Log activity
     log_activity(
@@ -1,20 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+from datetime import timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal
 from app.models.notification import Notification, NotificationType
 from app.schemas.notification import Notification as NotificationSchema, NotificationUpdate
-from app.core.dependencies import get_current_user
-from app.core.notification_service import check_due_dates
+from app.core.config import settings
+from app.core.dependencies import authenticate_token, get_current_user, load_active_user
+from app.core.notification_service import check_due_dates, publish_notification_changes
+from app.core.pagination import paginate
+from app.core.security import create_access_token
 from app.models.user import User
+from app.services.notification_stream import notification_stream
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NotificationSchema])
 def get_notifications(
+    response: Response,
     read: Optional[bool] = Query(None, description="Filter by read status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -24,7 +35,10 @@ def get_notifications(
     if read is not None:
         query = query.filter(Notification.read == read)
     
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+    notifications = paginate(
+        query, [Notification.created_at, Notification.id], response,
+        cursor=cursor, skip=skip, limit=limit, descending=True
+    )
     return notifications
 
 @router.get("/unread/count")
@@ -39,6 +53,115 @@ def get_unread_count(
     ).count()
     return {"count": count}
 
+# Notifications sent per query when a stream catches up
+STREAM_BATCH_SIZE = 100
+STREAM_TICKET_SCOPE = "notification_stream"
+
+def _authenticate_stream(ticket: str) -> User:
+    # Short-lived session: the stream must not hold a pooled connection while idle
+    db = SessionLocal()
+    try:
+        user = authenticate_token(db, ticket, scope=STREAM_TICKET_SCOPE)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+def _still_active(user_id: int, email: str) -> bool:
+    """Re-check of the stream's user on every wake-up and heartbeat (a user cache hit needs no query)"""
+    db = SessionLocal()
+    try:
+        return load_active_user(db, email).id == user_id
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+def _stream_changes(user_id: int, after_id: Optional[int]):
+    """(notifications newer than after_id, unread count, newest id); after_id None: no backlog"""
+    db = SessionLocal()
+    try:
+        if after_id is None:
+            newest = db.execute(
+                select(func.coalesce(func.max(Notification.id), 0)).where(Notification.user_id == user_id)
+            ).scalar()
+            notifications = []
+        else:
+            notifications = db.execute(
+                select(Notification).where(Notification.user_id == user_id, Notification.id > after_id)
+                .order_by(Notification.id).limit(STREAM_BATCH_SIZE)
+            ).scalars().all()
+            newest = notifications[-1].id if notifications else after_id
+        unread = db.execute(
+            select(func.count(Notification.id)).where(Notification.user_id == user_id, Notification.read == False)
+        ).scalar()
+        events = [NotificationSchema.model_validate(n).model_dump(mode="json") for n in notifications]
+        return events, unread, newest
+    finally:
+        db.close()
+
+def _sse(event: str, data, event_id: Optional[int] = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/stream/ticket")
+def create_stream_ticket(current_user: User = Depends(get_current_user)):
+    """
+    Short-lived ticket for opening /notifications/stream. EventSource cannot send an
+    Authorization header, and the access token must not end up in URLs (access logs,
+    browser history); a ticket is only valid for the stream and expires quickly.
+    """
+    ticket = create_access_token(
+        {"sub": current_user.email, "scope": STREAM_TICKET_SCOPE},
+        expires_delta=timedelta(seconds=settings.NOTIFICATION_STREAM_TICKET_SECONDS)
+    )
+    return {"ticket": ticket, "expires_in": settings.NOTIFICATION_STREAM_TICKET_SECONDS}
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    ticket: str = Query(..., description="Ticket from POST /notifications/stream/ticket"),
+    last_event_id: Optional[int] = Query(None, description="Resume after this notification id"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-Sent Events: `notification` (a new notification, its id as the event id) and
+    `unread_count` events, pushed when the user's notifications change. Pass the last
+    received id (or let the browser resend Last-Event-ID) to get the notifications missed
+    while disconnected. The stream ends when the user is deactivated or deleted.
+    """
+    user = await run_in_threadpool(_authenticate_stream, ticket)
+    user_id, email = user.id, user.email
+    # Subscribe before the first read so no change falls between the two
+    subscription = notification_stream.subscribe(user_id)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            after_id = last_event_id_header if last_event_id_header is not None else last_event_id
+            while True:
+                while True:
+                    notifications, unread, newest = await run_in_threadpool(_stream_changes, user_id, after_id)
+                    for notification in notifications:
+                        yield _sse("notification", notification, notification["id"])
+                    after_id = newest
+                    if len(notifications) < STREAM_BATCH_SIZE:
+                        break
+                yield _sse("unread_count", {"count": unread})
+                while not await subscription.wait(settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS):
+                    if await request.is_disconnected() or not await run_in_threadpool(_still_active, user_id, email):
+                        return
+                    yield ": keep-alive\n\n"
+                if not await run_in_threadpool(_still_active, user_id, email):
+                    return
+        finally:
+            notification_stream.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx: do not buffer the stream
+    })
+
 @router.put("/{notification_id}/read", response_model=NotificationSchema)
 def mark_as_read(
     notification_id: int,
@@ -54,6 +177,7 @@ def mark_as_read(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     notification.read = True
+    publish_notification_changes(db, [current_user.id])
     db.commit()
     db.refresh(notification)
     return notification
@@ -68,6 +192,8 @@ def mark_all_as_read(
         Notification.user_id == current_user.id,
         Notification.read == False
     ).update({"read": True})
+    if updated:
+        publish_notification_changes(db, [current_user.id])
     db.commit()
     return {"updated": updated}
 
@@ -85,6 +211,8 @@ def delete_notification(
     if notification.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
+    if not notification.read:
+        publish_notification_changes(db, [current_user.id])
     db.delete(notification)
     db.commit()
     return None
@@ -99,6 +227,6 @@ def trigger_due_date_check(
     if current_user.role != UserRole.PLATFORM_ADMIN:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    check_due_dates(db)
-    return {"message": "Due date check completed"}
+    created = check_due_dates(db)
+    return {"message": "Due date check completed", "notifications_created": created}
 
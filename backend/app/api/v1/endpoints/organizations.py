@@ -6,6 +6,7 @@ from app.models.organization import Organization
 from app.models.user import User, UserRole
 from app.schemas.organization import Organization as OrganizationSchema, OrganizationCreate, OrganizationUpdate
 from app.core.dependencies import get_current_user, require_platform_admin
+from app.core.user_cache import user_cache
 
 router = APIRouter()
 
@@ -91,5 +92,7 @@ def delete_organization(
         raise HTTPException(status_code=404, detail="Organization not found")
     db.delete(db_org)
     db.commit()
+    # Member users changed organization_id or were removed
+    user_cache.clear()
     return None
 
@@ -5,7 +5,9 @@ from app.db.database import get_db
 from app.models.project import Project, ProjectUser
 from app.models.user import User, UserRole
 from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
-from app.core.dependencies import get_current_user, get_user_projects
+from app.core.dependencies import get_current_user, get_user_projects, project_access_clause
+from app.core.bulk_delete import delete_audits
+from app.services.file_reaper import file_reaper
 
 router = APIRouter()
 
@@ -53,20 +55,11 @@ def read_projects(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if current_user.role == UserRole.PLATFORM_ADMIN:
-        query = db.query(Project)
-        if organization_id:
-            query = query.filter(Project.organization_id == organization_id)
-        projects = query.offset(skip).limit(limit).all()
-    elif current_user.role == UserRole.ORG_ADMIN:
-        query = db.query(Project).filter(Project.organization_id == current_user.organization_id)
-        projects = query.offset(skip).limit(limit).all()
-    else:
-        # Auditor sees only assigned projects
-        project_ids = [pu.project_id for pu in current_user.project_assignments]
-        projects = db.query(Project).filter(Project.id.in_(project_ids)).offset(skip).limit(limit).all()
+    query = db.query(Project).filter(project_access_clause(current_user, Project.id))
+    if organization_id and current_user.role == UserRole.PLATFORM_ADMIN:
+        query = query.filter(Project.organization_id == organization_id)
     
-    return projects
+    return query.offset(skip).limit(limit).all()
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 def read_project(
@@ -74,23 +67,18 @@ def read_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    row = db.query(
+        Project,
+        project_access_clause(current_user, Project.id).label("allowed")
+    ).filter(Project.id == project_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Check access
-    if current_user.role == UserRole.PLATFORM_ADMIN:
-        pass
-    elif current_user.role == UserRole.ORG_ADMIN:
-        if project.organization_id != current_user.organization_id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-    else:
-        # Auditor can only see assigned projects
-        project_ids = [pu.project_id for pu in current_user.project_assignments]
-        if project_id not in project_ids:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    if not row.allowed:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return project
+    return row.Project
 
 @router.put("/{project_id}", response_model=ProjectSchema)
 def update_project(
@@ -140,12 +128,9 @@ def delete_project(
     current_user: User = Depends(get_current_user)
 ):
     from app.models.audit import Audit
-    from app.models.finding import Finding, Evidence
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy import delete
     
-    db_project = db.query(Project).options(
-        joinedload(Project.audits).joinedload(Audit.findings).joinedload(Finding.evidences)
-    ).filter(Project.id == project_id).first()
+    db_project = db.query(Project).filter(Project.id == project_id).first()
     
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -159,43 +144,24 @@ def delete_project(
     else:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Delete all related data manually to avoid foreign key constraint issues
-    # Delete evidences first (child of findings)
-    for audit in db_project.audits:
-        for finding in audit.findings:
-            # Delete evidence files from filesystem
-            import os
-            from app.core.config import settings
-            for evidence in finding.evidences:
-                file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-                if os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        print(f"Warning: Could not delete evidence file {file_path}: {e}")
-                db.delete(evidence)
-    
-    # Delete findings (child of audits)
-    for audit in db_project.audits:
-        for finding in audit.findings:
-            db.delete(finding)
-    
-    # Delete audits (child of projects)
-    for audit in db_project.audits:
-        db.delete(audit)
+    # Release evidence blobs and delete audits, findings, comments and evidences
+    # with set-based statements (nothing is loaded into the session)
+    released_files, _ = delete_audits(db, Audit.project_id == project_id)
     
     # Delete project user assignments
     db.query(ProjectUser).filter(ProjectUser.project_id == project_id).delete()
     
     # Delete project_users association table entries
-    from sqlalchemy import delete
     from app.models.project import project_user_association
     stmt = delete(project_user_association).where(project_user_association.c.project_id == project_id)
     db.execute(stmt)
     
-    # Finally delete the project
-    db.delete(db_project)
+    # Finally delete the project (finding_stats rows go with it, ON DELETE CASCADE)
+    db.execute(delete(Project).where(Project.id == project_id), execution_options={"synchronize_session": False})
     db.commit()
+    # Unreferenced evidence files were queued in the same transaction; the reaper unlinks them
+    if released_files:
+        file_reaper.wake()
     return None
 
 @router.post("/{project_id}/copy", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
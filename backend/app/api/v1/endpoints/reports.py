@@ -1,53 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.db.database import get_db
-from app.models.audit import Audit
 from app.models.user import User
-from app.core.dependencies import get_current_user
-from app.services.word_generator import generate_audit_word_report
-from datetime import datetime
+from app.core.dependencies import get_current_user, check_audit_access
+from app.core.evidence_storage import absolute_path
+from app.core.file_responses import file_response
+from app.schemas.report import ReportJob as ReportJobSchema
+from app.services.report_jobs import ReportJob, report_jobs
 import os
-import tempfile
-import uuid
 
 router = APIRouter()
 
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# How long the synchronous endpoint waits for a build before handing out the job
+# instead (it holds a threadpool worker while waiting)
+SYNC_REPORT_WAIT_SECONDS = 15
+
+def get_report_job(job_id: str, current_user: User, db: Session) -> ReportJob:
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    check_audit_access(current_user, job.audit_id, db)
+    return job
+
+def report_file_response(request: Request, job: ReportJob):
+    if not job.file_path or not os.path.exists(absolute_path(job.file_path)):
+        # Superseded by a newer build or expired from the cache
+        raise HTTPException(status_code=404, detail="Report file not found, please generate it again")
+    return file_response(
+        request,
+        job.file_path,
+        absolute_path(job.file_path),
+        f"audit_report_{job.audit_id}.docx",
+        etag=f'"{job.version}"',
+        media_type=DOCX_MEDIA_TYPE
+    )
+
+@router.post("/audit/{audit_id}/word/jobs", response_model=ReportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+def create_word_report_job(
+    audit_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start building the Word report of an audit (or reuse the cached one); poll the returned job"""
+    check_audit_access(current_user, audit_id, db)
+    job = report_jobs.submit(db, audit_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=ReportJobSchema)
+def read_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Status and progress of a report job"""
+    return get_report_job(job_id, current_user, db)
+
+@router.get("/jobs/{job_id}/download")
+def download_report_job(
+    job_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download the report of a completed job"""
+    job = get_report_job(job_id, current_user, db)
+    if job.status != "completed":
+        raise HTTPException(status_code=400, detail=f"Report job is {job.status}")
+    return report_file_response(request, job)
+
 @router.get("/audit/{audit_id}/word")
 def generate_word_report(
     audit_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generate Word (.docx) report for an audit with cover page"""
-    from sqlalchemy.orm import joinedload
-    from app.models.finding import Finding, Evidence
-    
-    # Load audit with all relationships
-    from app.models.project import Project
-    from app.models.organization import Organization
-    
-    audit = db.query(Audit).options(
-        joinedload(Audit.project).joinedload(Project.organization),
-        joinedload(Audit.findings).joinedload(Finding.evidences)
-    ).filter(Audit.id == audit_id).first()
-    
-    if not audit:
-        raise HTTPException(status_code=404, detail="Audit not found")
-    
-    # Check access (reuse finding access check logic)
-    from app.api.v1.endpoints.findings import check_audit_access
+    """
+    Generate Word (.docx) report for an audit with cover page.
+    Waits briefly for the report job; a build that takes longer answers 202 with
+    the job (Location: the job resource) to poll and download like the /jobs API.
+    """
     check_audit_access(current_user, audit_id, db)
-    
-    # Generate Word document
-    word_path = generate_audit_word_report(audit, db)
-    
-    # Generate random filename in English
-    random_id = uuid.uuid4().hex[:8]
-    filename = f"audit_report_{random_id}.docx"
-    
-    return FileResponse(
-        word_path,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=filename
-    )
+    job = report_jobs.submit(db, audit_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    # Do not hold a pooled connection while the build runs
+    db.close()
+    if not job.done.wait(SYNC_REPORT_WAIT_SECONDS):
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=ReportJobSchema.model_validate(job).model_dump(mode="json"),
+            headers={"Location": str(request.url_for("read_report_job", job_id=job.id))}
+        )
+    if job.status != "completed":
+        raise HTTPException(status_code=500, detail="Report generation failed")
+    return report_file_response(request, job)
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.models.user import User
+from app.core.dependencies import require_platform_admin
+from app.core.user_cache import user_cache
+from app.core.db_listener import db_listener
+from app.core.security import password_hash_pool
+from app.services.report_jobs import report_jobs
+from app.services.report_fragment_cache import fragment_cache
+from app.services.file_reaper import file_reaper
+from app.services.scheduler import scheduler
+from app.services.notification_stream import notification_stream
+
+router = APIRouter()
+
+@router.get("/metrics")
+def get_metrics(current_user: User = Depends(require_platform_admin)):
+    """In-process cache and worker counters (per API process)"""
+    return {
+        "user_cache": user_cache.stats(),
+        "password_hashing": password_hash_pool.stats(),
+        "report_jobs": report_jobs.stats(),
+        "report_fragments": fragment_cache.stats(),
+        "file_reaper": file_reaper.stats(),
+        "scheduler": scheduler.stats(),
+        "notification_stream": notification_stream.stats(),
+        "db_listener": db_listener.stats(),
+    }
+
+@router.get("/storage/reconcile")
+def reconcile_storage_dry_run(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_platform_admin)
+):
+    """Compare UPLOAD_DIR with the evidence tables: orphan files on disk and missing files (dry run)"""
+    return file_reaper.reconcile(db)
+
+@router.post("/storage/reconcile")
+def reconcile_storage(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_platform_admin)
+):
+    """Reconcile and queue the orphan files for removal by the file reaper"""
+    return file_reaper.reconcile(db, apply=True)
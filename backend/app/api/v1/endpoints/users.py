@@ -6,6 +6,7 @@ from app.models.user import User, UserRole
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate, UserPasswordUpdate
 from app.core.dependencies import get_current_user, require_org_admin_or_platform_admin
 from app.core.security import get_password_hash, verify_password
+from app.core.user_cache import user_cache
 
 router = APIRouter()
 
@@ -109,6 +110,7 @@ def update_user(
     for field, value in update_data.items():
         setattr(db_user, field, value)
     db.commit()
+    user_cache.invalidate_user(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -136,6 +138,7 @@ def delete_user(
     
     db.delete(db_user)
     db.commit()
+    user_cache.invalidate_user(user_id)
     return None
 
 @router.post("/me/change-password", status_code=status.HTTP_200_OK)
@@ -169,6 +172,7 @@ def change_password(
     # Update password
     current_user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
+    user_cache.invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully"}
 
@@ -0,0 +1,96 @@
+"""
+Set-based copy of an audit's findings (and optionally their evidences and comments).
+
+Everything is copied by one statement on the database server:
+
+    WITH finding_map AS (SELECT id, nextval(<findings id sequence>) FROM findings WHERE audit_id = :source),
+         new_findings AS (INSERT INTO findings SELECT ... JOIN finding_map ... RETURNING id),
+         new_evidences AS (INSERT INTO evidences SELECT ... JOIN finding_map ... RETURNING id),
+         new_comments AS (INSERT INTO finding_comments SELECT ... JOIN finding_map ... RETURNING id)
+    SELECT (SELECT count(*) FROM new_findings), ...
+
+finding_map allocates the copies' ids up front, so evidences and comments can be
+attached to them in the same statement. Only the counts come back to Python.
+"""
+from typing import Dict
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.orm import Session
+from app.core.evidence_storage import add_evidence_references
+from app.models.evidence_blob import EvidenceBlob
+from app.models.finding import Finding, Evidence, FindingComment
+
+FINDING_COPY_COLUMNS = [
+    "title", "description", "control_reference", "severity", "status",
+    "recommendation", "assigned_to_user_id", "due_date"
+]
+
+def _count(cte):
+    return select(func.count()).select_from(cte).scalar_subquery()
+
+def copy_audit_findings(
+    db: Session,
+    source_audit_id: int,
+    target_audit_id: int,
+    include_evidences: bool = False,
+    include_comments: bool = False
+) -> Dict[str, int]:
+    """
+    Copy the source audit's findings into the target audit, in their original order.
+
+    Copied evidences share the source's blobs (the blob reference counts are
+    bumped); evidences from before the blob store own their file and are not
+    copied. Copied comments keep their author and date.
+    Returns {"findings": n, "evidences": n, "comments": n}.
+    """
+    finding_map = select(
+        Finding.id.label("source_id"),
+        func.nextval(func.pg_get_serial_sequence(Finding.__tablename__, "id")).label("new_id")
+    ).where(Finding.audit_id == source_audit_id).order_by(Finding.id).cte("finding_map")
+
+    new_findings = insert(Finding).from_select(
+        ["id", "audit_id"] + FINDING_COPY_COLUMNS,
+        select(
+            finding_map.c.new_id,
+            literal(target_audit_id),
+            *[getattr(Finding, column) for column in FINDING_COPY_COLUMNS]
+        ).join(finding_map, finding_map.c.source_id == Finding.id).order_by(Finding.id)
+    ).returning(Finding.id).cte("new_findings")
+    counts = {"findings": _count(new_findings)}
+
+    if include_evidences:
+        new_evidences = insert(Evidence).from_select(
+            ["finding_id", "file_path", "file_name", "file_size", "sha256", "description"],
+            select(
+                finding_map.c.new_id,
+                Evidence.file_path,
+                Evidence.file_name,
+                Evidence.file_size,
+                Evidence.sha256,
+                Evidence.description
+            ).join(finding_map, finding_map.c.source_id == Evidence.finding_id).join(
+                EvidenceBlob, EvidenceBlob.file_path == Evidence.file_path
+            ).order_by(Evidence.id)
+        ).returning(Evidence.id).cte("new_evidences")
+        counts["evidences"] = _count(new_evidences)
+
+    if include_comments:
+        new_comments = insert(FindingComment).from_select(
+            ["finding_id", "user_id", "comment", "created_at"],
+            select(
+                finding_map.c.new_id,
+                FindingComment.user_id,
+                FindingComment.comment,
+                FindingComment.created_at
+            ).join(finding_map, finding_map.c.source_id == FindingComment.finding_id).order_by(FindingComment.id)
+        ).returning(FindingComment.id).cte("new_comments")
+        counts["comments"] = _count(new_comments)
+
+    row = db.execute(select(*[count.label(name) for name, count in counts.items()])).one()
+    copied = {"findings": 0, "evidences": 0, "comments": 0}
+    copied.update(row._asdict())
+
+    if copied["evidences"]:
+        add_evidence_references(
+            db, Evidence.finding_id.in_(select(Finding.id).where(Finding.audit_id == target_audit_id))
+        )
+    return copied
@@ -0,0 +1,50 @@
+"""
+Set-based deletion of audits with everything under them.
+
+The ORM path (db.delete() with cascade="all, delete-orphan") loads every audit,
+finding, comment and evidence before deleting them one row at a time, which
+for large projects means hundreds of thousands of objects and statements.
+delete_audits works in stages instead:
+
+1. release the evidences' blob references and queue the files that are no
+   longer referenced for the file reaper (one UPDATE ... FROM (SELECT ... GROUP BY)
+   statement, in the same transaction);
+2. delete comments, evidences, findings and audits bottom-up, one
+   DELETE ... WHERE ... IN (SELECT ...) per table; the FK cascades
+   (findings/evidences/comments ON DELETE CASCADE) only have to verify that
+   nothing is left;
+3. after the commit the caller wakes the file reaper, which unlinks the files
+   outside the request.
+
+The finding_stats rollup is not touched; callers adjust it
+(record_findings_removed) or rely on its project cascade.
+"""
+from typing import Dict, List, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.core.evidence_storage import release_evidence_files
+from app.models.audit import Audit
+from app.models.finding import Finding, Evidence, FindingComment
+
+def delete_audits(db: Session, *criteria) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Delete the audits matching `criteria` with their findings, comments and evidences.
+    Returns (files queued for the file reaper, deleted row counts).
+    """
+    audit_ids = select(Audit.id).where(*criteria)
+    finding_ids = select(Finding.id).where(Finding.audit_id.in_(audit_ids))
+
+    released_files = release_evidence_files(db, Evidence.finding_id.in_(finding_ids))
+    statements = [
+        ("comments", delete(FindingComment).where(FindingComment.finding_id.in_(finding_ids))),
+        ("evidences", delete(Evidence).where(Evidence.finding_id.in_(finding_ids))),
+        ("findings", delete(Finding).where(Finding.audit_id.in_(audit_ids))),
+        ("audits", delete(Audit).where(*criteria)),
+    ]
+    counts = {}
+    for name, statement in statements:
+        # No session synchronization: it would fetch every deleted id into Python
+        counts[name] = db.execute(statement, execution_options={"synchronize_session": False}).rowcount
+    # Objects already loaded in the session are gone from the database now
+    db.expire_all()
+    return released_files, counts
@@ -12,6 +12,15 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     
+    # Password hashing: bcrypt cost factor (existing hashes keep their own cost) and
+    # the number of worker threads running bcrypt for async endpoints (0: on the event loop)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Authenticated-user cache (per process); 0 disables
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 1024
+    
     # Application
     DEBUG: bool = True
     # Lokal network erişimi için tüm origin'lere izin ver (development)
@@ -21,6 +30,35 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
+    # How evidence downloads are served after the authorization check:
+    #   "direct"           - streamed by the API worker (Range/ETag handled in Python)
+    #   "x-accel-redirect" - nginx serves EVIDENCE_INTERNAL_LOCATION + file path (see frontend/nginx.conf)
+    #   "x-sendfile"       - Apache mod_xsendfile / lighttpd serve the absolute file path
+    EVIDENCE_SERVE_MODE: str = "direct"
+    EVIDENCE_INTERNAL_LOCATION: str = "/protected-uploads/"
+    
+    # Word report jobs: builder threads per process, how long finished jobs can be
+    # polled and how long unused cached reports are kept (under UPLOAD_DIR/.reports)
+    REPORT_WORKERS: int = 2
+    REPORT_JOB_TTL_SECONDS: int = 3600
+    REPORT_CACHE_TTL_HOURS: int = 72
+    # Findings of large reports are rendered in worker processes (0: one per CPU, 1: off)
+    REPORT_RENDER_PROCESSES: int = 0
+    REPORT_PARALLEL_MIN_FINDINGS: int = 200
+    # Rendered findings kept for report rebuilds (per process); 0 disables
+    REPORT_FRAGMENT_CACHE_MB: int = 64
+    # File reaper: how often queued file deletions are retried/processed, how often
+    # UPLOAD_DIR is reconciled with the database (dry run; 0 disables) and how old an
+    # unreferenced file must be before it counts as an orphan
+    FILE_REAPER_INTERVAL_SECONDS: int = 60
+    FILE_REAPER_RECONCILE_HOURS: int = 24
+    FILE_REAPER_ORPHAN_GRACE_SECONDS: int = 3600
+    # Due-soon/overdue notification scan (run by one API process, see app/services/scheduler.py); 0 disables
+    DUE_DATE_SCAN_INTERVAL_SECONDS: int = 900
+    # Notification push stream (/notifications/stream): keep-alive comment interval and
+    # lifetime of the one-purpose tickets the stream URL carries instead of the access token
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = 25
+    NOTIFICATION_STREAM_TICKET_SECONDS: int = 60
     ALLOWED_FILE_EXTENSIONS: List[str] = [
         # Images
         ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg",
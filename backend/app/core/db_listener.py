@@ -0,0 +1,121 @@
+"""
+PostgreSQL LISTEN/NOTIFY fan-out between API worker processes.
+
+Every process runs one listener thread on a dedicated connection (detached from
+the pool) that LISTENs on the channels registered here and hands each payload to
+the channel's handler. Handlers run on the listener thread and must be quick.
+After (re)connecting, every channel's on_connect callback runs: events sent
+while the process was not listening were missed.
+
+Channels are registered at import time, before start().
+"""
+import select
+import threading
+from typing import Callable, Dict, Optional
+from sqlalchemy import func
+from sqlalchemy import select as sql_select
+from app.db.database import engine
+
+LISTEN_POLL_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 5
+
+class ListenChannel:
+    def __init__(self, name: str, handler: Callable[[str], None], on_connect: Optional[Callable[[], None]]):
+        self.name = name
+        self.handler = handler
+        self.on_connect = on_connect
+        self.events_received = 0
+
+class DatabaseListener:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+        self.channels: Dict[str, ListenChannel] = {}
+        self.connected = False
+        self.connections = 0
+
+    def register(self, channel: str, handler: Callable[[str], None], on_connect: Optional[Callable[[], None]] = None):
+        self.channels[channel] = ListenChannel(channel, handler, on_connect)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="db-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self._connection is None:
+                    self._connect()
+                if select.select([self._connection], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+                    continue
+                self._connection.poll()
+                while self._connection.notifies:
+                    self._handle(self._connection.notifies.pop(0))
+            except Exception as e:
+                print(f"Warning: Database listener lost its connection: {e}")
+                self._close_connection()
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+        self._close_connection()
+
+    def _connect(self):
+        # A connection of its own (detached from the pool): LISTEN needs autocommit
+        # and lasts as long as the connection
+        pooled = engine.raw_connection()
+        connection = pooled.driver_connection
+        pooled.detach()
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            for channel in self.channels:
+                cursor.execute(f"LISTEN {channel}")
+        self._connection = connection
+        self.connected = True
+        with self._lock:
+            self.connections += 1
+        for channel in self.channels.values():
+            if channel.on_connect is not None:
+                channel.on_connect()
+
+    def _handle(self, notify):
+        channel = self.channels.get(notify.channel)
+        if channel is None:
+            return
+        with self._lock:
+            channel.events_received += 1
+        try:
+            channel.handler(notify.payload)
+        except Exception as e:
+            print(f"Warning: Ignoring {notify.channel} event {notify.payload!r}: {e}")
+
+    def _close_connection(self):
+        self.connected = False
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "connected": self.connected,
+                "connections": self.connections,
+                "events_received": {name: channel.events_received for name, channel in self.channels.items()},
+            }
+
+def notify_now(channel: str, payload: str):
+    """NOTIFY outside of any request transaction (for changes that are already committed)"""
+    with engine.begin() as connection:
+        connection.execute(sql_select(func.pg_notify(channel, payload)))
+
+db_listener = DatabaseListener()
@@ -1,34 +1,67 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import select, true
 from app.db.database import get_db
 from app.models.user import User, UserRole
+from app.models.project import Project, ProjectUser
+from app.models.audit import Audit
 from app.core.security import decode_access_token
+from app.core.user_cache import user_cache, make_principal, PRINCIPAL_COLUMNS
 from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+def _attach_principal(db: Session, principal: dict) -> User:
+    """Rebuild a session-bound User from a cached principal without querying the database"""
+    user = User(**{column: principal[column] for column in PRINCIPAL_COLUMNS})
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+def load_active_user(db: Session, email: str) -> User:
+    """The active user with this email, from the user cache when possible; raises 401/400"""
+    principal = user_cache.get(email)
+    if principal is None:
+        generation = user_cache.generation
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_cache.put(email, make_principal(user), generation)
+    else:
+        user = _attach_principal(db, principal)
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+def authenticate_token(db: Session, token: Optional[str], scope: Optional[str] = None) -> User:
+    """
+    The active user a token belongs to; raises 401 (400 for inactive users).
+    Access tokens carry no scope; narrower tokens (e.g. notification stream tickets)
+    are only accepted where their scope is asked for.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = decode_access_token(token)
-    if payload is None:
+    payload = decode_access_token(token) if token else None
+    if payload is None or payload.get("scope") != scope:
         raise credentials_exception
     email: str = payload.get("sub")
     if email is None:
         raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    if not user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+    return load_active_user(db, email)
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    return authenticate_token(db, token)
 
 def require_role(allowed_roles: list[UserRole]):
     async def role_checker(current_user: User = Depends(get_current_user)):
@@ -56,17 +89,53 @@ def require_org_admin_or_platform_admin(current_user: User = Depends(get_current
         )
     return current_user
 
-def get_user_projects(user: User, db: Session):
-    """Get projects accessible by user based on role"""
+def project_access_clause(user: User, project_id_column):
+    """
+    SQL predicate that is true when `project_id_column` refers to a project the user may access.
+    Attach it to any query (filter, or select it as a labelled column to tell 403 from 404)
+    instead of materializing the accessible IDs in Python.
+    """
     if user.role == UserRole.PLATFORM_ADMIN:
-        # Platform admin sees all projects
-        from app.models.project import Project
-        return db.query(Project).all()
+        return true()
     elif user.role == UserRole.ORG_ADMIN:
-        # Org admin sees all projects in their organization
-        from app.models.project import Project
-        return db.query(Project).filter(Project.organization_id == user.organization_id).all()
+        return project_id_column.in_(
+            select(Project.id).where(Project.organization_id == user.organization_id)
+        )
     else:
-        # Auditor sees only assigned projects
-        return user.project_assignments
+        # Auditor: assigned projects only
+        return project_id_column.in_(
+            select(ProjectUser.project_id).where(ProjectUser.user_id == user.id)
+        )
+
+def audit_access_clause(user: User, audit_id_column):
+    """SQL predicate that is true when `audit_id_column` refers to an audit in an accessible project"""
+    if user.role == UserRole.PLATFORM_ADMIN:
+        return true()
+    return audit_id_column.in_(
+        select(Audit.id).where(project_access_clause(user, Audit.project_id))
+    )
 
+def resolve_audit_access(user: User, audit_id: int, db: Session):
+    """
+    Answer "can this user touch this audit" with one query on audits (by primary key)
+    plus the access predicate. Returns None when the audit does not exist, otherwise a bool.
+    Results are memoized on the session, i.e. for the rest of the request.
+    """
+    cache = db.info.setdefault("audit_access", {})
+    key = (user.id, audit_id)
+    if key not in cache:
+        cache[key] = db.query(
+            project_access_clause(user, Audit.project_id)
+        ).select_from(Audit).filter(Audit.id == audit_id).scalar()
+    return cache[key]
+
+def check_audit_access(user: User, audit_id: int, db: Session):
+    allowed = resolve_audit_access(user, audit_id, db)
+    if allowed is None:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+def get_user_projects(user: User, db: Session):
+    """Get projects accessible by user based on role"""
+    return db.query(Project).filter(project_access_clause(user, Project.id)).all()
@@ -0,0 +1,191 @@
+"""
+Evidence file storage.
+Uploads are streamed in fixed-size chunks into a temp file under UPLOAD_DIR
+(same filesystem, so the final rename is atomic), hashed on the fly and size
+checked while streaming; memory use does not depend on the upload size.
+
+Files are content-addressed: one blob per SHA-256 under blobs/<ab>/<cd>/<sha256>,
+shared by every Evidence row with that content and reference counted in
+evidence_blobs. Evidence rows from before the blob store point at their own
+file (file_path not in evidence_blobs) and own it outright.
+
+Files are never unlinked inside a request: dropping the last reference queues
+the file in file_deletions (same transaction) for app.services.file_reaper.
+"""
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Iterable, List, NamedTuple, Optional
+from fastapi import HTTPException
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.evidence_blob import EvidenceBlob
+from app.models.file_deletion import FileDeletion
+from app.models.finding import Evidence
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+TEMP_DIR_NAME = ".tmp"
+BLOB_DIR_NAME = "blobs"
+# Downscaled copies generated by app.services.evidence_renditions, stored next to the file
+RENDITION_NAMES = ("thumb", "report")
+
+class StoredFile(NamedTuple):
+    file_path: str  # relative to UPLOAD_DIR
+    file_size: int
+    sha256: str
+
+def file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+    )
+
+def get_temp_dir() -> str:
+    temp_dir = os.path.join(settings.UPLOAD_DIR, TEMP_DIR_NAME)
+    os.makedirs(temp_dir, exist_ok=True)
+    return temp_dir
+
+def blob_path(sha256: str) -> str:
+    """Relative path of the blob for a content hash, sharded on the first two byte pairs"""
+    return "/".join([BLOB_DIR_NAME, sha256[:2], sha256[2:4], sha256])
+
+def absolute_path(file_path: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, file_path)
+
+def rendition_file_path(file_path: str, name: str) -> str:
+    return f"{file_path}.{name}.jpg"
+
+def evidence_etag(evidence: Evidence, full_path: str, variant: Optional[str] = None) -> str:
+    """
+    Strong ETag from the content hash (suffixed with the rendition name for renditions);
+    weak size/mtime tag of `full_path` for files hashed before sha256 existed.
+    """
+    if evidence.sha256:
+        return f'"{evidence.sha256}-{variant}"' if variant else f'"{evidence.sha256}"'
+    stat = os.stat(full_path)
+    return f'W/"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+def place_blob(temp_path: str, sha256: str) -> str:
+    """Move a hashed temp file to its blob path (or drop it if the blob already exists)"""
+    file_path = blob_path(sha256)
+    target = absolute_path(file_path)
+    if os.path.exists(target):
+        os.remove(temp_path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+    return file_path
+
+def add_blob_references(db: Session, sha256: str, file_size: int, count: int = 1) -> str:
+    """Create the blob row or bump its reference count; returns the blob's relative path"""
+    stmt = insert(EvidenceBlob).values(
+        sha256=sha256, file_path=blob_path(sha256), file_size=file_size, ref_count=count
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EvidenceBlob.sha256],
+        set_={"ref_count": EvidenceBlob.ref_count + stmt.excluded.ref_count}
+    )
+    db.execute(stmt)
+    return blob_path(sha256)
+
+def store_upload(db: Session, source: BinaryIO) -> StoredFile:
+    """
+    Stream `source` into the blob store, enforcing MAX_UPLOAD_SIZE, and take one
+    reference on the resulting blob (in the caller's transaction).
+    Raises HTTPException(400) when the limit is exceeded; nothing is left on disk then.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=get_temp_dir(), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_SIZE:
+                    raise file_too_large()
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+
+        sha256 = digest.hexdigest()
+        # Row first: the ON CONFLICT row lock serializes against a concurrent release of the same blob
+        add_blob_references(db, sha256, size)
+        file_path = place_blob(temp_path, sha256)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return StoredFile(file_path=file_path, file_size=size, sha256=sha256)
+
+def add_evidence_references(db: Session, *criteria) -> int:
+    """
+    Take one blob reference for each Evidence row matching `criteria`; call after
+    inserting rows that point at existing blobs (e.g. copies). Returns the references added.
+    """
+    counts = select(
+        EvidenceBlob.sha256,
+        func.count(Evidence.id).label("n")
+    ).join(Evidence, Evidence.file_path == EvidenceBlob.file_path).where(
+        *criteria
+    ).group_by(EvidenceBlob.sha256).subquery()
+
+    added = db.execute(
+        update(EvidenceBlob).where(EvidenceBlob.sha256 == counts.c.sha256).values(
+            ref_count=EvidenceBlob.ref_count + counts.c.n
+        ).returning(counts.c.n)
+    ).scalars().all()
+    return sum(added)
+
+def enqueue_file_deletions(db: Session, file_paths: Iterable[str], reason: str) -> int:
+    """
+    Queue files for the file reaper in the caller's transaction: they are removed
+    only if it commits. Call file_reaper.wake() after the commit. Returns the files queued.
+    """
+    rows = [{"file_path": file_path, "reason": reason} for file_path in dict.fromkeys(file_paths)]
+    if not rows:
+        return 0
+    db.execute(
+        insert(FileDeletion).on_conflict_do_nothing(index_elements=[FileDeletion.file_path]),
+        rows
+    )
+    return len(rows)
+
+def release_evidence_files(db: Session, *criteria) -> List[str]:
+    """
+    Drop the references held by the Evidence rows matching `criteria`.
+    Call before those rows are deleted. The files that are no longer referenced
+    are queued for the file reaper (and returned); wake it after the commit.
+    """
+    # Pre-blob-store evidences own their file
+    legacy_paths = db.execute(
+        select(Evidence.file_path).outerjoin(
+            EvidenceBlob, EvidenceBlob.file_path == Evidence.file_path
+        ).where(*criteria, EvidenceBlob.sha256.is_(None))
+    ).scalars().all()
+
+    counts = select(
+        EvidenceBlob.sha256,
+        func.count(Evidence.id).label("n")
+    ).join(Evidence, Evidence.file_path == EvidenceBlob.file_path).where(
+        *criteria
+    ).group_by(EvidenceBlob.sha256).subquery()
+
+    released = db.execute(
+        update(EvidenceBlob).where(EvidenceBlob.sha256 == counts.c.sha256).values(
+            ref_count=EvidenceBlob.ref_count - counts.c.n
+        ).returning(EvidenceBlob.sha256, EvidenceBlob.file_path, EvidenceBlob.ref_count)
+    ).all()
+    dead = [row for row in released if row.ref_count <= 0]
+    if dead:
+        db.execute(delete(EvidenceBlob).where(EvidenceBlob.sha256.in_([row.sha256 for row in dead])))
+
+    file_paths = [row.file_path for row in dead] + list(legacy_paths)
+    enqueue_file_deletions(db, file_paths, "released")
+    return file_paths
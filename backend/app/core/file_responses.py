@@ -0,0 +1,157 @@
+"""
+File responses with HTTP caching and resumable downloads:
+strong ETag / Last-Modified validators, If-None-Match / If-Modified-Since -> 304,
+and single-range Range requests -> 206 (If-Range aware). With EVIDENCE_SERVE_MODE
+set to x-accel-redirect / x-sendfile the bytes are left to the reverse proxy.
+"""
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def guess_media_type(file_name: str) -> str:
+    media_type, _ = mimetypes.guess_type(file_name)
+    return media_type or "application/octet-stream"
+
+def content_disposition(file_name: str, disposition: str = "attachment") -> str:
+    quoted = quote(file_name)
+    if quoted != file_name:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{file_name}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Weak comparison for If-None-Match (RFC 9110 13.1.2)
+    return "*" in candidates or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in candidates]
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _requested_range(request: Request, etag: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) inclusive for a single satisfiable byte range, None to send the whole file"""
+    header = request.headers.get("range")
+    if not header or size == 0:
+        return None
+    if_range = request.headers.get("if-range")
+    # If-Range must match strongly; dates are not supported, so they fall back to a full response
+    if if_range is not None and (if_range.strip() != etag or etag.startswith("W/")):
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # multipart ranges are not served; the full body is a valid answer
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+def _iter_file(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def internal_redirect_response(
+    file_path: str,
+    full_path: str,
+    file_name: str,
+    etag: str,
+    media_type: Optional[str] = None,
+    disposition: str = "attachment"
+) -> Response:
+    """
+    Hand the transfer to the reverse proxy (EVIDENCE_SERVE_MODE x-accel-redirect / x-sendfile).
+    The proxy reads the file itself and handles Range and conditional requests.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": content_disposition(file_name, disposition),
+    }
+    if settings.EVIDENCE_SERVE_MODE == "x-accel-redirect":
+        headers["X-Accel-Redirect"] = settings.EVIDENCE_INTERNAL_LOCATION.rstrip("/") + "/" + quote(file_path)
+    else:
+        headers["X-Sendfile"] = os.path.abspath(full_path)
+    return Response(media_type=media_type or guess_media_type(file_name), headers=headers)
+
+def file_response(
+    request: Request,
+    file_path: str,
+    full_path: str,
+    file_name: str,
+    etag: str,
+    media_type: Optional[str] = None,
+    disposition: str = "attachment"
+) -> Response:
+    """Serve a stored file according to EVIDENCE_SERVE_MODE"""
+    if settings.EVIDENCE_SERVE_MODE in ("x-accel-redirect", "x-sendfile"):
+        return internal_redirect_response(file_path, full_path, file_name, etag, media_type, disposition)
+    return cached_file_response(request, full_path, file_name, etag, media_type, disposition)
+
+def cached_file_response(
+    request: Request,
+    path: str,
+    file_name: str,
+    etag: str,
+    media_type: Optional[str] = None,
+    disposition: str = "attachment"
+) -> Response:
+    """
+    Serve `path` with validators and Range support.
+    `etag` is the quoted entity tag, e.g. '"<sha256>"' (strong) or 'W/"..."'.
+    """
+    stat = os.stat(path)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        # Evidence is per-user authorized content: browsers may keep it, shared caches may not
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": content_disposition(file_name, disposition),
+    }
+    if _not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    media_type = media_type or guess_media_type(file_name)
+    byte_range = _requested_range(request, etag, stat.st_size)
+    if byte_range is None:
+        headers["Content-Length"] = str(stat.st_size)
+        return StreamingResponse(_iter_file(path, 0, stat.st_size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    return StreamingResponse(_iter_file(path, start, length), status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,86 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, delete
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Dict, List
+from app.models.finding import Finding
+from app.models.audit import Audit
+from app.models.finding_stats import FindingStat
+
+STAT_KEY_COLUMNS = ["project_id", "day", "severity", "status"]
+
+def _grouped_findings_select(count_expression, *criteria):
+    """SELECT project_id, day, severity, status, <count> FROM findings JOIN audits ... GROUP BY key"""
+    day = func.date(Finding.created_at)
+    return select(
+        Audit.project_id,
+        day,
+        Finding.severity,
+        Finding.status,
+        count_expression
+    ).select_from(Finding).join(Audit, Finding.audit_id == Audit.id).where(
+        *criteria
+    ).group_by(Audit.project_id, day, Finding.severity, Finding.status)
+
+def _apply_delta(db: Session, sign: int, criteria):
+    stmt = insert(FindingStat).from_select(
+        STAT_KEY_COLUMNS + ["count"],
+        _grouped_findings_select(func.count(Finding.id) * sign, *criteria)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=STAT_KEY_COLUMNS,
+        set_={"count": FindingStat.count + stmt.excluded.count}
+    )
+    db.execute(stmt)
+
+def record_findings_added(db: Session, *criteria):
+    """
+    Add the findings matching `criteria` to the rollup.
+    Call after the findings have been flushed, e.g. record_findings_added(db, Finding.audit_id == audit_id).
+    """
+    _apply_delta(db, 1, criteria)
+
+def record_findings_removed(db: Session, *criteria):
+    """
+    Subtract the findings matching `criteria` from the rollup.
+    Call while the rows still hold their old values (before delete or before an update is flushed).
+    The rows are locked first (kept until commit), so concurrent updates of the same findings
+    are serialized and never subtract the same old bucket twice.
+    """
+    db.execute(select(Finding.id).where(*criteria).with_for_update())
+    _apply_delta(db, -1, criteria)
+
+def rebuild_finding_stats(db: Session) -> int:
+    """Recompute the whole rollup from the findings table. Returns the number of rollup rows."""
+    db.execute(delete(FindingStat))
+    result = db.execute(
+        insert(FindingStat).from_select(
+            STAT_KEY_COLUMNS + ["count"],
+            _grouped_findings_select(func.count(Finding.id))
+        )
+    )
+    return result.rowcount
+
+def check_finding_stats(db: Session) -> List[Dict[str, Any]]:
+    """Compare the rollup against a fresh aggregation. Returns one entry per mismatching key."""
+    expected = {
+        tuple(row[:4]): row[4]
+        for row in db.execute(_grouped_findings_select(func.count(Finding.id))).all()
+    }
+    actual = {
+        (row.project_id, row.day, row.severity, row.status): row.count
+        for row in db.query(FindingStat).filter(FindingStat.count != 0).all()
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        if expected.get(key, 0) != actual.get(key, 0):
+            project_id, day, severity, status = key
+            mismatches.append({
+                "project_id": project_id,
+                "day": str(day),
+                "severity": severity.value,
+                "status": status.value,
+                "expected": expected.get(key, 0),
+                "actual": actual.get(key, 0),
+            })
+    return mismatches
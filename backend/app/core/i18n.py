@@ -1,4 +1,5 @@
 from fastapi import Request, Query
+from sqlalchemy import func
 from app.core.config import settings
 
 def get_language(request: Request = None, lang: str = Query(None)) -> str:
@@ -45,3 +46,20 @@ def get_template_field(obj, field_name: str, lang: str = "tr") -> str:
     value = getattr(obj, field_name, None)
     return str(value).strip() if value and str(value).strip() else ""
 
+
+# The characters str.strip() removes, so the SQL side trims exactly like get_template_field
+STRIP_CHARACTERS = "".join(c for c in map(chr, range(0x110000)) if c.isspace())
+
+def _stripped(column):
+    return func.btrim(column, STRIP_CHARACTERS)
+
+def template_field_expression(model, field_name: str, lang: str = "tr"):
+    """
+    SQL counterpart of get_template_field, for INSERT ... SELECT from template rows:
+    COALESCE(NULLIF(BTRIM(<field>_en, <whitespace>), ''), NULLIF(BTRIM(<field>, <whitespace>), ''), '')
+    """
+    value = func.coalesce(func.nullif(_stripped(getattr(model, field_name)), ""), "")
+    en_column = getattr(model, f"{field_name}_en", None)
+    if lang == "en" and en_column is not None:
+        value = func.coalesce(func.nullif(_stripped(en_column), ""), value)
+    return value
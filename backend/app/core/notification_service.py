@@ -1,8 +1,93 @@
+import json
+from datetime import timedelta
+from sqlalchemy import Integer, Select, String, cast, column, event, func, literal, select, union_all, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 from app.models.notification import Notification, NotificationType
 from app.models.user import User
 
+# Notifications queued during a transaction are written by one INSERT when it commits
+PENDING_NOTIFICATIONS_KEY = "pending_notifications"
+NOTIFICATION_COLUMNS = ["user_id", "type", "title", "message", "related_entity_type", "related_entity_id"]
+# PostgreSQL NOTIFY channel announcing users whose notifications changed (see
+# app/services/notification_stream.py); payloads stay well under the 8000 byte limit
+NOTIFICATION_CHANNEL = "notification_changes"
+NOTIFY_USER_IDS_PER_PAYLOAD = 500
+
+def publish_notification_changes(db: Session, user_ids: Iterable[int]):
+    """
+    Tell the notification streams of every API process that these users' notifications
+    (new ones or the unread count) changed. NOTIFY is transactional: it is delivered
+    when the caller commits and dropped if it rolls back.
+    """
+    user_ids = sorted(set(user_ids))
+    for start in range(0, len(user_ids), NOTIFY_USER_IDS_PER_PAYLOAD):
+        payload = json.dumps({"user_ids": user_ids[start:start + NOTIFY_USER_IDS_PER_PAYLOAD]})
+        db.execute(select(func.pg_notify(NOTIFICATION_CHANNEL, payload)))
+
+class NotificationDispatcher:
+    """
+    Collects the notifications a transaction produces: single recipients, and recipient
+    sets given as a SELECT of user ids (resolved by the database). Identical notifications
+    (same recipient and content) are written once. Lives in Session.info until commit.
+    """
+    def __init__(self):
+        self.rows: Dict[Tuple, Dict[str, Any]] = {}
+        self.recipient_sets: Dict[Tuple, Tuple[Select, Dict[str, Any]]] = {}
+
+    def add(self, user_id: int, content: Dict[str, Any]):
+        self.rows.setdefault((user_id,) + tuple(content.values()), dict(content, user_id=user_id))
+
+    def add_recipients(self, recipients: Select, content: Dict[str, Any]):
+        key = (str(recipients.compile(compile_kwargs={"literal_binds": True})),) + tuple(content.values())
+        self.recipient_sets.setdefault(key, (recipients, content))
+
+    def __bool__(self):
+        return bool(self.rows or self.recipient_sets)
+
+    def statement(self):
+        """INSERT INTO notifications SELECT DISTINCT ... FROM (VALUES ... UNION ALL SELECT ...)"""
+        table = Notification.__table__
+        # Sources carry the type as its name (and untyped NULLs); the outer SELECT casts
+        # every column to the table's type
+        column_types = {name: table.c[name].type for name in NOTIFICATION_COLUMNS}
+        column_types["type"] = String()
+        sources = []
+        if self.rows:
+            sources.append(select(
+                values(*[column(name, column_types[name]) for name in NOTIFICATION_COLUMNS], name="queued").data([
+                    tuple(row[name].name if name == "type" else row[name] for name in NOTIFICATION_COLUMNS)
+                    for row in self.rows.values()
+                ])
+            ))
+        for recipients, content in self.recipient_sets.values():
+            recipient_ids = recipients.subquery()
+            sources.append(select(
+                recipient_ids.c[0].label("user_id"),
+                *[
+                    literal(content[name].name if name == "type" else content[name], column_types[name]).label(name)
+                    for name in NOTIFICATION_COLUMNS[1:]
+                ]
+            ))
+        queued = (union_all(*sources) if len(sources) > 1 else sources[0]).subquery("queued_notifications")
+        return insert(Notification).from_select(
+            NOTIFICATION_COLUMNS,
+            select(*[cast(queued.c[name], table.c[name].type) for name in NOTIFICATION_COLUMNS]).distinct()
+        ).returning(Notification.user_id)
+
+def _dispatcher(db: Session) -> NotificationDispatcher:
+    return db.info.setdefault(PENDING_NOTIFICATIONS_KEY, NotificationDispatcher())
+
+def _content(notification_type, title, message, related_entity_type, related_entity_id) -> Dict[str, Any]:
+    return {
+        "type": notification_type,
+        "title": title,
+        "message": message,
+        "related_entity_type": related_entity_type,
+        "related_entity_id": related_entity_id,
+    }
+
 def create_notification(
     db: Session,
     user_id: int,
@@ -12,89 +97,113 @@ def create_notification(
     related_entity_type: Optional[str] = None,
     related_entity_id: Optional[int] = None
 ):
-    """Create a notification for a user"""
-    notification = Notification(
-        user_id=user_id,
-        type=notification_type,
-        title=title,
-        message=message,
-        related_entity_type=related_entity_type,
-        related_entity_id=related_entity_id
+    """Queue a notification for a user; it is written when the caller commits"""
+    _dispatcher(db).add(user_id, _content(notification_type, title, message, related_entity_type, related_entity_id))
+
+def create_notifications_for(
+    db: Session,
+    recipients: Select,
+    notification_type: NotificationType,
+    title: str,
+    message: str,
+    related_entity_type: Optional[str] = None,
+    related_entity_id: Optional[int] = None
+):
+    """
+    Queue a notification for every user id returned by `recipients` (a one-column SELECT,
+    e.g. select(ProjectUser.user_id).where(...)); the database resolves it at commit.
+    """
+    _dispatcher(db).add_recipients(
+        recipients, _content(notification_type, title, message, related_entity_type, related_entity_id)
     )
-    db.add(notification)
-    db.flush()  # Don't commit, let the caller commit
-    return notification
 
-def check_due_dates(db: Session):
-    """Check for findings that are due soon or overdue and create notifications"""
-    from datetime import datetime, timedelta
+@event.listens_for(Session, "before_commit")
+def _write_pending_notifications(session: Session):
+    dispatcher = session.info.pop(PENDING_NOTIFICATIONS_KEY, None)
+    if dispatcher:
+        recipients = session.execute(dispatcher.statement()).scalars().all()
+        publish_notification_changes(session, recipients)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_notifications(session: Session, previous_transaction):
+    session.info.pop(PENDING_NOTIFICATIONS_KEY, None)
+
+# Assigned, still open findings due within this window get a "due soon" reminder
+DUE_SOON_DAYS = 3
+DUE_DATE_NOTIFICATION_TYPES = (NotificationType.FINDING_DUE_SOON, NotificationType.FINDING_OVERDUE)
+
+def _whole_days(interval):
+    """Whole days of a timestamp difference, rounded down like timedelta.days"""
+    return cast(func.floor(func.extract("epoch", interval) / 86400), Integer)
+
+def scan_due_dates(db: Session) -> int:
+    """
+    Create the missing due-soon and overdue notifications for assigned open findings
+    with one INSERT ... SELECT ... WHERE NOT EXISTS statement (uq_notifications_due_date
+    makes concurrent scans harmless). Does not commit; returns the notifications created.
+    """
     from app.models.finding import Finding
     from app.models.template import Status
-    
-    now = datetime.now()
-    three_days_later = now + timedelta(days=3)
-    
-    # Find findings due in next 3 days (not yet notified)
-    findings_due_soon = db.query(Finding).filter(
-        Finding.due_date.isnot(None),
-        Finding.due_date <= three_days_later,
-        Finding.due_date > now,
-        Finding.status.in_([Status.OPEN, Status.IN_PROGRESS]),
-        Finding.assigned_to_user_id.isnot(None)
-    ).all()
-    
-    # Find overdue findings
-    overdue_findings = db.query(Finding).filter(
+
+    now = func.now()
+    open_assigned = (
         Finding.due_date.isnot(None),
-        Finding.due_date < now,
         Finding.status.in_([Status.OPEN, Status.IN_PROGRESS]),
-        Finding.assigned_to_user_id.isnot(None)
-    ).all()
-    
-    for finding in findings_due_soon:
-        # Check if notification already exists (simplified - in production, track this better)
-        existing = db.query(Notification).filter(
-            Notification.user_id == finding.assigned_to_user_id,
-            Notification.type == NotificationType.FINDING_DUE_SOON,
-            Notification.related_entity_type == "finding",
-            Notification.related_entity_id == finding.id
-        ).first()
-        
-        if not existing:
-            create_notification(
-                db=db,
-                user_id=finding.assigned_to_user_id,
-                notification_type=NotificationType.FINDING_DUE_SOON,
-                title="Bulgu Yakında Son Tarih",
-                message=f'"{finding.title}" bulgusu yakında son tarih ({(finding.due_date - now).days} gün kaldı)',
-                related_entity_type="finding",
-                related_entity_id=finding.id
-            )
-    
-    for finding in overdue_findings:
-        # Check if notification already exists
-        existing = db.query(Notification).filter(
-            Notification.user_id == finding.assigned_to_user_id,
-            Notification.type == NotificationType.FINDING_OVERDUE,
-            Notification.related_entity_type == "finding",
-            Notification.related_entity_id == finding.id
-        ).first()
-        
-        if not existing:
-            days_overdue = (now - finding.due_date).days
-            create_notification(
-                db=db,
-                user_id=finding.assigned_to_user_id,
-                notification_type=NotificationType.FINDING_OVERDUE,
-                title="Bulgu Son Tarih Geçti",
-                message=f'"{finding.title}" bulgusu son tarih geçti ({days_overdue} gün)',
-                related_entity_type="finding",
-                related_entity_id=finding.id
-            )
-    
-    db.commit()
-
-
-
+        Finding.assigned_to_user_id.isnot(None),
+    )
+    due_soon = select(
+        Finding.assigned_to_user_id.label("user_id"),
+        literal(NotificationType.FINDING_DUE_SOON.name).label("type"),
+        literal("Bulgu Yakında Son Tarih").label("title"),
+        func.concat(
+            '"', Finding.title, '" bulgusu yakında son tarih (',
+            _whole_days(Finding.due_date - now), " gün kaldı)"
+        ).label("message"),
+        Finding.id.label("finding_id"),
+    ).where(
+        *open_assigned,
+        Finding.due_date > now,
+        Finding.due_date <= now + timedelta(days=DUE_SOON_DAYS)
+    )
+    overdue = select(
+        Finding.assigned_to_user_id,
+        literal(NotificationType.FINDING_OVERDUE.name),
+        literal("Bulgu Son Tarih Geçti"),
+        func.concat(
+            '"', Finding.title, '" bulgusu son tarih geçti (',
+            _whole_days(now - Finding.due_date), " gün)"
+        ),
+        Finding.id,
+    ).where(*open_assigned, Finding.due_date < now)
+    candidates = union_all(due_soon, overdue).subquery("candidates")
+    notification_type = cast(candidates.c.type, Notification.__table__.c.type.type)
 
+    already_notified = select(Notification.id).where(
+        Notification.user_id == candidates.c.user_id,
+        Notification.type == notification_type,
+        Notification.related_entity_type == "finding",
+        Notification.related_entity_id == candidates.c.finding_id
+    ).exists()
+    stmt = insert(Notification).from_select(
+        ["user_id", "type", "title", "message", "related_entity_type", "related_entity_id"],
+        select(
+            candidates.c.user_id,
+            notification_type,
+            candidates.c.title,
+            candidates.c.message,
+            literal("finding"),
+            candidates.c.finding_id
+        ).where(~already_notified)
+    ).on_conflict_do_nothing(
+        index_elements=["user_id", "type", "related_entity_type", "related_entity_id"],
+        index_where=Notification.type.in_(DUE_DATE_NOTIFICATION_TYPES)
+    ).returning(Notification.user_id)
+    recipients = db.execute(stmt).scalars().all()
+    publish_notification_changes(db, recipients)
+    return len(recipients)
 
+def check_due_dates(db: Session) -> int:
+    """Check for findings that are due soon or overdue and create notifications"""
+    created = scan_due_dates(db)
+    db.commit()
+    return created
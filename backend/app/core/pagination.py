@@ -0,0 +1,67 @@
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_, literal
+from typing import Any, List, Optional, Sequence
+from datetime import datetime
+import base64
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the given key columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        values = []
+        for column, value in zip(columns, payload):
+            if column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif column.type.python_type is int:
+                value = int(value)
+            values.append(value)
+        return values
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(
+    query,
+    key_columns: Sequence,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = False
+) -> list:
+    """
+    Order `query` by `key_columns` and return one page.
+
+    With a cursor the page starts right after the cursor's key (keyset
+    pagination, backed by an index on the key columns); without one the
+    legacy skip/limit offset is used. In both cases the cursor for the next
+    page is returned in the X-Next-Cursor header when more rows exist.
+    """
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in key_columns])
+
+    if cursor:
+        values = decode_cursor(cursor, key_columns)
+        key = tuple_(*key_columns)
+        bound = tuple_(*[literal(value, column.type) for column, value in zip(key_columns, values)])
+        query = query.filter(key < bound if descending else key > bound)
+    elif skip:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in key_columns])
+    return rows
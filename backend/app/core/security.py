@@ -1,7 +1,11 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
+import asyncio
 import bcrypt
+import threading
+import time
 from app.core.config import settings
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,11 +26,72 @@ def get_password_hash(password: str) -> str:
     if isinstance(password, str):
         password = password.encode('utf-8')
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password, salt)
     # Return as string
     return hashed.decode('utf-8')
 
+class PasswordHashPool:
+    """
+    Bounded thread pool for bcrypt. bcrypt releases the GIL, so running it here keeps
+    the event loop responsive while at most `workers` hashes run at once; extra
+    requests wait in the executor queue. Counters are exposed via /system/metrics.
+    With 0 workers bcrypt runs inline on the event loop (the baseline of
+    scripts/benchmark_login_storm.py).
+    """
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash") if workers > 0 else None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def _run(self, submitted_at: float, fn, *args):
+        wait_ms = (time.perf_counter() - submitted_at) * 1000
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            self.queued += 1
+        if self._executor is None:
+            return self._run(time.perf_counter(), fn, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, time.perf_counter(), fn, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "avg_wait_ms": round(self.total_wait_ms / self.completed, 2) if self.completed else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 2),
+            }
+
+password_hash_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hash pool (for async endpoints)"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hash pool (for async endpoints)"""
+    return await password_hash_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
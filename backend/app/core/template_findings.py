@@ -0,0 +1,29 @@
+from sqlalchemy import insert, literal, select
+from sqlalchemy.orm import Session
+from app.core.i18n import template_field_expression
+from app.models.finding import Finding
+from app.models.template import TemplateItem
+
+def create_findings_from_template(db: Session, template_id: int, audit_id: int, lang: str = "tr") -> int:
+    """
+    Create one finding per template item with a single INSERT ... SELECT, in item order.
+    Texts are picked in SQL like get_template_field does. Returns the number of findings created.
+    """
+    items = select(
+        literal(audit_id),
+        template_field_expression(TemplateItem, "default_title", lang),
+        template_field_expression(TemplateItem, "default_description", lang),
+        TemplateItem.control_reference,
+        TemplateItem.default_severity,
+        TemplateItem.default_status,
+        template_field_expression(TemplateItem, "default_recommendation", lang),
+    ).where(
+        TemplateItem.template_id == template_id
+    ).order_by(TemplateItem.order_number, TemplateItem.id)
+    result = db.execute(
+        insert(Finding).from_select(
+            ["audit_id", "title", "description", "control_reference", "severity", "status", "recommendation"],
+            items
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,137 @@
+"""
+In-process cache of authenticated principals for get_current_user.
+
+Entries are keyed by the token subject (email) and hold a snapshot of the
+user's columns. Every change to those (user update/delete, password change,
+organization delete) calls invalidate_user(s)/clear() after its commit, which
+also NOTIFYs USER_CACHE_CHANNEL so the other worker processes drop their
+entries too (app.core.db_listener). While this process's listener is not
+connected, invalidations from other processes could be missed, so the cache
+is bypassed; it is emptied again on every (re)connect.
+
+A miss reads the user and then put()s it with the generation it saw before
+reading; if any invalidation arrived in between, the (possibly stale) row is
+not cached.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+from app.core.config import settings
+from app.core.db_listener import db_listener, notify_now
+
+USER_CACHE_CHANNEL = "user_cache_invalidations"
+
+# Columns copied into the snapshot. hashed_password is deliberately left out:
+# it stays expired on the rebuilt instance and is loaded on demand.
+PRINCIPAL_COLUMNS = ("id", "email", "full_name", "role", "is_active", "organization_id")
+
+class UserCache:
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.generation = 0
+        db_listener.register(USER_CACHE_CHANNEL, self._handle, on_connect=self._drop_all)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0 and db_listener.connected
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        """Return the cached principal for a token subject, or None on a miss"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject: str, principal: Dict[str, Any], generation: int):
+        """Cache a principal read after `generation` was taken (skipped if invalidated since)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_users(self, user_ids: Iterable[int]):
+        """
+        Drop the entries of the given users (whatever email they are cached under),
+        here and in the other processes. Call after committing the change.
+        """
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return
+        self._drop_users(user_ids)
+        self._broadcast({"user_ids": user_ids})
+
+    def invalidate_user(self, user_id: int):
+        self.invalidate_users([user_id])
+
+    def clear(self):
+        self._drop_all()
+        self._broadcast({"all": True})
+
+    def _drop_users(self, user_ids: Iterable[int]):
+        user_ids = set(user_ids)
+        with self._lock:
+            for subject in [s for s, (_, p) in self._entries.items() if p["id"] in user_ids]:
+                del self._entries[subject]
+            self.generation += 1
+            self.invalidations += len(user_ids)
+
+    def _drop_all(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def _broadcast(self, message: Dict[str, Any]):
+        try:
+            notify_now(USER_CACHE_CHANNEL, json.dumps(message))
+        except Exception as e:
+            # Other processes keep their entries for at most the TTL
+            print(f"Warning: Could not broadcast user cache invalidation: {e}")
+
+    def _handle(self, payload: str):
+        message = json.loads(payload)
+        if message.get("all"):
+            self._drop_all()
+        else:
+            self._drop_users(message["user_ids"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "listening": db_listener.connected,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+def make_principal(user) -> Dict[str, Any]:
+    return {column: getattr(user, column) for column in PRINCIPAL_COLUMNS}
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_SIZE)
@@ -1,11 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.db.database import engine, Base
+from app.services.file_reaper import file_reaper
+from app.core.db_listener import db_listener
+from app.services.scheduler import scheduler
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -25,6 +28,7 @@ if settings.DEBUG and "*" in settings.ALLOWED_ORIGINS:
         allow_credentials=False,  # * ile credentials kullanılamaz
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 else:
     app.add_middleware(
@@ -33,16 +37,31 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
-# Static files for uploads
+# Upload directory (evidence files are only served through the authorized download endpoint)
 if not os.path.exists(settings.UPLOAD_DIR):
     os.makedirs(settings.UPLOAD_DIR)
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 # API routes
 app.include_router(api_router, prefix="/api/v1")
 
+# Background workers: file reaper (queued evidence file deletions), the
+# periodic job scheduler (due-date notifications) and the database listener
+# (user cache invalidations, /notifications/stream)
+@app.on_event("startup")
+def start_background_workers():
+    file_reaper.start()
+    scheduler.start()
+    db_listener.start()
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    file_reaper.stop()
+    scheduler.stop()
+    db_listener.stop()
+
 @app.get("/")
 async def root():
     return {"message": "ArchRampart Audit API", "version": "1.0.0"}
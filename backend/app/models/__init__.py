@@ -4,6 +4,9 @@ from app.models.project import Project
 from app.models.audit import Audit, AuditStatus
 from app.models.template import Template, TemplateItem
 from app.models.finding import Finding, Evidence, FindingComment
+from app.models.finding_stats import FindingStat
+from app.models.evidence_blob import EvidenceBlob
+from app.models.file_deletion import FileDeletion
 from app.models.activity import ActivityLog
 from app.models.notification import Notification, NotificationType
 
@@ -18,6 +21,9 @@ __all__ = [
     "Finding",
     "Evidence",
     "FindingComment",
+    "FindingStat",
+    "EvidenceBlob",
+    "FileDeletion",
     "ActivityLog",
     "Notification",
     "NotificationType",
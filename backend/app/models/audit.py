@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -35,6 +35,10 @@ class AuditStatus(str, enum.Enum):
 
 class Audit(Base):
     __tablename__ = "audits"
+    __table_args__ = (
+        # Keyset pagination of a project's audits on id
+        Index("ix_audits_project_id_id", "project_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
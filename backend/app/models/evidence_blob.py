@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class EvidenceBlob(Base):
+    """Content-addressed evidence file, shared by every Evidence row with the same SHA-256"""
+    __tablename__ = "evidence_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String, nullable=False, unique=True)  # relative to UPLOAD_DIR, e.g. blobs/ab/cd/<sha256>
+    file_size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # number of Evidence rows pointing at file_path
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class FileDeletion(Base):
+    """
+    A file under UPLOAD_DIR to be removed by the file reaper (app.services.file_reaper).
+    Inserted in the transaction that drops the file's last reference, so the file is
+    removed if and only if that transaction commits.
+    """
+    __tablename__ = "file_deletions"
+
+    id = Column(BigInteger, primary_key=True)
+    file_path = Column(String, nullable=False, unique=True)  # relative to UPLOAD_DIR
+    reason = Column(String, nullable=False)  # 'released', 'orphan'
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    due_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -6,6 +6,10 @@ from app.models.template import Severity, Status
 
 class Finding(Base):
     __tablename__ = "findings"
+    __table_args__ = (
+        # Keyset pagination of an audit's findings on id
+        Index("ix_findings_audit_id_id", "audit_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     audit_id = Column(Integer, ForeignKey("audits.id", ondelete="CASCADE"), nullable=False)
@@ -30,10 +34,11 @@ class Evidence(Base):
     __tablename__ = "evidences"
 
     id = Column(Integer, primary_key=True, index=True)
-    finding_id = Column(Integer, ForeignKey("findings.id", ondelete="CASCADE"), nullable=False)
+    finding_id = Column(Integer, ForeignKey("findings.id", ondelete="CASCADE"), nullable=False, index=True)
     file_path = Column(String, nullable=False)
     file_name = Column(String, nullable=False)
     file_size = Column(Integer, nullable=True)
+    sha256 = Column(String(64), nullable=True, index=True)  # content hash, for integrity checks and dedup
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
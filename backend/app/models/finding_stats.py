@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Enum
+from app.db.database import Base
+from app.models.template import Severity, Status
+
+class FindingStat(Base):
+    """Per-project, per-day finding counts maintained incrementally by app.core.finding_stats"""
+    __tablename__ = "finding_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # Day the findings were created
+    severity = Column(Enum(Severity), primary_key=True)
+    status = Column(Enum(Status), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -14,6 +14,17 @@ class NotificationType(str, enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination of a user's notifications on (created_at, id)
+        Index("ix_notifications_user_created_at_id", "user_id", "created_at", "id"),
+        # One due-date reminder per (user, type, finding); the scheduled scan relies on it
+        Index(
+            "uq_notifications_due_date",
+            "user_id", "type", "related_entity_type", "related_entity_id",
+            unique=True,
+            postgresql_where=text("type IN ('FINDING_DUE_SOON', 'FINDING_OVERDUE')")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Table
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -39,3 +39,8 @@ class ProjectUser(Base):
     project = relationship("Project")
     user = relationship("User")
 
+    __table_args__ = (
+        # Backs the auditor branch of the access predicate (user_id -> project_id, index-only)
+        Index("ix_project_user_assignments_user_project", "user_id", "project_id"),
+    )
+
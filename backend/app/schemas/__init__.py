@@ -1,4 +1,4 @@
-from app.schemas.user import User, UserCreate, UserUpdate, UserInDB
+from app.schemas.user import User, UserCreate, UserUpdate, UserInDB, UserBrief
 from app.schemas.organization import Organization, OrganizationCreate, OrganizationUpdate
 from app.schemas.project import Project, ProjectCreate, ProjectUpdate
 from app.schemas.audit import Audit, AuditCreate, AuditUpdate
@@ -7,7 +7,7 @@ from app.schemas.finding import Finding, FindingCreate, FindingUpdate, Evidence,
 from app.schemas.auth import Token, TokenData, Login
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate", "UserInDB",
+    "User", "UserCreate", "UserUpdate", "UserInDB", "UserBrief",
     "Organization", "OrganizationCreate", "OrganizationUpdate",
     "Project", "ProjectCreate", "ProjectUpdate",
     "Audit", "AuditCreate", "AuditUpdate",
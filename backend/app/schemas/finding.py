@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 from app.models.template import Severity, Status
+from app.schemas.user import UserBrief
 
 class EvidenceBase(BaseModel):
     description: Optional[str] = None
@@ -15,6 +16,7 @@ class Evidence(EvidenceBase):
     file_path: str
     file_name: str
     file_size: Optional[int] = None
+    sha256: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -31,7 +33,7 @@ class FindingComment(FindingCommentBase):
     finding_id: int
     user_id: int
     created_at: datetime
-    user: Optional[dict] = None  # Will be populated with user info
+    user: Optional[UserBrief] = None
 
     class Config:
         from_attributes = True
@@ -66,8 +68,18 @@ class Finding(FindingBase):
     updated_at: Optional[datetime] = None
     evidences: List[Evidence] = []
     comments: List[FindingComment] = []
-    assigned_to: Optional[dict] = None  # Will be populated with user info
+    assigned_to: Optional[UserBrief] = None
 
     class Config:
         from_attributes = True
 
+# Validators/serializers built once at import time. validate_python(..., from_attributes=True)
+# reads ORM objects (and their loaded relationships) directly into models; dump_json
+# writes the response body without going through intermediate dicts.
+finding_list_adapter = TypeAdapter(List[Finding])
+finding_comment_list_adapter = TypeAdapter(List[FindingComment])
+
+def serialize_findings_json(findings) -> bytes:
+    """Serialize ORM Finding objects to a JSON array"""
+    return finding_list_adapter.dump_json(finding_list_adapter.validate_python(findings, from_attributes=True))
+
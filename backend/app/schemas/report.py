@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class ReportJob(BaseModel):
+    id: str
+    audit_id: int
+    language: str
+    status: str  # queued, running, completed, failed
+    progress: int  # 0-100
+    stage: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -33,6 +33,15 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class UserBrief(BaseModel):
+    """Minimal user info embedded in other responses"""
+    id: int
+    full_name: str
+    email: str
+
+    class Config:
+        from_attributes = True
+
 class UserInDB(User):
     hashed_password: str
 
@@ -0,0 +1,98 @@
+"""
+Dashboard statistics aggregation
+Severity/status distributions come from the finding_stats rollup (O(projects));
+only the user- and time-dependent counters touch the findings table, through
+its assigned_to_user_id and due_date indexes.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, and_
+from typing import Any, Callable, Dict, List
+from datetime import datetime, timedelta
+from app.models.finding import Finding
+from app.models.audit import Audit, AuditStatus
+from app.models.finding_stats import FindingStat
+from app.models.template import Severity, Status
+
+OPEN_STATUSES = (Status.OPEN, Status.IN_PROGRESS)
+URGENT_SEVERITIES = (Severity.CRITICAL, Severity.HIGH)
+DUE_SOON_DAYS = 3
+
+def _finding_grid(db: Session, scope: Callable) -> Dict:
+    """{(severity, status): count} summed over the rollup rows in scope"""
+    rows = db.query(
+        FindingStat.severity,
+        FindingStat.status,
+        func.sum(FindingStat.count)
+    ).filter(*scope(FindingStat.project_id)).group_by(FindingStat.severity, FindingStat.status).all()
+    return {(severity, status): int(count or 0) for severity, status, count in rows}
+
+def _row_level_counters(db: Session, user_id: int, scope: Callable, now: datetime):
+    """Counters that depend on the current user or the clock, in one index-backed pass"""
+    is_open = Finding.status.in_(OPEN_STATUSES)
+    due_soon_limit = now + timedelta(days=DUE_SOON_DAYS)
+    is_overdue = and_(Finding.due_date < now, is_open)
+    is_due_soon = and_(Finding.due_date <= due_soon_limit, Finding.due_date > now, is_open)
+
+    return db.query(
+        func.count(Finding.id).filter(Finding.assigned_to_user_id == user_id).label("mine"),
+        func.count(Finding.id).filter(is_overdue).label("overdue"),
+        func.count(Finding.id).filter(is_due_soon).label("due_soon"),
+    ).select_from(Finding).join(Audit).filter(
+        *scope(Audit.project_id),
+        or_(
+            Finding.assigned_to_user_id == user_id,
+            and_(Finding.due_date.isnot(None), Finding.due_date <= due_soon_limit, is_open)
+        )
+    ).one()
+
+def compute_dashboard_stats(
+    db: Session,
+    user_id: int,
+    scope: Callable[[Any], List],
+    total_projects: int
+) -> Dict[str, Any]:
+    """
+    Compute dashboard statistics.
+    `scope(column)` returns the project filter criteria for a project_id column.
+    Returns the same shape as the /analytics/dashboard response.
+    """
+    # Audits grouped by status
+    audit_rows = db.query(Audit.status, func.count(Audit.id)).filter(
+        *scope(Audit.project_id)
+    ).group_by(Audit.status).all()
+    audit_counts = {status: count for status, count in audit_rows}
+    audit_status_dist = {status.value: audit_counts.get(status, 0) for status in AuditStatus}
+
+    # Severity x status grid from the rollup
+    grid = _finding_grid(db, scope)
+    severity_dist = {
+        severity.value: sum(grid.get((severity, status), 0) for status in Status) for severity in Severity
+    }
+    finding_status_dist = {
+        status.value: sum(grid.get((severity, status), 0) for severity in Severity) for status in Status
+    }
+    total_findings = sum(grid.values())
+    open_findings = sum(finding_status_dist[status.value] for status in OPEN_STATUSES)
+    urgent_findings = sum(
+        grid.get((severity, status), 0) for severity in URGENT_SEVERITIES for status in OPEN_STATUSES
+    )
+
+    row = _row_level_counters(db, user_id, scope, datetime.now())
+
+    completed_findings = finding_status_dist[Status.RESOLVED.value]
+    completion_rate = (completed_findings / total_findings * 100) if total_findings > 0 else 0
+
+    return {
+        "total_projects": total_projects,
+        "total_audits": sum(audit_status_dist.values()),
+        "total_findings": total_findings,
+        "open_findings": open_findings,
+        "urgent_findings": urgent_findings,
+        "my_findings": row.mine,
+        "overdue_findings": row.overdue,
+        "due_soon_findings": row.due_soon,
+        "completion_rate": round(completion_rate, 2),
+        "audit_status_distribution": audit_status_dist,
+        "severity_distribution": severity_dist,
+        "status_distribution": finding_status_dist,
+    }
@@ -0,0 +1,257 @@
+"""
+Streaming .docx writer for large reports.
+
+python-docx keeps the whole document tree (and every embedded image) in memory
+until save(), and looks up the next shape id by scanning the whole document
+for each picture. For audits with thousands of findings that means minutes and
+gigabytes. This writer keeps python-docx for the layout but not for the bulk:
+
+- the small parts of the report (cover, summary, conclusion, ...) are built as a
+  normal Document with an insertion point where the repeated content goes;
+- each repeated block is rendered by a FragmentRenderer into a reusable scratch
+  Document and serialized to a Fragment (paragraph XML + the images it uses);
+- fragments are appended to a temp file and their images written straight into
+  the zip container.
+
+On close the skeleton's document.xml is written around the streamed body, and
+the relationships and content types are extended with the images. Memory stays
+bounded by one block plus one image.
+
+Fragments are independent, so FragmentPool can render them in worker processes
+(image headers are parsed and hashed there too); the writer only renumbers
+relationship and shape ids and copies the image files.
+"""
+import io
+import multiprocessing
+import re
+import tempfile
+import time
+import uuid
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+from docx import Document
+from docx.image.image import Image as DocxImage
+from docx.oxml.ns import qn
+from docx.oxml.shape import CT_Inline
+from docx.shared import Length
+from docx.text.run import Run
+from lxml import etree
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS_PART = "word/_rels/document.xml.rels"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+IMAGE_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+COPY_CHUNK_SIZE = 1024 * 1024
+# Relationship ids inside a fragment, replaced by document-wide ones when it is written
+FRAGMENT_RID_PREFIX = "rIdFragment"
+
+class FragmentImage(NamedTuple):
+    rid: str  # placeholder relationship id used in the fragment XML
+    path: str
+    sha1: str
+    ext: str
+    content_type: str
+
+class Fragment(NamedTuple):
+    xml: str
+    images: List[FragmentImage]
+    render_ms: float = 0.0
+
+class FragmentRenderer:
+    """Renders blocks of body content with python-docx, one at a time, into Fragments"""
+    def __init__(self):
+        self._scratch = Document()
+        # Declarations every serialized element inherits from the scratch root; the
+        # skeleton document declares the same ones on its root
+        self._inherited_declarations = [
+            f' xmlns:{prefix}="{uri}"' for prefix, uri in self._scratch.element.nsmap.items() if prefix
+        ]
+        self._images: List[FragmentImage] = []
+
+    def add_picture(self, run: Run, image_path: str, width: Length):
+        """Run.add_picture(image_path, width=width) for fragment runs"""
+        image = DocxImage.from_file(image_path)  # raises for unsupported formats, like Run.add_picture
+        rid = f"{FRAGMENT_RID_PREFIX}{len(self._images) + 1}"
+        self._images.append(FragmentImage(rid, image_path, image.sha1, image.ext, image.content_type))
+        cx, cy = image.scaled_dimensions(width, None)
+        # Shape ids are fragment-local (1, 2, ...) until the writer renumbers them
+        run._r.add_drawing(CT_Inline.new_pic_inline(len(self._images), rid, image.filename, cx, cy))
+
+    def render(self, build: Callable[[Document, Callable], None]) -> Fragment:
+        """Call build(document, add_picture) and return what it added to the body"""
+        body = self._scratch.element.body
+        self._images = []
+        started = time.perf_counter()
+        try:
+            build(self._scratch, self.add_picture)
+            xml = "".join(self._serialize(child) for child in body if child.tag != qn("w:sectPr"))
+            return Fragment(xml, self._images, (time.perf_counter() - started) * 1000)
+        finally:
+            for child in list(body):
+                if child.tag != qn("w:sectPr"):
+                    body.remove(child)
+
+    def _serialize(self, element) -> str:
+        xml = etree.tostring(element, encoding="unicode", with_tail=False)
+        start_tag_end = xml.index(">")
+        start_tag = xml[:start_tag_end]
+        for declaration in self._inherited_declarations:
+            start_tag = start_tag.replace(declaration, "", 1)
+        return start_tag + xml[start_tag_end:]
+
+class StreamingDocxWriter:
+    """
+    Usage:
+        writer = StreamingDocxWriter(doc)   # insertion point at the current end of doc
+        ...add the sections that follow the streamed content to doc...
+        renderer = FragmentRenderer()
+        with writer.open(output_path):
+            for item in items:
+                writer.add_fragment(renderer.render(lambda document, add_picture: ...))
+    """
+    def __init__(self, doc: Document):
+        self.doc = doc
+        self._marker = f"docx-stream-{uuid.uuid4().hex}"
+        doc.add_paragraph(self._marker)
+        self._zip = None
+        self._body = None
+        self._images: Dict[str, str] = {}  # sha1 -> rId
+        self._relationships = []
+        self._extensions: Dict[str, str] = {}  # ext -> content type
+        self._next_shape_id = 1
+        self._next_rid = 1
+
+    @contextmanager
+    def open(self, output_path: str) -> Iterator["StreamingDocxWriter"]:
+        skeleton = io.BytesIO()
+        self.doc.save(skeleton)
+        with zipfile.ZipFile(skeleton) as source, \
+                zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as self._zip, \
+                tempfile.TemporaryFile() as self._body:
+            document_xml = source.read(DOCUMENT_PART).decode("utf-8")
+            rels_xml = source.read(DOCUMENT_RELS_PART).decode("utf-8")
+            content_types_xml = source.read(CONTENT_TYPES_PART).decode("utf-8")
+            for item in source.infolist():
+                if item.filename not in (DOCUMENT_PART, DOCUMENT_RELS_PART, CONTENT_TYPES_PART):
+                    self._zip.writestr(item, source.read(item.filename))
+            prefix, suffix = self._split(document_xml)
+            self._next_shape_id = max([int(i) for i in re.findall(r'\sid="(\d+)"', document_xml)] + [0]) + 1
+            self._next_rid = max([int(i) for i in re.findall(r'Id="rId(\d+)"', rels_xml)] + [0]) + 1
+            del document_xml
+
+            yield self
+
+            self._body.seek(0)
+            with self._zip.open(DOCUMENT_PART, "w") as out:
+                out.write(prefix.encode("utf-8"))
+                for chunk in iter(lambda: self._body.read(COPY_CHUNK_SIZE), b""):
+                    out.write(chunk)
+                out.write(suffix.encode("utf-8"))
+            self._zip.writestr(DOCUMENT_RELS_PART, self._extend_relationships(rels_xml))
+            self._zip.writestr(CONTENT_TYPES_PART, self._extend_content_types(content_types_xml))
+
+    def _split(self, document_xml: str):
+        """document.xml before and after the insertion point paragraph"""
+        marker = document_xml.index(self._marker)
+        start = document_xml.rindex("<w:p>", 0, marker)
+        end = document_xml.index("</w:p>", marker) + len("</w:p>")
+        if "</w:p>" in document_xml[start:marker]:
+            raise ValueError("Unexpected insertion point markup")
+        return document_xml[:start], document_xml[end:]
+
+    def add_fragment(self, fragment: Fragment):
+        """Append a rendered fragment at the insertion point, in call order"""
+        xml = fragment.xml
+        if fragment.images:
+            rids = {image.rid: self._add_image(image) for image in fragment.images}
+            xml = re.sub(
+                rf'r:embed="({FRAGMENT_RID_PREFIX}\d+)"', lambda m: f'r:embed="{rids[m.group(1)]}"', xml
+            )
+            first_shape_id = self._next_shape_id
+            xml = re.sub(
+                r'<wp:docPr id="(\d+)" name="Picture \d+"',
+                lambda m: '<wp:docPr id="{0}" name="Picture {0}"'.format(first_shape_id + int(m.group(1)) - 1),
+                xml
+            )
+            self._next_shape_id += len(fragment.images)
+        self._body.write(xml.encode("utf-8"))
+
+    def _add_image(self, image: FragmentImage) -> str:
+        """Document-wide relationship id of an image, writing it to the zip the first time"""
+        rId = self._images.get(image.sha1)
+        if rId is None:
+            rId = f"rId{self._next_rid}"
+            self._next_rid += 1
+            target = f"media/image{len(self._images) + 1}.{image.ext}"
+            # Images are already compressed; deflating them again only costs time
+            self._zip.write(image.path, f"word/{target}", compress_type=zipfile.ZIP_STORED)
+            self._images[image.sha1] = rId
+            self._relationships.append((rId, target))
+            self._extensions[image.ext] = image.content_type
+        return rId
+
+    def _extend_relationships(self, rels_xml: str) -> str:
+        entries = "".join(
+            f'<Relationship Id="{rId}" Type="{IMAGE_RELATIONSHIP}" Target="{target}"/>'
+            for rId, target in self._relationships
+        )
+        return rels_xml.replace("</Relationships>", entries + "</Relationships>")
+
+    def _extend_content_types(self, content_types_xml: str) -> str:
+        present: Set[str] = set(re.findall(r'<Default Extension="([^"]+)"', content_types_xml))
+        entries = "".join(
+            f'<Default Extension="{ext}" ContentType="{content_type}"/>'
+            for ext, content_type in self._extensions.items() if ext not in present
+        )
+        return content_types_xml.replace("</Types>", entries + "</Types>")
+
+# Per worker process renderer, created by the pool initializer
+_worker_renderer: Optional[FragmentRenderer] = None
+
+def _init_worker(initializer, initargs):
+    global _worker_renderer
+    if initializer:
+        initializer(*initargs)
+    _worker_renderer = FragmentRenderer()
+
+def _render_batch(render, items) -> List[Fragment]:
+    return [render(_worker_renderer, item) for item in items]
+
+class FragmentPool:
+    """
+    Renders fragments in worker processes. render(renderer, item) -> Fragment must be
+    a module-level function and items picklable. Workers are spawned, not forked:
+    the API process is multi-threaded, which makes fork unsafe.
+    """
+    def __init__(self, processes: int, initializer=None, initargs=(), batch_size: int = 16):
+        self.processes = processes
+        self.batch_size = batch_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(initializer, initargs)
+        )
+
+    def render_ordered(self, render, items: Iterable) -> Iterator[Fragment]:
+        """Fragments in item order; at most two batches per process are in flight"""
+        window = self.processes * 2
+        pending = deque()
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                pending.append(self._executor.submit(_render_batch, render, batch))
+                batch = []
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+        if batch:
+            pending.append(self._executor.submit(_render_batch, render, batch))
+        while pending:
+            yield from pending.popleft().result()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,76 @@
+"""
+Downscaled renditions of image evidence (Pillow)
+- thumb:  small preview for the UI (/findings/evidences/{id}/thumbnail)
+- report: size used when embedding images in Word reports (5 inch wide at ~200 dpi)
+
+Renditions are JPEGs stored next to the evidence file (<file>.thumb.jpg, ...),
+so deduplicated blobs share them. They are generated in the background after
+upload and lazily for files uploaded before this existed.
+"""
+import os
+import tempfile
+from typing import Optional
+from PIL import Image, ImageOps
+from app.core.evidence_storage import absolute_path, get_temp_dir, rendition_file_path
+
+# Formats Pillow can read; SVG and others are left as is
+RASTER_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+RENDITIONS = {
+    "thumb": {"max_size": (320, 320), "quality": 80},
+    "report": {"max_size": (1000, 1000), "quality": 85},
+}
+
+# Guard against decompression bombs in uploaded images
+Image.MAX_IMAGE_PIXELS = 100_000_000
+
+def is_raster_image(file_name: str) -> bool:
+    return os.path.splitext(file_name or "")[1].lower() in RASTER_IMAGE_EXTENSIONS
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """JPEG has no alpha: composite transparent images onto white"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    return image.convert("RGB")
+
+def generate_renditions(file_path: str):
+    """Create the missing renditions of a stored image. Errors are logged, never raised."""
+    source = absolute_path(file_path)
+    missing = {
+        name: spec for name, spec in RENDITIONS.items()
+        if not os.path.exists(absolute_path(rendition_file_path(file_path, name)))
+    }
+    if not missing or not os.path.exists(source):
+        return
+    try:
+        with Image.open(source) as original:
+            image = _flatten(original)
+            # Largest first so each step downsamples the previous one
+            for name, spec in sorted(missing.items(), key=lambda item: -item[1]["max_size"][0]):
+                image.thumbnail(spec["max_size"], Image.LANCZOS)
+                fd, temp_path = tempfile.mkstemp(dir=get_temp_dir(), suffix=".jpg")
+                os.close(fd)
+                try:
+                    image.save(temp_path, "JPEG", quality=spec["quality"], optimize=True)
+                    os.replace(temp_path, absolute_path(rendition_file_path(file_path, name)))
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+    except Exception as e:
+        print(f"Warning: Could not create renditions for {file_path}: {e}")
+
+def get_rendition(file_path: str, file_name: str, name: str) -> Optional[str]:
+    """
+    Absolute path of a rendition, generating it on demand if needed.
+    Returns None for non-image evidence or when the image cannot be decoded.
+    """
+    if not is_raster_image(file_name):
+        return None
+    path = absolute_path(rendition_file_path(file_path, name))
+    if not os.path.exists(path):
+        generate_renditions(file_path)
+    return path if os.path.exists(path) else None
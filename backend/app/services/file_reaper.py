@@ -0,0 +1,295 @@
+"""
+File reaper.
+Evidence files are not unlinked by the request that deletes their last reference:
+the request queues them in file_deletions inside its own transaction (see
+app.core.evidence_storage.release_evidence_files), so a rolled-back delete
+leaves both the rows and the file, and a committed one always gets its file
+removed, even if the process dies right after the commit.
+
+A background thread per API process works through the queue (FOR UPDATE SKIP
+LOCKED, so processes share it): every FILE_REAPER_INTERVAL_SECONDS, or as soon
+as a request wakes it. Before unlinking it re-checks that nothing references the
+file again; failures are retried with backoff instead of being forgotten.
+
+reconcile() compares UPLOAD_DIR with the database in both directions:
+- orphan files: on disk but referenced by no evidence or blob (left over from
+  crashes, failed deletes or uploads that were never committed), older than
+  FILE_REAPER_ORPHAN_GRACE_SECONDS;
+- missing files: referenced by an evidence or blob but not on disk.
+It runs as a dry run every FILE_REAPER_RECONCILE_HOURS and on demand from
+/system/storage/reconcile; only an explicit apply queues the orphans for removal.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, exists, func, select, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.evidence_storage import (
+    BLOB_DIR_NAME, RENDITION_NAMES, TEMP_DIR_NAME, absolute_path, enqueue_file_deletions, rendition_file_path
+)
+from app.db.database import SessionLocal
+from app.models.evidence_blob import EvidenceBlob
+from app.models.file_deletion import FileDeletion
+from app.models.finding import Evidence
+from app.services.report_jobs import REPORT_DIR_NAME
+
+BATCH_SIZE = 200
+MAX_RETRY_DELAY_SECONDS = 24 * 3600
+# Directories under UPLOAD_DIR that are not evidence storage (managed by their owners)
+SKIPPED_DIRS = {REPORT_DIR_NAME}
+# Paths listed in a reconcile report (the counts cover everything)
+REPORT_SAMPLE_SIZE = 100
+
+def _rendition_source(file_path: str) -> Optional[str]:
+    """The file a rendition path belongs to; None if it is not a rendition"""
+    for name in RENDITION_NAMES:
+        suffix = f".{name}.jpg"
+        if file_path.endswith(suffix):
+            return file_path[:-len(suffix)]
+    return None
+
+def _is_referenced(db: Session, file_path: str) -> bool:
+    return db.execute(select(
+        exists().where(Evidence.file_path == file_path) |
+        exists().where(EvidenceBlob.file_path == file_path)
+    )).scalar()
+
+def _lock_blob_path(db: Session, file_path: str) -> bool:
+    """
+    For blob paths: hold the blob's row (as an empty placeholder) until the commit, so a
+    concurrent upload of the same content waits for the removal instead of reusing a file
+    that is about to disappear. False if the blob exists again.
+    """
+    parts = file_path.split("/")
+    if len(parts) != 4 or parts[0] != BLOB_DIR_NAME:
+        return True
+    sha256 = parts[-1]
+    locked = db.execute(
+        insert(EvidenceBlob).values(sha256=sha256, file_path=file_path, file_size=0, ref_count=0)
+        .on_conflict_do_nothing().returning(EvidenceBlob.sha256)
+    ).first()
+    if locked:
+        db.execute(delete(EvidenceBlob).where(EvidenceBlob.sha256 == sha256))
+    return locked is not None
+
+def _remove_file(file_path: str) -> int:
+    """Unlink a file and its renditions; returns the bytes reclaimed (missing files count as done)"""
+    reclaimed = 0
+    for path in [file_path] + [rendition_file_path(file_path, name) for name in RENDITION_NAMES]:
+        full_path = absolute_path(path)
+        try:
+            size = os.path.getsize(full_path)
+        except OSError:
+            continue
+        os.remove(full_path)
+        reclaimed += size
+    return reclaimed
+
+class FileReaper:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_reconcile = 0.0
+        self.runs = 0
+        self.files_removed = 0
+        self.bytes_reclaimed = 0
+        self.skipped_referenced = 0
+        self.failures = 0
+        self.pending = 0
+        self.last_reconcile: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="file-reaper", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Process the queue now (call after committing a transaction that queued files)"""
+        self.start()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                if settings.FILE_REAPER_RECONCILE_HOURS > 0 and \
+                        time.monotonic() - self._last_reconcile > settings.FILE_REAPER_RECONCILE_HOURS * 3600:
+                    self._last_reconcile = time.monotonic()
+                    db = SessionLocal()
+                    try:
+                        self.reconcile(db)
+                    finally:
+                        db.close()
+            except Exception as e:
+                print(f"Warning: File reaper run failed: {e}")
+            self._wake.wait(settings.FILE_REAPER_INTERVAL_SECONDS)
+            self._wake.clear()
+
+    def run_once(self) -> int:
+        """Process due deletions in batches until none are left; returns the files removed"""
+        removed = 0
+        db = SessionLocal()
+        try:
+            while True:
+                processed, batch_removed = self._process_batch(db)
+                removed += batch_removed
+                if processed < BATCH_SIZE:
+                    break
+            self.pending = db.execute(select(func.count(FileDeletion.id))).scalar()
+        finally:
+            db.close()
+        with self._lock:
+            self.runs += 1
+        return removed
+
+    def _process_batch(self, db: Session):
+        deletions = db.execute(
+            select(FileDeletion).where(FileDeletion.due_at <= func.now()).order_by(FileDeletion.id)
+            .limit(BATCH_SIZE).with_for_update(skip_locked=True)
+        ).scalars().all()
+        removed = 0
+        for deletion in deletions:
+            source = _rendition_source(deletion.file_path) or deletion.file_path
+            if _is_referenced(db, source) or not _lock_blob_path(db, source):
+                # Uploaded again (or re-linked) since it was queued
+                db.delete(deletion)
+                with self._lock:
+                    self.skipped_referenced += 1
+                continue
+            try:
+                reclaimed = _remove_file(deletion.file_path)
+            except OSError as e:
+                deletion.attempts += 1
+                deletion.last_error = str(e)
+                deletion.due_at = datetime.now(timezone.utc) + timedelta(
+                    seconds=min(settings.FILE_REAPER_INTERVAL_SECONDS * 2 ** deletion.attempts, MAX_RETRY_DELAY_SECONDS)
+                )
+                print(f"Warning: Could not delete file {deletion.file_path} (attempt {deletion.attempts}): {e}")
+                with self._lock:
+                    self.failures += 1
+                continue
+            db.delete(deletion)
+            removed += 1
+            with self._lock:
+                self.files_removed += 1
+                self.bytes_reclaimed += reclaimed
+        db.commit()
+        return len(deletions), removed
+
+    def reconcile(self, db: Session, apply: bool = False) -> Dict[str, Any]:
+        """
+        Compare UPLOAD_DIR with evidences/evidence_blobs. With apply=True the orphan
+        files are queued for removal; otherwise nothing changes (dry run).
+        """
+        started = time.perf_counter()
+        grace_cutoff = time.time() - settings.FILE_REAPER_ORPHAN_GRACE_SECONDS
+        report: Dict[str, Any] = {
+            "dry_run": not apply,
+            "scanned_files": 0,
+            "scanned_bytes": 0,
+            "orphan_files": 0,
+            "orphan_bytes": 0,
+            "orphans": [],
+            "missing_files": 0,
+            "missing": [],
+            "queued": 0,
+            "pending_deletions": db.execute(select(func.count(FileDeletion.id))).scalar(),
+        }
+
+        # Disk -> database, in batches of paths
+        batch: List[tuple] = []
+        for file_path, size, mtime in self._walk_upload_dir():
+            report["scanned_files"] += 1
+            report["scanned_bytes"] += size
+            if mtime < grace_cutoff:
+                batch.append((file_path, size))
+            if len(batch) >= BATCH_SIZE:
+                self._collect_orphans(db, batch, report, apply)
+                batch = []
+        if batch:
+            self._collect_orphans(db, batch, report, apply)
+
+        # Database -> disk
+        referenced = union(select(Evidence.file_path), select(EvidenceBlob.file_path))
+        for file_path in db.execute(referenced.execution_options(yield_per=1000)).scalars():
+            if not os.path.exists(absolute_path(file_path)):
+                report["missing_files"] += 1
+                if len(report["missing"]) < REPORT_SAMPLE_SIZE:
+                    report["missing"].append(file_path)
+
+        if apply:
+            db.commit()
+            if report["queued"]:
+                self.wake()
+        report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        summary = {key: value for key, value in report.items() if key not in ("orphans", "missing")}
+        summary["finished_at"] = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self.last_reconcile = summary
+        return report
+
+    def _walk_upload_dir(self):
+        """(relative path, size, mtime) of every file under UPLOAD_DIR outside SKIPPED_DIRS"""
+        root = settings.UPLOAD_DIR
+        for directory, subdirs, files in os.walk(root):
+            if directory == root:
+                subdirs[:] = [name for name in subdirs if name not in SKIPPED_DIRS]
+            for name in files:
+                full_path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue  # removed while walking
+                yield os.path.relpath(full_path, root).replace(os.sep, "/"), stat.st_size, stat.st_mtime
+
+    def _collect_orphans(self, db: Session, batch: List[tuple], report: Dict[str, Any], apply: bool):
+        # Temp files are never referenced; renditions live as long as their source
+        candidates = {
+            file_path: _rendition_source(file_path) or file_path
+            for file_path, _ in batch if not file_path.startswith(TEMP_DIR_NAME + "/")
+        }
+        lookup = set(candidates.values())
+        referenced = set(db.execute(union(
+            select(Evidence.file_path).where(Evidence.file_path.in_(lookup)),
+            select(EvidenceBlob.file_path).where(EvidenceBlob.file_path.in_(lookup))
+        )).scalars().all())
+        orphans = [
+            (file_path, size) for file_path, size in batch
+            if candidates.get(file_path, file_path) not in referenced
+        ]
+        report["orphan_files"] += len(orphans)
+        report["orphan_bytes"] += sum(size for _, size in orphans)
+        for file_path, _ in orphans:
+            if len(report["orphans"]) < REPORT_SAMPLE_SIZE:
+                report["orphans"].append(file_path)
+        if apply and orphans:
+            report["queued"] += enqueue_file_deletions(db, [file_path for file_path, _ in orphans], "orphan")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "runs": self.runs,
+                "pending": self.pending,
+                "files_removed": self.files_removed,
+                "bytes_reclaimed": self.bytes_reclaimed,
+                "mb_reclaimed": round(self.bytes_reclaimed / 1024 / 1024, 2),
+                "skipped_referenced": self.skipped_referenced,
+                "failures": self.failures,
+                "last_reconcile": self.last_reconcile,
+            }
+
+file_reaper = FileReaper()
@@ -0,0 +1,99 @@
+"""
+Notification push stream.
+Transactions that create notifications or change a user's unread count NOTIFY
+the affected user ids on NOTIFICATION_CHANNEL when they commit (see
+app.core.notification_service.publish_notification_changes). The database
+listener of every API process (app.core.db_listener) receives them and wakes
+the local subscribers (open /notifications/stream connections) of those users,
+so a notification created by any process reaches the user's open tabs in all
+of them.
+
+A subscription is just an asyncio.Event: idle streams cost no queries and no
+database connections, and a burst of changes for one user wakes its stream once.
+The woken stream reads what changed from the database itself. When the listener
+loses its connection it wakes every subscriber after reconnecting, since changes
+may have been missed in between.
+"""
+import asyncio
+import json
+import threading
+from typing import Dict, Iterable, Set
+from app.core.db_listener import db_listener
+from app.core.notification_service import NOTIFICATION_CHANNEL
+
+class Subscription:
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.changed = asyncio.Event()
+
+    def notify(self):
+        """Wake the stream (thread-safe)"""
+        try:
+            self.loop.call_soon_threadsafe(self.changed.set)
+        except RuntimeError:
+            pass  # event loop already closed (shutdown)
+
+    async def wait(self, timeout: float) -> bool:
+        """True if woken within timeout seconds; clears the wake-up"""
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.changed.clear()
+        return True
+
+class NotificationStream:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self.deliveries = 0
+        db_listener.register(NOTIFICATION_CHANNEL, self._handle, on_connect=self._wake_all)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Register a stream of the current event loop for a user"""
+        db_listener.start()
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def publish_local(self, user_ids: Iterable[int]):
+        """Wake this process's streams of the given users"""
+        with self._lock:
+            subscriptions = [
+                subscription
+                for user_id in user_ids
+                for subscription in self._subscribers.get(user_id, ())
+            ]
+            self.deliveries += len(subscriptions)
+        for subscription in subscriptions:
+            subscription.notify()
+
+    def _wake_all(self):
+        # Changes committed while the listener was not connected were missed
+        with self._lock:
+            user_ids = list(self._subscribers)
+        self.publish_local(user_ids)
+
+    def _handle(self, payload: str):
+        self.publish_local(json.loads(payload)["user_ids"])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "listening": db_listener.connected,
+                "subscribed_users": len(self._subscribers),
+                "subscriptions": sum(len(subscriptions) for subscriptions in self._subscribers.values()),
+                "deliveries": self.deliveries,
+            }
+
+notification_stream = NotificationStream()
@@ -0,0 +1,109 @@
+"""
+In-process cache of rendered report findings.
+
+A finding's fragment only depends on the finding's own columns, its evidences
+and the report language, so it is keyed by (finding id, updated_at, evidence
+set hash, lang, generator version). Rebuilding a report after one finding
+changed renders that finding only and re-assembles the others from here.
+The finding number in the heading is a placeholder filled in at assembly, so
+adding or removing findings does not invalidate the rest.
+
+Entries are evicted least-recently-used once REPORT_FRAGMENT_CACHE_MB is
+exceeded. Hit rate and the render time saved are exposed via /system/metrics.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.services.docx_stream import Fragment
+
+def evidence_set_hash(evidences) -> str:
+    digest = hashlib.sha1()
+    for evidence in sorted(evidences, key=lambda e: e.id):
+        digest.update(repr((evidence.id, evidence.file_path, evidence.file_name, evidence.description)).encode())
+    return digest.hexdigest()
+
+def fragment_cache_key(finding, lang: str, version: int) -> tuple:
+    return (
+        finding.id,
+        str(finding.updated_at or finding.created_at),
+        evidence_set_hash(finding.evidences),
+        lang,
+        version,
+    )
+
+class FragmentCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Fragment]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self.render_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def _entry_size(fragment: Fragment) -> int:
+        return len(fragment.xml) + sum(len(image.path) + 100 for image in fragment.images)
+
+    def get(self, key: tuple) -> Optional[Fragment]:
+        with self._lock:
+            fragment = self._entries.get(key)
+            # The images are copied from disk at assembly; a vanished file means re-render
+            if fragment is not None and not all(os.path.exists(image.path) for image in fragment.images):
+                self._discard(key)
+                fragment = None
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_ms += fragment.render_ms
+            return fragment
+
+    def put(self, key: tuple, fragment: Fragment):
+        with self._lock:
+            self.render_ms += fragment.render_ms
+            size = self._entry_size(fragment)
+            if not self.enabled or size > self.max_bytes:
+                return
+            self._discard(key)
+            self._entries[key] = fragment
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def _discard(self, key: tuple):
+        fragment = self._entries.pop(key, None)
+        if fragment is not None:
+            self.size_bytes -= self._entry_size(fragment)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "size_mb": round(self.size_bytes / 1024 / 1024, 2),
+                "max_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "render_ms": round(self.render_ms, 1),
+                "saved_ms": round(self.saved_ms, 1),
+            }
+
+fragment_cache = FragmentCache(settings.REPORT_FRAGMENT_CACHE_MB * 1024 * 1024)
@@ -0,0 +1,355 @@
+"""
+Word report jobs.
+Reports are built on a small thread pool (REPORT_WORKERS) instead of inside the
+request; clients enqueue a job, poll its progress and download the result.
+
+Finished reports are cached under UPLOAD_DIR/.reports/audit-<id>-<lang>-<version>.docx.
+The content version hashes what the report shows: the audit, project and
+organization timestamps, the findings' and evidences' ids and timestamps, the
+language and the report date printed on the cover. Downloads of an unchanged
+audit are served from the cache; a superseded report is removed when its
+successor is written, and unused reports, stale temp files and finished jobs
+are garbage-collected.
+
+Builds run in the process that accepted the job, but job state is written to
+UPLOAD_DIR/.reports/jobs/<id>.json on every change, so any worker process can
+report a job's progress and serve its download. Only that directory and the
+report directory itself are swept.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
+from app.core.evidence_storage import absolute_path
+from app.db.database import SessionLocal
+from app.models.audit import Audit
+from app.models.finding import Finding, Evidence
+from app.models.organization import Organization
+from app.models.project import Project
+from app.services.word_generator import REPORT_FORMAT_VERSION, generate_audit_word_report
+
+REPORT_DIR_NAME = ".reports"
+JOB_DIR_NAME = "jobs"
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+# Temp files older than this are left over from crashed or abandoned builds
+STALE_TEMP_SECONDS = 3600
+GC_INTERVAL_SECONDS = 600
+
+def get_report_dir() -> str:
+    report_dir = os.path.join(settings.UPLOAD_DIR, REPORT_DIR_NAME)
+    os.makedirs(report_dir, exist_ok=True)
+    return report_dir
+
+def get_job_dir() -> str:
+    job_dir = os.path.join(get_report_dir(), JOB_DIR_NAME)
+    os.makedirs(job_dir, exist_ok=True)
+    return job_dir
+
+def report_file_path(audit_id: int, lang: str, version: str) -> str:
+    """Relative (to UPLOAD_DIR) path of a cached report"""
+    return f"{REPORT_DIR_NAME}/audit-{audit_id}-{lang}-{version}.docx"
+
+def report_content_version(db: Session, audit_id: int) -> Optional[Tuple[str, str]]:
+    """(language, content version) of the report the audit would produce now; None if it does not exist"""
+    head = db.execute(
+        select(
+            Audit.language, Audit.created_at, Audit.updated_at,
+            Project.updated_at, Organization.updated_at
+        ).join(Project, Project.id == Audit.project_id).join(
+            Organization, Organization.id == Project.organization_id
+        ).where(Audit.id == audit_id)
+    ).first()
+    if head is None:
+        return None
+    lang = head.language if head.language in ("tr", "en") else "tr"
+
+    digest = hashlib.sha256()
+    digest.update(repr((REPORT_FORMAT_VERSION, lang, date.today().isoformat(), tuple(head))).encode())
+    findings = db.execute(
+        select(Finding.id, Finding.created_at, Finding.updated_at).where(
+            Finding.audit_id == audit_id
+        ).order_by(Finding.id)
+    )
+    for row in findings:
+        digest.update(repr(tuple(row)).encode())
+    # Evidence rows are never edited, only added and removed
+    evidences = db.execute(
+        select(Evidence.id, Evidence.finding_id, Evidence.file_path).join(
+            Finding, Finding.id == Evidence.finding_id
+        ).where(Finding.audit_id == audit_id).order_by(Evidence.id)
+    )
+    for row in evidences:
+        digest.update(repr(tuple(row)).encode())
+    return lang, digest.hexdigest()[:20]
+
+def load_report_audit(db: Session, audit_id: int) -> Optional[Audit]:
+    """Audit with everything the Word generator touches"""
+    return db.query(Audit).options(
+        joinedload(Audit.project).joinedload(Project.organization),
+        joinedload(Audit.findings).joinedload(Finding.evidences)
+    ).filter(Audit.id == audit_id).first()
+
+class ReportJob:
+    def __init__(self, audit_id: int, language: str, version: str, user_id: int):
+        self.id = uuid.uuid4().hex
+        self.audit_id = audit_id
+        self.language = language
+        self.version = version
+        self.user_id = user_id
+        self.status = "queued"
+        self.progress = 0
+        self.stage: Optional[str] = None
+        self.cached = False
+        self.error: Optional[str] = None
+        self.file_path: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.done = threading.Event()
+
+    @property
+    def key(self) -> tuple:
+        return (self.audit_id, self.language, self.version)
+
+    def start(self):
+        self.status = "running"
+        self.save()
+
+    def set_progress(self, percent: int, stage: str):
+        changed = (percent, stage) != (self.progress, self.stage)
+        self.progress = percent
+        self.stage = stage
+        if changed:
+            self.save()
+
+    def complete(self, file_path: str, cached: bool = False):
+        self.file_path = file_path
+        self.cached = cached
+        self.status = "completed"
+        self.progress = 100
+        self.stage = None
+        self.finished_at = datetime.now(timezone.utc)
+        self.save()
+        self.done.set()
+
+    def fail(self, error: str):
+        self.status = "failed"
+        self.error = error
+        self.finished_at = datetime.now(timezone.utc)
+        self.save()
+        self.done.set()
+
+    def save(self):
+        """Write the job state for the other processes (atomically)"""
+        state = {
+            name: getattr(self, name) for name in (
+                "id", "audit_id", "language", "version", "user_id", "status",
+                "progress", "stage", "cached", "error", "file_path"
+            )
+        }
+        state["created_at"] = self.created_at.isoformat()
+        state["finished_at"] = self.finished_at.isoformat() if self.finished_at else None
+        path = os.path.join(get_job_dir(), f"{self.id}.json")
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not save report job {self.id}: {e}")
+
+    @classmethod
+    def load(cls, job_id: str) -> Optional["ReportJob"]:
+        """A job saved by any process; None if unknown or expired"""
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        path = os.path.join(get_job_dir(), f"{job_id}.json")
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            saved_at = os.path.getmtime(path)
+        except (OSError, ValueError):
+            return None
+        job = cls(state["audit_id"], state["language"], state["version"], state["user_id"])
+        job.id = state["id"]
+        for name in ("status", "progress", "stage", "cached", "error", "file_path"):
+            setattr(job, name, state[name])
+        job.created_at = datetime.fromisoformat(state["created_at"])
+        job.finished_at = datetime.fromisoformat(state["finished_at"]) if state["finished_at"] else None
+        if job.status in ("queued", "running") and saved_at < time.time() - STALE_TEMP_SECONDS:
+            # The process building it went away
+            job.status = "failed"
+            job.error = "Report build was interrupted, please generate it again"
+        if job.finished_at:
+            job.done.set()
+        return job
+
+class ReportJobManager:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-build")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ReportJob] = {}
+        self._active: Dict[tuple, ReportJob] = {}  # queued/running builds by (audit, lang, version)
+        self._last_gc = 0.0
+        self.builds = 0
+        self.failures = 0
+        self.cache_hits = 0
+        self.total_build_ms = 0.0
+        self.gc_removed_files = 0
+
+    def submit(self, db: Session, audit_id: int, user_id: int) -> Optional[ReportJob]:
+        """
+        Return a job for the audit's current report: completed at once when the cached
+        report is current, an already running build of the same content, or a new build.
+        None if the audit does not exist.
+        """
+        current = report_content_version(db, audit_id)
+        if current is None:
+            return None
+        lang, version = current
+        self.collect_garbage_if_due()
+
+        job = ReportJob(audit_id, lang, version, user_id)
+        file_path = report_file_path(audit_id, lang, version)
+        with self._lock:
+            active = self._active.get(job.key)
+            if active is not None:
+                return active
+            if os.path.exists(absolute_path(file_path)):
+                # Refresh the mtime: cache expiry is based on last use
+                os.utime(absolute_path(file_path))
+                self.cache_hits += 1
+                job.complete(file_path, cached=True)
+            else:
+                job.save()
+                self._active[job.key] = job
+                self._executor.submit(self._build, job)
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        """A job of this process (live state) or one saved by another process"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job if job is not None else ReportJob.load(job_id)
+
+    def _build(self, job: ReportJob):
+        key = job.key
+        job.start()
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            # Version and content from one snapshot, so the file matches its name
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            current = report_content_version(db, job.audit_id)
+            audit = load_report_audit(db, job.audit_id) if current else None
+            if audit is None:
+                raise ValueError("Audit not found")
+            lang, version = current
+            file_path = report_file_path(job.audit_id, lang, version)
+
+            fd, temp_path = tempfile.mkstemp(dir=get_report_dir(), suffix=".part")
+            os.close(fd)
+            try:
+                generate_audit_word_report(audit, db, output_path=temp_path, progress=job.set_progress)
+                os.replace(temp_path, absolute_path(file_path))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            self._remove_superseded(job.audit_id, lang, file_path)
+            with self._lock:
+                self.builds += 1
+                self.total_build_ms += (time.perf_counter() - started) * 1000
+            # The audit may have changed since submit: the ETag must match the built file
+            job.language, job.version = lang, version
+            job.complete(file_path)
+        except Exception as e:
+            print(f"Warning: Report build failed for audit {job.audit_id}: {e}")
+            with self._lock:
+                self.failures += 1
+            job.fail(str(e))
+        finally:
+            db.close()
+            with self._lock:
+                self._active.pop(key, None)
+
+    def _remove_superseded(self, audit_id: int, lang: str, current_path: str):
+        current = os.path.basename(current_path)
+        for path in glob.glob(os.path.join(get_report_dir(), f"audit-{audit_id}-{lang}-*.docx")):
+            if os.path.basename(path) != current:
+                self._remove(path)
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        with self._lock:
+            self.gc_removed_files += 1
+        return True
+
+    def collect_garbage(self) -> int:
+        """Remove expired reports, stale temp files and old finished jobs; returns the files removed"""
+        now = time.time()
+        removed = 0
+        report_dir = get_report_dir()
+        expired = [
+            path for path in glob.glob(os.path.join(report_dir, "*.docx"))
+            if os.path.getmtime(path) < now - settings.REPORT_CACHE_TTL_HOURS * 3600
+        ]
+        # Leftovers of interrupted builds and job state writes
+        stale = glob.glob(os.path.join(report_dir, "*.part")) + \
+            glob.glob(os.path.join(get_job_dir(), "*.part"))
+        expired += [path for path in stale if os.path.getmtime(path) < now - STALE_TEMP_SECONDS]
+        for path in expired:
+            removed += self._remove(path)
+        # Saved job states (a running build rewrites its file as it progresses)
+        for path in glob.glob(os.path.join(get_job_dir(), "*.json")):
+            if os.path.getmtime(path) < now - max(settings.REPORT_JOB_TTL_SECONDS, STALE_TEMP_SECONDS):
+                self._remove(path)
+
+        job_cutoff = datetime.now(timezone.utc).timestamp() - settings.REPORT_JOB_TTL_SECONDS
+        with self._lock:
+            for job_id in [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at and job.finished_at.timestamp() < job_cutoff
+            ]:
+                del self._jobs[job_id]
+        return removed
+
+    def collect_garbage_if_due(self):
+        with self._lock:
+            if time.monotonic() - self._last_gc < GC_INTERVAL_SECONDS:
+                return
+            self._last_gc = time.monotonic()
+        try:
+            self.collect_garbage()
+        except OSError as e:
+            print(f"Warning: Report cache cleanup failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": sum(1 for job in self._active.values() if job.status == "queued"),
+                "running": sum(1 for job in self._active.values() if job.status == "running"),
+                "jobs": len(self._jobs),
+                "builds": self.builds,
+                "failures": self.failures,
+                "cache_hits": self.cache_hits,
+                "avg_build_ms": round(self.total_build_ms / self.builds, 2) if self.builds else 0.0,
+                "gc_removed_files": self.gc_removed_files,
+            }
+
+report_jobs = ReportJobManager(settings.REPORT_WORKERS)
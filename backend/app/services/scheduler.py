@@ -0,0 +1,150 @@
+"""
+In-process scheduler for periodic database jobs (e.g. the due-date notification scan).
+
+Every API worker process runs the scheduler thread, but only one of them executes
+jobs: the one holding a session-level PostgreSQL advisory lock on a dedicated
+connection. The others keep trying to take the lock every SCHEDULER_TICK_SECONDS,
+so when the leading process exits (its connection closes and the lock with it)
+another one takes over.
+
+Jobs get a fresh session, run in one transaction and must be idempotent: a new
+leader runs every job once right away.
+"""
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.notification_service import scan_due_dates
+from app.db.database import SessionLocal, engine
+
+SCHEDULER_TICK_SECONDS = 30
+SCHEDULER_LOCK_KEY = zlib.crc32(b"archrampart-scheduler")
+
+class ScheduledJob:
+    def __init__(self, name: str, interval: Callable[[], int], run: Callable[[Session], object]):
+        self.name = name
+        self.interval = interval  # seconds, read from settings on every tick; 0 disables the job
+        self.run = run
+        self.next_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.last_result = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+class Scheduler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+        self.is_leader = False
+        self.jobs: Dict[str, ScheduledJob] = {}
+
+    def add_job(self, name: str, interval: Callable[[], int], run: Callable[[Session], object]):
+        self.jobs[name] = ScheduledJob(name, interval, run)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self._acquire_leadership():
+                for job in list(self.jobs.values()):
+                    interval = job.interval()
+                    if interval > 0 and time.monotonic() >= job.next_run:
+                        self.run_job(job)
+                        job.next_run = time.monotonic() + interval
+            self._stop.wait(SCHEDULER_TICK_SECONDS)
+        self._release_leadership()
+
+    def _acquire_leadership(self) -> bool:
+        """True while this process holds the scheduler lock"""
+        try:
+            if self._connection is None:
+                self._connection = engine.connect()
+                # Detached from the pool: closing it really closes it, so a session-level
+                # lock can never be handed back to the pool (reset only rolls back)
+                self._connection.detach()
+            if self.is_leader:
+                self._connection.execute(select(1))  # the lock lives as long as this connection
+            else:
+                self.is_leader = bool(self._connection.execute(
+                    select(func.pg_try_advisory_lock(SCHEDULER_LOCK_KEY))
+                ).scalar())
+                if self.is_leader:
+                    for job in self.jobs.values():
+                        job.next_run = 0.0
+            self._connection.commit()
+        except Exception as e:
+            print(f"Warning: Scheduler lost its database connection: {e}")
+            self._close_connection()
+        return self.is_leader
+
+    def _release_leadership(self):
+        if self._connection is not None and self.is_leader:
+            try:
+                self._connection.execute(select(func.pg_advisory_unlock(SCHEDULER_LOCK_KEY)))
+                self._connection.commit()
+            except Exception:
+                pass
+        self._close_connection()
+
+    def _close_connection(self):
+        self.is_leader = False
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def run_job(self, job: ScheduledJob):
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            job.last_result = job.run(db)
+            db.commit()
+            job.last_error = None
+        except Exception as e:
+            db.rollback()
+            job.failures += 1
+            job.last_error = str(e)
+            print(f"Warning: Scheduled job {job.name} failed: {e}")
+        finally:
+            db.close()
+            job.runs += 1
+            job.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def stats(self) -> dict:
+        jobs: List[dict] = [
+            {
+                "name": job.name,
+                "interval_seconds": job.interval(),
+                "runs": job.runs,
+                "failures": job.failures,
+                "last_result": job.last_result,
+                "last_duration_ms": job.last_duration_ms,
+                "last_error": job.last_error,
+            }
+            for job in self.jobs.values()
+        ]
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "leader": self.is_leader,
+            "jobs": jobs,
+        }
+
+scheduler = Scheduler()
+scheduler.add_job("due_date_notifications", lambda: settings.DUE_DATE_SCAN_INTERVAL_SECONDS, scan_due_dates)
@@ -14,8 +14,20 @@ from app.models.template import Severity, Status
 from datetime import datetime
 import tempfile
 import os
+import threading
 from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Callable, Iterator, Optional
 from app.core.config import settings
+from app.services.evidence_renditions import get_rendition
+from app.services.docx_stream import Fragment, FragmentPool, FragmentRenderer, StreamingDocxWriter
+from app.services.report_fragment_cache import fragment_cache, fragment_cache_key
+
+# Bump when the report output changes so cached reports and fragments are rebuilt
+REPORT_FORMAT_VERSION = 1
+# Finding number in cached fragments, filled in when the report is assembled
+FINDING_INDEX_PLACEHOLDER = "finding-index-0c5e1d"
 
 # Image extensions that can be embedded in Word
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
@@ -317,8 +329,11 @@ def add_methodology_section(doc: Document, audit: Audit, lang: str = "tr"):
     
     doc.add_paragraph()
 
-def add_findings_section(doc: Document, findings, lang: str = "tr"):
-    """Add detailed findings section"""
+def embed_picture(run, image_path: str, width):
+    run.add_picture(image_path, width=width)
+
+def add_findings_heading(doc: Document, findings, lang: str = "tr"):
+    """Findings section heading (or the no-findings note)"""
     heading = doc.add_heading(get_translation("findings", lang), level=1)
     heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
     
@@ -326,113 +341,127 @@ def add_findings_section(doc: Document, findings, lang: str = "tr"):
         no_findings = doc.add_paragraph(get_translation("no_findings", lang))
         no_findings.runs[0].font.size = Pt(11)
         no_findings.runs[0].italic = True
-        return
-    
+
+def add_findings_section(doc: Document, findings, lang: str = "tr", on_finding: Optional[Callable[[int, int], None]] = None):
+    """Add detailed findings section (on_finding(done, total) is called after each finding)"""
+    add_findings_heading(doc, findings, lang)
     for idx, finding in enumerate(findings, 1):
-        # Finding heading
-        finding_heading = doc.add_heading(f"{get_translation('finding_title', lang)} #{idx}: {finding.title}", level=2)
-        finding_heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        
-        # Severity and Status badges
-        badge_para = doc.add_paragraph()
-        badge_para.paragraph_format.space_after = Pt(6)
-        
-        # Severity badge
-        severity_run = badge_para.add_run(f"{get_translation('severity', lang)}: {get_severity_text(finding.severity, lang)}")
-        severity_run.font.bold = True
-        severity_run.font.size = Pt(10)
-        severity_run.font.color.rgb = SEVERITY_COLORS.get(finding.severity, RGBColor(0, 0, 0))
-        severity_run.add_text("  |  ")
-        
-        # Status badge
-        status_run = badge_para.add_run(f"{get_translation('status_label', lang)}: {get_status_text(finding.status, lang)}")
-        status_run.font.bold = True
-        status_run.font.size = Pt(10)
-        status_run.font.color.rgb = STATUS_COLORS.get(finding.status, RGBColor(0, 0, 0))
-        
-        # Control reference
-        if finding.control_reference:
-            ref_para = doc.add_paragraph()
-            ref_para.add_run(f"{get_translation('control_reference', lang)}: ").font.bold = True
-            ref_para.add_run(finding.control_reference).font.size = Pt(11)
+        add_finding(doc, idx, finding, lang)
+        if on_finding:
+            on_finding(idx, len(findings))
+
+def add_finding(doc: Document, idx: int, finding, lang: str = "tr", add_picture=embed_picture):
+    """
+    Add one finding: heading, badges, texts and evidences.
+    add_picture(run, image_path, width) embeds an image (the streaming writer passes its own).
+    """
+    # Finding heading
+    finding_heading = doc.add_heading(f"{get_translation('finding_title', lang)} #{idx}: {finding.title}", level=2)
+    finding_heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    
+    # Severity and Status badges
+    badge_para = doc.add_paragraph()
+    badge_para.paragraph_format.space_after = Pt(6)
+    
+    # Severity badge
+    severity_run = badge_para.add_run(f"{get_translation('severity', lang)}: {get_severity_text(finding.severity, lang)}")
+    severity_run.font.bold = True
+    severity_run.font.size = Pt(10)
+    severity_run.font.color.rgb = SEVERITY_COLORS.get(finding.severity, RGBColor(0, 0, 0))
+    severity_run.add_text("  |  ")
+    
+    # Status badge
+    status_run = badge_para.add_run(f"{get_translation('status_label', lang)}: {get_status_text(finding.status, lang)}")
+    status_run.font.bold = True
+    status_run.font.size = Pt(10)
+    status_run.font.color.rgb = STATUS_COLORS.get(finding.status, RGBColor(0, 0, 0))
+    
+    # Control reference
+    if finding.control_reference:
+        ref_para = doc.add_paragraph()
+        ref_para.add_run(f"{get_translation('control_reference', lang)}: ").font.bold = True
+        ref_para.add_run(finding.control_reference).font.size = Pt(11)
+    
+    # Description
+    if finding.description:
+        desc_para = doc.add_paragraph()
+        desc_para.add_run(f"{get_translation('description', lang)}:").font.bold = True
+        desc_para.add_run().font.size = Pt(11)
         
-        # Description
-        if finding.description:
-            desc_para = doc.add_paragraph()
-            desc_para.add_run(f"{get_translation('description', lang)}:").font.bold = True
-            desc_para.add_run().font.size = Pt(11)
-            
-            desc_content = doc.add_paragraph(finding.description)
-            desc_content.runs[0].font.size = Pt(11)
-            desc_content.paragraph_format.space_after = Pt(6)
+        desc_content = doc.add_paragraph(finding.description)
+        desc_content.runs[0].font.size = Pt(11)
+        desc_content.paragraph_format.space_after = Pt(6)
+    
+    # Recommendation
+    if finding.recommendation:
+        rec_para = doc.add_paragraph()
+        rec_para.add_run(f"{get_translation('recommendation', lang)}:").font.bold = True
+        rec_para.add_run().font.size = Pt(11)
         
-        # Recommendation
-        if finding.recommendation:
-            rec_para = doc.add_paragraph()
-            rec_para.add_run(f"{get_translation('recommendation', lang)}:").font.bold = True
-            rec_para.add_run().font.size = Pt(11)
-            
-            rec_content = doc.add_paragraph(finding.recommendation)
-            rec_content.runs[0].font.size = Pt(11)
-            rec_content.paragraph_format.space_after = Pt(6)
+        rec_content = doc.add_paragraph(finding.recommendation)
+        rec_content.runs[0].font.size = Pt(11)
+        rec_content.paragraph_format.space_after = Pt(6)
+    
+    # Evidence count
+    if finding.evidences:
+        evid_para = doc.add_paragraph()
+        evid_para.add_run(f"{get_translation('evidence_count', lang)}: {len(finding.evidences)}").font.bold = True
+        evid_para.add_run().font.size = Pt(11)
         
-        # Evidence count
-        if finding.evidences:
-            evid_para = doc.add_paragraph()
-            evid_para.add_run(f"{get_translation('evidence_count', lang)}: {len(finding.evidences)}").font.bold = True
-            evid_para.add_run().font.size = Pt(11)
+        for evidence in finding.evidences:
+            # Get file extension
+            file_ext = os.path.splitext(evidence.file_name)[1].lower()
             
-            for evidence in finding.evidences:
-                # Get file extension
-                file_ext = os.path.splitext(evidence.file_name)[1].lower()
-                
-                # Check if it's an image that can be embedded
-                if file_ext in IMAGE_EXTENSIONS:
-                    # Try to embed the image
-                    file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-                    if os.path.exists(file_path):
-                        try:
-                            # Add image with max width of 5 inches
-                            doc.add_paragraph()  # Add spacing before image
-                            img_para = doc.add_paragraph()
-                            img_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            run = img_para.add_run()
-                            run.add_picture(file_path, width=Inches(5))
-                            
-                            # Add caption below image
-                            caption_para = doc.add_paragraph()
-                            caption_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            caption_run = caption_para.add_run(f"📷 {evidence.file_name}")
-                            caption_run.font.size = Pt(9)
-                            caption_run.font.italic = True
-                            caption_run.font.color.rgb = RGBColor(107, 114, 128)
-                            
-                            if evidence.description:
-                                desc_para = doc.add_paragraph()
-                                desc_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                                desc_run = desc_para.add_run(evidence.description)
-                                desc_run.font.size = Pt(9)
-                                desc_run.font.color.rgb = RGBColor(107, 114, 128)
-                        except Exception as e:
-                            # If image embedding fails, fall back to text listing
-                            evid_item = doc.add_paragraph(f"  • {evidence.file_name} (görüntü yüklenemedi)", style='List Bullet')
-                            evid_item.runs[0].font.size = Pt(10)
-                    else:
-                        # File not found, list as text
-                        evid_item = doc.add_paragraph(f"  • {evidence.file_name} (dosya bulunamadı)", style='List Bullet')
+            # Check if it's an image that can be embedded
+            if file_ext in IMAGE_EXTENSIONS:
+                # Try to embed the image
+                file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
+                if os.path.exists(file_path):
+                    try:
+                        # Embed the report-sized rendition instead of the original when available
+                        image_path = get_rendition(evidence.file_path, evidence.file_name, "report") or file_path
+                        
+                        # Add image with max width of 5 inches
+                        doc.add_paragraph()  # Add spacing before image
+                        img_para = doc.add_paragraph()
+                        img_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                        run = img_para.add_run()
+                        add_picture(run, image_path, Inches(5))
+                        
+                        # Add caption below image
+                        caption_para = doc.add_paragraph()
+                        caption_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                        caption_run = caption_para.add_run(f"📷 {evidence.file_name}")
+                        caption_run.font.size = Pt(9)
+                        caption_run.font.italic = True
+                        caption_run.font.color.rgb = RGBColor(107, 114, 128)
+                        
+                        if evidence.description:
+                            desc_para = doc.add_paragraph()
+                            desc_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                            desc_run = desc_para.add_run(evidence.description)
+                            desc_run.font.size = Pt(9)
+                            desc_run.font.color.rgb = RGBColor(107, 114, 128)
+                    except Exception as e:
+                        # If image embedding fails, fall back to text listing
+                        evid_item = doc.add_paragraph(f"  • {evidence.file_name} (görüntü yüklenemedi)", style='List Bullet')
                         evid_item.runs[0].font.size = Pt(10)
                 else:
-                    # Non-image files: list as before
-                    evid_item = doc.add_paragraph(f"  • {evidence.file_name}", style='List Bullet')
+                    # File not found, list as text
+                    evid_item = doc.add_paragraph(f"  • {evidence.file_name} (dosya bulunamadı)", style='List Bullet')
                     evid_item.runs[0].font.size = Pt(10)
-                    if evidence.description:
-                        evid_desc = doc.add_paragraph(f"    {get_translation('evidence_desc', lang)}: {evidence.description}", style='List Bullet 2')
-                        evid_desc.runs[0].font.size = Pt(9)
-                        evid_desc.runs[0].font.color.rgb = RGBColor(107, 114, 128)
-        
-        # Add spacing between findings
-        doc.add_paragraph()
-        doc.add_paragraph()
+            else:
+                # Non-image files: list as before
+                evid_item = doc.add_paragraph(f"  • {evidence.file_name}", style='List Bullet')
+                evid_item.runs[0].font.size = Pt(10)
+                if evidence.description:
+                    evid_desc = doc.add_paragraph(f"    {get_translation('evidence_desc', lang)}: {evidence.description}", style='List Bullet 2')
+                    evid_desc.runs[0].font.size = Pt(9)
+                    evid_desc.runs[0].font.color.rgb = RGBColor(107, 114, 128)
+    
+    # Add spacing between findings
+    doc.add_paragraph()
+    doc.add_paragraph()
 
 def add_conclusion_section(doc: Document, audit: Audit, findings, lang: str = "tr"):
     """Add conclusion and recommendations section"""
@@ -465,11 +494,106 @@ def add_appendix_section(doc: Document, audit: Audit, lang: str = "tr"):
         meta_para = doc.add_paragraph(f"  {label}: {value}")
         meta_para.runs[0].font.size = Pt(10)
 
-def generate_audit_word_report(audit: Audit, db: Session) -> str:
+def finding_snapshot(finding) -> SimpleNamespace:
+    """Picklable copy of what add_finding reads from a Finding"""
+    return SimpleNamespace(
+        title=finding.title,
+        severity=finding.severity,
+        status=finding.status,
+        control_reference=finding.control_reference,
+        description=finding.description,
+        recommendation=finding.recommendation,
+        evidences=[
+            SimpleNamespace(file_path=e.file_path, file_name=e.file_name, description=e.description)
+            for e in finding.evidences
+        ]
+    )
+
+def render_finding_fragment(renderer: FragmentRenderer, item):
+    """
+    Fragment for one finding (also run in the report worker processes). The finding
+    number is left as FINDING_INDEX_PLACEHOLDER so fragments can be cached.
+    """
+    finding, lang = item
+    return renderer.render(
+        lambda doc, add_picture: add_finding(doc, FINDING_INDEX_PLACEHOLDER, finding, lang, add_picture)
+    )
+
+def _init_render_worker(upload_dir: str):
+    settings.UPLOAD_DIR = upload_dir
+
+_fragment_pool: Optional[FragmentPool] = None
+_fragment_pool_lock = threading.Lock()
+
+def render_processes() -> int:
+    return settings.REPORT_RENDER_PROCESSES or os.cpu_count() or 1
+
+def get_fragment_pool() -> FragmentPool:
+    """Process pool shared by all report builds of this process, started on first use"""
+    global _fragment_pool
+    with _fragment_pool_lock:
+        if _fragment_pool is None:
+            _fragment_pool = FragmentPool(
+                render_processes(), initializer=_init_render_worker, initargs=(settings.UPLOAD_DIR,)
+            )
+        return _fragment_pool
+
+def reset_fragment_pool():
+    """Drop a broken pool; the next build starts a new one"""
+    global _fragment_pool
+    with _fragment_pool_lock:
+        if _fragment_pool is not None:
+            _fragment_pool.shutdown(wait=False)
+            _fragment_pool = None
+
+def render_findings(findings, lang: str, parallel: Optional[bool] = None) -> Iterator[Fragment]:
+    """
+    Numbered fragments of the findings, in order. Cached fragments are reused; the
+    rest are rendered (in the fragment pool when parallel) and added to the cache.
+    """
+    keys = [fragment_cache_key(finding, lang, REPORT_FORMAT_VERSION) for finding in findings]
+    cached = [fragment_cache.get(key) for key in keys]
+    missing = [finding for finding, fragment in zip(findings, cached) if fragment is None]
+    if parallel is None:
+        parallel = render_processes() > 1 and len(missing) >= settings.REPORT_PARALLEL_MIN_FINDINGS
+    if parallel:
+        rendered = get_fragment_pool().render_ordered(
+            render_finding_fragment, ((finding_snapshot(finding), lang) for finding in missing)
+        )
+    else:
+        renderer = FragmentRenderer()
+        rendered = (render_finding_fragment(renderer, (finding, lang)) for finding in missing)
+    
+    for idx, (key, fragment) in enumerate(zip(keys, cached), 1):
+        if fragment is None:
+            fragment = next(rendered)
+            fragment_cache.put(key, fragment)
+        yield fragment._replace(xml=fragment.xml.replace(FINDING_INDEX_PLACEHOLDER, str(idx), 1))
+
+def generate_audit_word_report(
+    audit: Audit,
+    db: Session,
+    output_path: Optional[str] = None,
+    progress: Optional[Callable[[int, str], None]] = None,
+    streaming: bool = True,
+    parallel: Optional[bool] = None
+) -> str:
     """
     Generate professional Word (.docx) report for an audit
     Follows international audit report standards with cover page
+    
+    Writes to output_path, or to a new temporary file the caller must remove.
+    progress(percent, stage) is called as the sections are built.
+    With streaming (default) findings are written one by one through
+    StreamingDocxWriter; streaming=False builds the whole document in memory.
+    Rendered findings are cached (report_fragment_cache); parallel renders the
+    others in the fragment process pool (default: when at least
+    REPORT_PARALLEL_MIN_FINDINGS need rendering and there is more than one
+    render process).
     """
+    def report_progress(percent: int, stage: str):
+        if progress:
+            progress(percent, stage)
     
     # Get audit details with relationships
     findings = audit.findings
@@ -490,6 +614,7 @@ def generate_audit_word_report(audit: Audit, db: Session) -> str:
     doc.core_properties.author = "ArchRampart Audit Tool"
     doc.core_properties.comments = f"{audit.standard.value} {report_title}"
     
+    report_progress(5, "cover")
     # Add cover page
     add_cover_page(doc, audit, organization, project, lang)
     
@@ -502,8 +627,16 @@ def generate_audit_word_report(audit: Audit, db: Session) -> str:
     # Add methodology
     add_methodology_section(doc, audit, lang)
     
-    # Add findings
-    add_findings_section(doc, findings, lang)
+    # Add findings (the bulk of the work: 10% -> 90%)
+    report_progress(10, "findings")
+    def on_finding(done: int, total: int):
+        report_progress(10 + 80 * done // total, "findings")
+    
+    if streaming:
+        add_findings_heading(doc, findings, lang)
+        writer = StreamingDocxWriter(doc)
+    else:
+        add_findings_section(doc, findings, lang, on_finding=on_finding)
     
     # Add conclusion
     add_conclusion_section(doc, audit, findings, lang)
@@ -511,12 +644,25 @@ def generate_audit_word_report(audit: Audit, db: Session) -> str:
     # Add appendix
     add_appendix_section(doc, audit, lang)
     
-    # Save to temporary file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.docx')
-    temp_path = temp_file.name
-    temp_file.close()
-    
-    doc.save(temp_path)
-    
-    return temp_path
-
+    if output_path is None:
+        # Save to temporary file
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.docx')
+        output_path = temp_file.name
+        temp_file.close()
+    
+    if streaming:
+        fragments = render_findings(findings, lang, parallel)
+        try:
+            with writer.open(output_path):
+                for idx, fragment in enumerate(fragments, 1):
+                    writer.add_fragment(fragment)
+                    on_finding(idx, len(findings))
+                report_progress(90, "saving")
+        except BrokenProcessPool:
+            reset_fragment_pool()
+            raise
+    else:
+        report_progress(90, "saving")
+        doc.save(output_path)
+    
+    return output_path
@@ -0,0 +1,101 @@
+"""
+Benchmark: /analytics/dashboard aggregation
+Compares the rollup-backed aggregation against the previous
+one-COUNT(*)-per-enum loop on a synthetic tenant.
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python scripts/benchmark_dashboard.py --findings 400000
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+from scripts.benchmark_utils import (
+    benchmark_arg_parser, get_benchmark_session, seed_project, seed_findings, timed, print_table
+)
+from app.models.finding import Finding
+from app.models.audit import Audit, AuditStatus
+from app.models.template import Severity, Status
+from app.services.dashboard_stats import compute_dashboard_stats
+from app.core.finding_stats import rebuild_finding_stats
+
+def legacy_dashboard_stats(db, user_id, audit_filters, total_projects):
+    """The per-enum COUNT(*) loop previously inlined in get_dashboard_stats"""
+    audits_query = db.query(Audit).filter(*audit_filters)
+    findings_query = db.query(Finding).join(Audit).filter(*audit_filters)
+
+    total_audits = audits_query.count()
+    total_findings = findings_query.count()
+    audit_status_dist = {s.value: audits_query.filter(Audit.status == s).count() for s in AuditStatus}
+    severity_dist = {s.value: findings_query.filter(Finding.severity == s).count() for s in Severity}
+    finding_status_dist = {s.value: findings_query.filter(Finding.status == s).count() for s in Status}
+    open_statuses = [Status.OPEN, Status.IN_PROGRESS]
+    open_findings = findings_query.filter(Finding.status.in_(open_statuses)).count()
+    urgent_findings = findings_query.filter(
+        Finding.severity.in_([Severity.CRITICAL, Severity.HIGH]),
+        Finding.status.in_(open_statuses)
+    ).count()
+    my_findings = findings_query.filter(Finding.assigned_to_user_id == user_id).count()
+    now = datetime.now()
+    overdue_findings = findings_query.filter(
+        Finding.due_date.isnot(None), Finding.due_date < now, Finding.status.in_(open_statuses)
+    ).count()
+    due_soon_findings = findings_query.filter(
+        Finding.due_date.isnot(None),
+        Finding.due_date <= now + timedelta(days=3),
+        Finding.due_date > now,
+        Finding.status.in_(open_statuses)
+    ).count()
+    completed_findings = findings_query.filter(Finding.status == Status.RESOLVED).count()
+    completion_rate = (completed_findings / total_findings * 100) if total_findings > 0 else 0
+    return {
+        "total_projects": total_projects,
+        "total_audits": total_audits,
+        "total_findings": total_findings,
+        "open_findings": open_findings,
+        "urgent_findings": urgent_findings,
+        "my_findings": my_findings,
+        "overdue_findings": overdue_findings,
+        "due_soon_findings": due_soon_findings,
+        "completion_rate": round(completion_rate, 2),
+        "audit_status_distribution": audit_status_dist,
+        "severity_distribution": severity_dist,
+        "status_distribution": finding_status_dist,
+    }
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--findings", type=int, default=100000, help="Number of findings to seed")
+    args = parser.parse_args()
+
+    db = get_benchmark_session(args.database_url)
+    try:
+        print(f"Seeding {args.findings} findings...")
+        _, project, audit, user = seed_project(db, "dashboard")
+        seed_findings(db, audit.id, args.findings, user_id=user.id)
+        rebuild_finding_stats(db)
+        db.commit()
+
+        audit_filters = [Audit.project_id.in_([project.id])]
+        scope = lambda column: [column.in_([project.id])]
+        legacy_ms, legacy = timed(lambda: legacy_dashboard_stats(db, user.id, audit_filters, 1), args.repeat)
+        grouped_ms, grouped = timed(lambda: compute_dashboard_stats(db, user.id, scope, 1), args.repeat)
+
+        print()
+        print_table(
+            ["variant", "queries", "median ms"],
+            [
+                ["per-enum COUNT(*) loop", 3 + len(AuditStatus) + len(Severity) + len(Status) + 5, f"{legacy_ms:.1f}"],
+                ["finding_stats rollup", 3, f"{grouped_ms:.1f}"],
+            ]
+        )
+        print(f"\nSpeedup: {legacy_ms / grouped_ms:.1f}x")
+        print("Results identical:", legacy == grouped)
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: loader strategies for the findings list endpoint
+Compares the previous joinedload(comments -> user) profile against the
+selectinload profile (with and without comments) on findings that carry
+50+ comments each. Reports statements issued, rows transferred and latency.
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python scripts/benchmark_finding_loaders.py --findings 100 --comments 60
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import joinedload
+from scripts.benchmark_utils import (
+    benchmark_arg_parser, get_benchmark_session, seed_project, seed_findings, timed, print_table
+)
+from app.models.finding import Finding, FindingComment, Evidence
+from app.api.v1.endpoints.findings import finding_load_options
+
+class RowCounter:
+    """Counts statements and result rows fetched through an engine"""
+    def __init__(self, engine):
+        self.statements = 0
+        self.rows = 0
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        if cursor.description is not None and cursor.rowcount > 0:
+            self.rows += cursor.rowcount
+
+    def reset(self):
+        self.statements = 0
+        self.rows = 0
+
+def seed_comments_and_evidences(db, audit_id, user_id, comments_per_finding, evidences_per_finding):
+    finding_ids = db.execute(select(Finding.id).where(Finding.audit_id == audit_id)).scalars().all()
+    comments = [
+        {"finding_id": fid, "user_id": user_id, "comment": f"Comment {n} " + "x" * 200}
+        for fid in finding_ids for n in range(comments_per_finding)
+    ]
+    evidences = [
+        {"finding_id": fid, "file_path": f"{fid}-{n}.png", "file_name": f"evidence-{n}.png", "file_size": 1024}
+        for fid in finding_ids for n in range(evidences_per_finding)
+    ]
+    if comments:
+        db.execute(insert(FindingComment), comments)
+    if evidences:
+        db.execute(insert(Evidence), evidences)
+    db.flush()
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--findings", type=int, default=100, help="Findings in the listed page")
+    parser.add_argument("--comments", type=int, default=60, help="Comments per finding")
+    parser.add_argument("--evidences", type=int, default=3, help="Evidences per finding")
+    args = parser.parse_args()
+
+    db = get_benchmark_session(args.database_url)
+    counter = RowCounter(db.get_bind())
+    try:
+        print(f"Seeding {args.findings} findings x {args.comments} comments...")
+        _, _, audit, user = seed_project(db, "loaders")
+        seed_findings(db, audit.id, args.findings, user_id=user.id)
+        seed_comments_and_evidences(db, audit.id, user.id, args.comments, args.evidences)
+        db.commit()
+        audit_id = audit.id
+
+        variants = [
+            ("joinedload comments (previous)", [
+                joinedload(Finding.assigned_to),
+                joinedload(Finding.comments).joinedload(FindingComment.user),
+            ]),
+            ("selectinload comments,evidences", finding_load_options({"comments", "evidences"})),
+            ("selectinload evidences only", finding_load_options({"evidences"})),
+            ("include= (no collections)", finding_load_options(set())),
+        ]
+
+        rows = []
+        for label, options in variants:
+            def run():
+                db.expunge_all()
+                return db.query(Finding).options(*options).filter(
+                    Finding.audit_id == audit_id
+                ).order_by(Finding.id).limit(args.findings).all()
+
+            run()  # warm up
+            counter.reset()
+            ms, findings = timed(run, args.repeat)
+            rows.append([
+                label,
+                len(findings),
+                counter.statements // args.repeat,
+                counter.rows // args.repeat,
+                f"{ms:.1f}",
+            ])
+
+        print()
+        print_table(["variant", "findings", "statements", "rows transferred", "median ms"], rows)
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: findings list serialization
+Compares the previous per-request dict building (__dict__ spreading plus
+FindingSchema(**dict) per row, then FastAPI's JSON encoding) against the
+precompiled TypeAdapter that reads ORM attributes and dumps JSON bytes directly.
+No database is needed; the ORM objects are built in memory.
+
+Usage:
+    python scripts/benchmark_finding_serializer.py --findings 1000 --comments 5
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from scripts.benchmark_utils import benchmark_arg_parser, timed, print_table
+from app.models.finding import Finding, FindingComment, Evidence
+from app.models.user import User, UserRole
+from app.models.template import Severity, Status
+from app.schemas.finding import Finding as FindingSchema, serialize_findings_json
+
+def build_findings(count, comments_per_finding, evidences_per_finding):
+    user = User(id=1, email="bench@example.com", full_name="Bench User", role=UserRole.AUDITOR, is_active=True)
+    now = datetime.now()
+    findings = []
+    for i in range(count):
+        finding = Finding(
+            id=i + 1, audit_id=1, title=f"Finding {i}", description="Synthetic finding " * 10,
+            severity=Severity.HIGH, status=Status.OPEN, recommendation="Fix it",
+            assigned_to_user_id=user.id, created_at=now
+        )
+        finding.assigned_to = user
+        finding.comments = [
+            FindingComment(id=i * 100 + n, finding_id=finding.id, user_id=user.id, comment=f"Comment {n}", created_at=now, user=user)
+            for n in range(comments_per_finding)
+        ]
+        finding.evidences = [
+            Evidence(id=i * 100 + n, finding_id=finding.id, file_path=f"{i}-{n}.png", file_name=f"e{n}.png", file_size=1024, created_at=now)
+            for n in range(evidences_per_finding)
+        ]
+        findings.append(finding)
+    return findings
+
+def _user_dict(user):
+    return {"id": user.id, "full_name": user.full_name, "email": user.email} if user else None
+
+def legacy_serialize(findings):
+    """The dict building previously inlined in read_findings, plus FastAPI's response encoding"""
+    result = []
+    for finding in findings:
+        finding_dict = {
+            **{k: v for k, v in finding.__dict__.items() if not k.startswith('_')},
+            "assigned_to": _user_dict(finding.assigned_to),
+            "comments": [
+                {
+                    **{k: v for k, v in comment.__dict__.items() if not k.startswith('_')},
+                    "user": _user_dict(comment.user)
+                }
+                for comment in (finding.comments or [])
+            ] if finding.comments else []
+        }
+        result.append(FindingSchema(**finding_dict))
+    return json.dumps(jsonable_encoder(result)).encode("utf-8")
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--findings", type=int, default=1000, help="Findings per response")
+    parser.add_argument("--comments", type=int, default=5, help="Comments per finding")
+    parser.add_argument("--evidences", type=int, default=2, help="Evidences per finding")
+    args = parser.parse_args()
+
+    findings = build_findings(args.findings, args.comments, args.evidences)
+    legacy_serialize(findings)
+    serialize_findings_json(findings)
+
+    legacy_ms, legacy_body = timed(lambda: legacy_serialize(findings), args.repeat)
+    adapter_ms, adapter_body = timed(lambda: serialize_findings_json(findings), args.repeat)
+
+    print_table(
+        ["variant", "bytes", "median ms"],
+        [
+            ["dict spreading + jsonable_encoder", len(legacy_body), f"{legacy_ms:.1f}"],
+            ["TypeAdapter.dump_json", len(adapter_body), f"{adapter_ms:.1f}"],
+        ]
+    )
+    print(f"\nSpeedup: {legacy_ms / adapter_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: /health latency during a login storm
+Probes GET /health on a running API while --concurrency clients hammer
+POST /api/v1/auth/login, and reports probe latency percentiles for an idle
+phase and a storm phase.
+
+With --compare the script starts the API itself (uvicorn, one worker, the
+database of the current settings/.env) twice and runs the same storm against
+both: PASSWORD_HASH_WORKERS=0 (bcrypt on the event loop, the baseline) and the
+configured password hash pool.
+
+The account must exist (e.g. created with scripts/create_admin.py).
+
+Usage:
+    python scripts/benchmark_login_storm.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password secret --concurrency 32 --duration 10
+    python scripts/benchmark_login_storm.py --compare --port 8765 \\
+        --email admin@example.com --password secret
+"""
+import sys
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import argparse
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from scripts.benchmark_utils import print_table
+
+def request_ms(url: str, data: bytes = None) -> float:
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=30) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        e.read()
+    return (time.perf_counter() - start) * 1000
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def probe_health(base_url: str, duration: float, interval: float):
+    samples = []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        samples.append(request_ms(f"{base_url}/health"))
+        time.sleep(interval)
+    return samples
+
+def login_storm(base_url: str, email: str, password: str, stop: threading.Event, counts: list):
+    body = urllib.parse.urlencode({"username": email, "password": password}).encode()
+    while not stop.is_set():
+        request_ms(f"{base_url}/api/v1/auth/login", body)
+        counts.append(1)
+
+def summarize(label, samples, logins, duration):
+    return [
+        label,
+        len(samples),
+        f"{percentile(samples, 50):.1f}",
+        f"{percentile(samples, 99):.1f}",
+        f"{max(samples):.1f}",
+        f"{logins / duration:.1f}",
+    ]
+
+def run_storm(base_url: str, args, label: str):
+    """Idle and storm rows for one server"""
+    print(f"[{label}] idle phase ({args.duration:.0f}s)...")
+    idle = probe_health(base_url, args.duration, args.interval)
+
+    print(f"[{label}] storm phase ({args.duration:.0f}s, {args.concurrency} login clients)...")
+    stop = threading.Event()
+    counts = []
+    clients = [
+        threading.Thread(target=login_storm, args=(base_url, args.email, args.password, stop, counts), daemon=True)
+        for _ in range(args.concurrency)
+    ]
+    for client in clients:
+        client.start()
+    storm = probe_health(base_url, args.duration, args.interval)
+    stop.set()
+    for client in clients:
+        client.join()
+    return [
+        summarize(f"{label} idle", idle, 0, args.duration),
+        summarize(f"{label} login storm", storm, len(counts), args.duration),
+    ]
+
+def start_server(port: int, hash_workers: str) -> subprocess.Popen:
+    """uvicorn on the backend app with the given PASSWORD_HASH_WORKERS; returns once /health answers"""
+    env = {**os.environ, "PASSWORD_HASH_WORKERS": hash_workers}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                response.read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not start within 60s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between /health probes")
+    parser.add_argument("--compare", action="store_true",
+                        help="Start the API twice (bcrypt on the event loop vs. the hash pool) and compare")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the servers started by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        from app.core.config import settings
+        rows = []
+        for label, hash_workers in (
+            ("event loop", "0"),
+            (f"hash pool ({settings.PASSWORD_HASH_WORKERS})", str(settings.PASSWORD_HASH_WORKERS)),
+        ):
+            server = start_server(args.port, hash_workers)
+            try:
+                rows += run_storm(f"http://127.0.0.1:{args.port}", args, label)
+            finally:
+                server.terminate()
+                server.wait()
+    else:
+        rows = run_storm(args.base_url.rstrip("/"), args, "api")
+
+    print()
+    print_table(["phase", "probes", "p50 ms", "p99 ms", "max ms", "logins/s"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: deleting a project with all its audits, findings, comments and evidences
+Seeds a project with --findings findings spread over --audits audits, one comment
+every --comment-every findings and one evidence (sharing a few blobs) every
+--evidence-every findings, then deletes it with:
+
+- ORM cascade (previous): joinedload of audits/findings/evidences, db.delete() per object
+- set-based: delete_audits() (one DELETE ... WHERE ... IN (SELECT ...) per table)
+
+Times include the commit; files are not touched (the blobs are rows only).
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python scripts/benchmark_project_delete.py
+    python scripts/benchmark_project_delete.py --findings 100000 --skip-orm
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import time
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import joinedload
+from scripts.benchmark_utils import benchmark_arg_parser, get_benchmark_session, seed_project, seed_findings, print_table
+from app.core.bulk_delete import delete_audits
+from app.core.evidence_storage import blob_path, release_evidence_files
+from app.models.audit import Audit, AuditStandard
+from app.models.evidence_blob import EvidenceBlob
+from app.models.finding import Finding, Evidence, FindingComment
+from app.models.project import Project
+
+BLOBS = 20
+
+def seed(db, args):
+    _, project, first_audit, user = seed_project(db, "project-delete")
+    audits = [first_audit] + [
+        Audit(name=f"audit-{i}", standard=AuditStandard.ISO27001, project_id=project.id)
+        for i in range(1, args.audits)
+    ]
+    db.add_all(audits[1:])
+    db.flush()
+    per_audit = args.findings // args.audits
+    for audit in audits:
+        seed_findings(db, audit.id, per_audit, user_id=user.id)
+
+    finding_ids = db.execute(
+        select(Finding.id).join(Audit).where(Audit.project_id == project.id).order_by(Finding.id)
+    ).scalars().all()
+    if args.comment_every:
+        db.execute(insert(FindingComment), [
+            {"finding_id": finding_id, "user_id": user.id, "comment": "Kontrol edildi"}
+            for finding_id in finding_ids[::args.comment_every]
+        ])
+    if args.evidence_every:
+        hashes = [hashlib.sha256(f"{project.id}-{n}".encode()).hexdigest() for n in range(BLOBS)]
+        rows = [
+            {
+                "finding_id": finding_id, "file_path": blob_path(hashes[n % BLOBS]), "file_name": "kanit.png",
+                "file_size": 1024, "sha256": hashes[n % BLOBS]
+            }
+            for n, finding_id in enumerate(finding_ids[::args.evidence_every])
+        ]
+        db.execute(insert(Evidence), rows)
+        db.execute(insert(EvidenceBlob), [
+            {
+                "sha256": sha256, "file_path": blob_path(sha256), "file_size": 1024,
+                "ref_count": sum(1 for row in rows if row["sha256"] == sha256)
+            }
+            for sha256 in hashes
+        ])
+    db.commit()
+    return project.id, len(finding_ids)
+
+def delete_with_orm(db, project_id: int):
+    project = db.query(Project).options(
+        joinedload(Project.audits).joinedload(Audit.findings).joinedload(Finding.evidences)
+    ).filter(Project.id == project_id).first()
+    release_evidence_files(db, Evidence.finding_id.in_(
+        select(Finding.id).join(Audit).where(Audit.project_id == project_id)
+    ))
+    for audit in project.audits:
+        for finding in audit.findings:
+            for evidence in finding.evidences:
+                db.delete(evidence)
+    for audit in project.audits:
+        for finding in audit.findings:
+            db.delete(finding)
+    for audit in project.audits:
+        db.delete(audit)
+    db.delete(project)
+    db.commit()
+
+def delete_set_based(db, project_id: int):
+    delete_audits(db, Audit.project_id == project_id)
+    db.execute(delete(Project).where(Project.id == project_id), execution_options={"synchronize_session": False})
+    db.commit()
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--findings", type=int, default=100000, help="Findings in the project")
+    parser.add_argument("--audits", type=int, default=10, help="Audits the findings are spread over")
+    parser.add_argument("--comment-every", type=int, default=10, help="Add a comment to every Nth finding (0: none)")
+    parser.add_argument("--evidence-every", type=int, default=5, help="Add an evidence to every Nth finding (0: none)")
+    parser.add_argument("--skip-orm", action="store_true", help="Only time the set-based deletion")
+    args = parser.parse_args()
+
+    db = get_benchmark_session(args.database_url)
+    variants = [("set-based", delete_set_based)]
+    if not args.skip_orm:
+        variants.insert(0, ("ORM cascade (previous)", delete_with_orm))
+    rows = []
+    try:
+        for label, variant in variants:
+            print(f"Seeding {args.findings} findings...")
+            project_id, findings = seed(db, args)
+            db.expire_all()
+            start = time.perf_counter()
+            variant(db, project_id)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            left = db.execute(
+                select(func.count(Finding.id)).join(Audit).where(Audit.project_id == project_id)
+            ).scalar()
+            if left:
+                print(f"❌ {label}: {left} findings left")
+                sys.exit(1)
+            rows.append([findings, label, f"{elapsed_ms:.0f}"])
+            print(f"   {label}: {rows[-1][2]} ms")
+
+        print()
+        print_table(["findings", "variant", "ms"], rows)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
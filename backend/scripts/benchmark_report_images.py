@@ -0,0 +1,96 @@
+"""
+Benchmark: Word report size and generation time for image-heavy audits
+Seeds an audit whose findings carry full-resolution photos, then generates
+the report embedding the originals (previous behaviour) and embedding the
+report-sized renditions.
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python scripts/benchmark_report_images.py --findings 20 --width 4000
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import shutil
+import tempfile
+from PIL import Image
+from scripts.benchmark_utils import (
+    benchmark_arg_parser, get_benchmark_session, seed_project, seed_findings, timed, print_table
+)
+from app.core.config import settings
+from app.core.evidence_storage import store_upload
+from app.models.audit import Audit
+from app.models.finding import Finding, Evidence
+from app.services import word_generator
+from app.services.evidence_renditions import generate_renditions
+
+def photo_bytes(width: int, seed: int) -> bytes:
+    """A noisy photo-like PNG (noise defeats compression, like real camera images)"""
+    height = width * 3 // 4
+    image = Image.effect_noise((width, height), 40 + seed % 20).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--findings", type=int, default=20, help="Findings with one image each")
+    parser.add_argument("--width", type=int, default=4000, help="Original image width in pixels")
+    args = parser.parse_args()
+
+    settings.UPLOAD_DIR = tempfile.mkdtemp(prefix="benchmark-uploads-")
+    settings.MAX_UPLOAD_SIZE = 1024 * 1024 * 1024
+    db = get_benchmark_session(args.database_url)
+    report_paths = []
+    try:
+        print(f"Seeding {args.findings} findings with {args.width}px images...")
+        _, _, audit, user = seed_project(db, "report-images")
+        seed_findings(db, audit.id, args.findings, user_id=user.id)
+        finding_ids = [f.id for f in db.query(Finding).filter(Finding.audit_id == audit.id)]
+        for n, finding_id in enumerate(finding_ids):
+            stored = store_upload(db, io.BytesIO(photo_bytes(args.width, n)))
+            db.add(Evidence(
+                finding_id=finding_id, file_path=stored.file_path, file_name=f"photo-{n}.png",
+                file_size=stored.file_size, sha256=stored.sha256
+            ))
+        db.commit()
+        audit = db.query(Audit).filter(Audit.id == audit.id).one()
+        evidences = [e for f in audit.findings for e in f.evidences]
+        original_bytes = sum(e.file_size for e in evidences)
+
+        def report():
+            path = word_generator.generate_audit_word_report(audit, db)
+            report_paths.append(path)
+            return os.path.getsize(path)
+
+        # Previous behaviour: embed the originals
+        get_rendition = word_generator.get_rendition
+        word_generator.get_rendition = lambda *a, **kw: None
+        original_ms, original_size = timed(report, args.repeat)
+        word_generator.get_rendition = get_rendition
+
+        rendition_ms, _ = timed(lambda: [generate_renditions(e.file_path) for e in evidences], 1)
+        rendition_report_ms, rendition_size = timed(report, args.repeat)
+
+        print()
+        print(f"Originals: {original_bytes / 1024 / 1024:.1f} MB in {len(evidences)} images")
+        print(f"Rendition generation (background, once per image): {rendition_ms:.0f} ms total")
+        print_table(
+            ["variant", "report MB", "median ms"],
+            [
+                ["embed originals (previous)", f"{original_size / 1024 / 1024:.1f}", f"{original_ms:.0f}"],
+                ["embed report renditions", f"{rendition_size / 1024 / 1024:.1f}", f"{rendition_report_ms:.0f}"],
+            ]
+        )
+    finally:
+        db.rollback()
+        db.close()
+        for path in report_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(settings.UPLOAD_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: Word report generation, in-memory python-docx vs the streaming writer
+Seeds audits with 100 / 1,000 / 5,000 findings (one screenshot every
+--image-every findings) and builds each report in a forked child, measuring
+wall time and peak RSS growth of the building process (Linux: /proc/self/clear_refs).
+
+Variants: in-memory (previous), streaming in-process, and streaming with the
+findings rendered by --processes worker processes (pool started before timing,
+as it is in a running API; worker memory is not included).
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python scripts/benchmark_report_streaming.py
+    python scripts/benchmark_report_streaming.py --sizes 100 1000 --image-every 10 --processes 2 4 8
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import multiprocessing
+import shutil
+import tempfile
+import time
+from PIL import Image
+from scripts.benchmark_utils import (
+    benchmark_arg_parser, get_benchmark_session, seed_project, seed_findings, print_table
+)
+from app.core.config import settings
+from app.core.evidence_storage import store_upload
+from app.models.finding import Finding, Evidence
+from app.services.evidence_renditions import generate_renditions
+from app.services.report_jobs import load_report_audit
+from app.services.word_generator import (
+    finding_snapshot, generate_audit_word_report, get_fragment_pool, render_finding_fragment
+)
+
+def screenshot_bytes(seed: int) -> bytes:
+    """A distinct 1280x800 screenshot-like PNG"""
+    image = Image.effect_noise((1280, 800), 10 + seed % 50).convert("RGB")
+    image.paste((seed * 37 % 256, seed * 91 % 256, 200), (0, 0, 1280, 60))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+def read_status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+def warm_up_pool(audit, processes: int):
+    settings.REPORT_RENDER_PROCESSES = processes
+    pool = get_fragment_pool()
+    item = (finding_snapshot(audit.findings[0]), "tr")
+    list(pool.render_ordered(render_finding_fragment, [item] * processes * pool.batch_size))
+
+def build_report(database_url: str, upload_dir: str, audit_id: int, streaming: bool, processes: int, queue):
+    """Runs in a forked child so each measurement starts from the same heap"""
+    settings.UPLOAD_DIR = upload_dir
+    db = get_benchmark_session(database_url)
+    try:
+        audit = load_report_audit(db, audit_id)
+        if processes > 1:
+            warm_up_pool(audit, processes)
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # reset the peak RSS counter
+        rss_before = read_status_kb("VmRSS")
+        start = time.perf_counter()
+        path = generate_audit_word_report(audit, db, streaming=streaming, parallel=processes > 1)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        peak_growth = read_status_kb("VmHWM") - rss_before
+        queue.put((elapsed_ms, peak_growth, os.path.getsize(path)))
+        os.remove(path)
+    finally:
+        db.close()
+        if processes > 1:
+            get_fragment_pool().shutdown()
+
+def measure(database_url: str, audit_id: int, streaming: bool, processes: int = 1):
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(
+        target=build_report, args=(database_url, settings.UPLOAD_DIR, audit_id, streaming, processes, queue)
+    )
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="Findings per audit")
+    parser.add_argument("--image-every", type=int, default=10, help="Attach a screenshot to every Nth finding (0: none)")
+    parser.add_argument("--processes", type=int, nargs="*", default=[2, 4], help="Render process counts to compare")
+    args = parser.parse_args()
+
+    settings.UPLOAD_DIR = tempfile.mkdtemp(prefix="benchmark-uploads-")
+    db = get_benchmark_session(args.database_url)
+    rows = []
+    try:
+        for size in args.sizes:
+            print(f"Seeding {size} findings...")
+            _, _, audit, user = seed_project(db, f"report-stream-{size}")
+            seed_findings(db, audit.id, size, user_id=user.id)
+            images = 0
+            if args.image_every:
+                finding_ids = db.query(Finding.id).filter(Finding.audit_id == audit.id).order_by(Finding.id).all()
+                for n, (finding_id,) in enumerate(finding_ids[::args.image_every]):
+                    stored = store_upload(db, io.BytesIO(screenshot_bytes(n)))
+                    generate_renditions(stored.file_path)
+                    db.add(Evidence(
+                        finding_id=finding_id, file_path=stored.file_path, file_name=f"screenshot-{n}.png",
+                        file_size=stored.file_size, sha256=stored.sha256
+                    ))
+                    images += 1
+            db.commit()
+
+            variants = [("in-memory (previous)", False, 1), ("streaming", True, 1)] + [
+                (f"streaming, {n} processes", True, n) for n in args.processes
+            ]
+            for label, streaming, processes in variants:
+                elapsed_ms, peak_kb, report_size = measure(args.database_url, audit.id, streaming, processes)
+                rows.append([
+                    size, images, label,
+                    f"{elapsed_ms:.0f}", f"{peak_kb / 1024:.0f}", f"{report_size / 1024 / 1024:.1f}"
+                ])
+                print(f"   {rows[-1][2]}: {rows[-1][3]} ms, +{rows[-1][4]} MB RSS")
+
+        print()
+        print_table(["findings", "images", "variant", "ms", "peak RSS +MB", "report MB"], rows)
+    finally:
+        db.close()
+        shutil.rmtree(settings.UPLOAD_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
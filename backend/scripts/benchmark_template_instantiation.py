@@ -0,0 +1,129 @@
+"""
+Benchmark: creating an audit's findings from a template
+Seeds a template with --items controls (some without English texts, some with
+blank or whitespace-only ones) and instantiates it for a new audit, in Turkish
+and English, with:
+
+- ORM loop (previous): template.items loaded, get_template_field per text,
+  one db.add(Finding(...)) per item, flush
+- INSERT ... SELECT: create_findings_from_template, texts picked in SQL
+
+Each run is rolled back. Both variants must produce the same findings.
+
+Usage:
+    BENCHMARK_DATABASE_URL=postgresql://... python scripts/benchmark_template_instantiation.py
+    python scripts/benchmark_template_instantiation.py --items 1000 --repeat 10
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import statistics
+import time
+from sqlalchemy import insert
+from scripts.benchmark_utils import benchmark_arg_parser, get_benchmark_session, seed_project, print_table
+from app.core.i18n import get_template_field
+from app.core.template_findings import create_findings_from_template
+from app.models.audit import Audit, AuditStandard
+from app.models.finding import Finding
+from app.models.template import Template, TemplateItem, Severity, Status
+
+def seed_template(db, items: int) -> int:
+    template = Template(name="Benchmark şablonu", name_en="Benchmark template", standard=AuditStandard.ISO27001)
+    db.add(template)
+    db.flush()
+    severities = list(Severity)
+    rows = []
+    for i in range(items):
+        translated = i % 4 != 0  # every 4th control has no English texts
+        rows.append({
+            "template_id": template.id,
+            "order_number": i + 1,
+            "control_reference": f"A.{i // 10}.{i % 10}",
+            "default_title": f"Kontrol {i}",
+            "default_title_en": f"Control {i}" if translated else (" " if i % 8 == 0 else "\n\t"),
+            "default_description": "Kontrolün açıklaması " * 6,
+            "default_description_en": "Description of the control " * 6 if translated else None,
+            "default_severity": severities[i % len(severities)],
+            "default_status": Status.OPEN,
+            "default_recommendation": " Öneri\n" if i % 3 else None,
+            "default_recommendation_en": "Recommendation" if translated else "",
+        })
+    db.execute(insert(TemplateItem), rows)
+    db.commit()
+    return template.id
+
+def orm_loop(db, template_id: int, audit_id: int, lang: str) -> int:
+    template = db.query(Template).filter(Template.id == template_id).first()
+    count = 0
+    for item in template.items:
+        db.add(Finding(
+            audit_id=audit_id,
+            title=get_template_field(item, "default_title", lang),
+            description=get_template_field(item, "default_description", lang),
+            control_reference=item.control_reference,
+            severity=item.default_severity,
+            status=item.default_status,
+            recommendation=get_template_field(item, "default_recommendation", lang)
+        ))
+        count += 1
+    db.flush()
+    return count
+
+def insert_select(db, template_id: int, audit_id: int, lang: str) -> int:
+    return create_findings_from_template(db, template_id, audit_id, lang)
+
+def run(db, project_id: int, template_id: int, lang: str, variant):
+    """Instantiate the template for a fresh audit; returns (ms, findings) and rolls back"""
+    audit = Audit(name="benchmark", standard=AuditStandard.ISO27001, project_id=project_id, language=lang)
+    db.add(audit)
+    db.flush()
+    db.expire_all()  # like a new request: nothing cached in the session
+    start = time.perf_counter()
+    count = variant(db, template_id, audit.id, lang)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    findings = db.query(
+        Finding.title, Finding.description, Finding.control_reference,
+        Finding.severity, Finding.status, Finding.recommendation
+    ).filter(Finding.audit_id == audit.id).order_by(Finding.id).all()
+    assert count == len(findings)
+    db.rollback()
+    return elapsed_ms, findings
+
+def main():
+    parser = benchmark_arg_parser(__doc__)
+    parser.add_argument("--items", type=int, default=1000, help="Controls in the template")
+    args = parser.parse_args()
+
+    db = get_benchmark_session(args.database_url)
+    rows = []
+    try:
+        print(f"Seeding a template with {args.items} items...")
+        _, project, _, _ = seed_project(db, "template-instantiation")
+        project_id = project.id
+        template_id = seed_template(db, args.items)
+
+        for lang in ("tr", "en"):
+            results = {}
+            for label, variant in (("ORM loop (previous)", orm_loop), ("INSERT ... SELECT", insert_select)):
+                run(db, project_id, template_id, lang, variant)  # warm-up
+                samples = []
+                for _ in range(args.repeat):
+                    elapsed_ms, findings = run(db, project_id, template_id, lang, variant)
+                    samples.append(elapsed_ms)
+                results[label] = findings
+                rows.append([args.items, lang, label, f"{statistics.median(samples):.1f}"])
+                print(f"   {lang} {label}: {rows[-1][3]} ms")
+            if len(set(tuple(map(tuple, findings)) for findings in results.values())) != 1:
+                print(f"❌ Variants created different findings ({lang})")
+                sys.exit(1)
+
+        print()
+        print_table(["items", "lang", "variant", "median ms"], rows)
+        print("✅ Both variants created identical findings")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Maintenance command for the finding_stats rollup table
+
+Usage:
+    python scripts/finding_stats.py rebuild   # recompute the rollup from findings
+    python scripts/finding_stats.py check     # report rollup rows that disagree with findings
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.core.finding_stats import rebuild_finding_stats, check_finding_stats
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        print("🔄 finding_stats yeniden oluşturuluyor...")
+        rows = rebuild_finding_stats(db)
+        db.commit()
+        print(f"✅ {rows} rollup satırı yazıldı")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Hata: {e}")
+        raise
+    finally:
+        db.close()
+
+def check() -> bool:
+    db = SessionLocal()
+    try:
+        print("🔍 finding_stats tutarlılık kontrolü...")
+        mismatches = check_finding_stats(db)
+        if not mismatches:
+            print("✅ Rollup findings tablosu ile tutarlı")
+            return True
+        print(f"⚠️  {len(mismatches)} tutarsız satır:")
+        for m in mismatches:
+            print(
+                f"   project={m['project_id']} day={m['day']} severity={m['severity']} "
+                f"status={m['status']} expected={m['expected']} actual={m['actual']}"
+            )
+        print("   Düzeltmek için: python scripts/finding_stats.py rebuild")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="finding_stats rollup maintenance")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        rebuild()
+    else:
+        sys.exit(0 if check() else 1)
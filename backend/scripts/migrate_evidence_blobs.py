@@ -0,0 +1,117 @@
+"""
+Move existing evidence files into the content-addressed blob store
+
+Every evidence file that is not yet a blob (uuid-named files in UPLOAD_DIR)
+is hashed, linked or copied to blobs/<ab>/<cd>/<sha256>, and its Evidence rows
+are repointed and counted in evidence_blobs. Identical files collapse into one
+blob; the script reports how many bytes that reclaimed.
+
+Safe to re-run: already migrated rows are skipped, and the old file is only
+removed after the database change is committed.
+
+Usage:
+    python scripts/migrate_evidence_blobs.py --dry-run   # hash and report only
+    python scripts/migrate_evidence_blobs.py
+"""
+import sys
+import os
+import argparse
+import hashlib
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+from app.db.database import SessionLocal, engine
+from app.models.finding import Evidence
+from app.models.evidence_blob import EvidenceBlob
+from app.core.evidence_storage import (
+    UPLOAD_CHUNK_SIZE, absolute_path, add_blob_references, blob_path, get_temp_dir
+)
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def ensure_blob(source: str, sha256: str) -> bool:
+    """Make sure the blob file exists, leaving `source` in place. Returns True if it was created."""
+    target = absolute_path(blob_path(sha256))
+    if os.path.exists(target):
+        return False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_path = os.path.join(get_temp_dir(), f"{sha256}.migrate")
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source, temp_path)  # same filesystem: no copy
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, target)
+    return True
+
+def format_bytes(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB ({size} bytes)"
+
+def migrate(dry_run: bool):
+    EvidenceBlob.__table__.create(engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        # Legacy files: evidence paths that are not blob paths
+        legacy_paths = db.execute(
+            select(Evidence.file_path).outerjoin(
+                EvidenceBlob, EvidenceBlob.file_path == Evidence.file_path
+            ).where(EvidenceBlob.sha256.is_(None)).distinct()
+        ).scalars().all()
+        print(f"🔄 {len(legacy_paths)} eski evidence dosyası bulundu{' (dry-run)' if dry_run else ''}")
+
+        seen = {}  # sha256 -> size, blobs already present or created in this run
+        for sha256, size in db.execute(select(EvidenceBlob.sha256, EvidenceBlob.file_size)).all():
+            seen[sha256] = size
+
+        migrated = missing = 0
+        reclaimed = 0
+        for file_path in legacy_paths:
+            source = absolute_path(file_path)
+            if not os.path.exists(source):
+                missing += 1
+                print(f"   ⚠️  Dosya bulunamadı: {file_path}")
+                continue
+
+            sha256 = hash_file(source)
+            size = os.path.getsize(source)
+            duplicate = sha256 in seen
+            if duplicate:
+                reclaimed += size
+            seen[sha256] = size
+            migrated += 1
+            if dry_run:
+                continue
+
+            ensure_blob(source, sha256)
+            result = db.execute(
+                update(Evidence).where(Evidence.file_path == file_path).values(
+                    file_path=blob_path(sha256), sha256=sha256
+                )
+            )
+            add_blob_references(db, sha256, size, count=result.rowcount)
+            db.commit()
+            os.remove(source)
+
+        print(f"✅ {migrated} dosya {'taşınacak' if dry_run else 'taşındı'}, {missing} dosya eksik")
+        print(f"💾 Tekilleştirme ile kazanılan alan: {format_bytes(reclaimed)}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Hata: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move evidence files into the blob store")
+    parser.add_argument("--dry-run", action="store_true", help="Only hash files and report the reclaimable space")
+    args = parser.parse_args()
+    migrate(args.dry_run)
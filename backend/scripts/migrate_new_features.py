@@ -5,6 +5,14 @@ Migration script for new features:
 - FindingComment table
 - ActivityLog table
 - Notification table
+- FindingStat rollup table (finding_stats)
+- Composite indexes for keyset pagination
+- Access check index on project_user_assignments
+- Evidence: sha256
+- EvidenceBlob table (content-addressed evidence files)
+- Index on evidences.finding_id (set-based audit/project deletion)
+- FileDeletion table (file reaper queue)
+- Unique partial index for due-date notifications
 
 This script adds the new columns and tables to the database.
 """
@@ -16,11 +24,14 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 from app.db.database import engine, Base
 from app.models import (
     User, Organization, Project, Audit, Template, TemplateItem,
-    Finding, Evidence, FindingComment, ActivityLog, Notification
+    Finding, Evidence, FindingComment, FindingStat, EvidenceBlob, FileDeletion, ActivityLog, Notification
 )
+from app.models.project import ProjectUser
+from app.core.finding_stats import rebuild_finding_stats
 
 def migrate():
     """Run migration to add new features"""
@@ -188,6 +199,104 @@ def migrate():
             except Exception as e:
                 print(f"   ⚠️  İlişki hatası: {e}")
             
+            # 7. Create and populate finding_stats rollup table
+            print("\n7️⃣  finding_stats rollup tablosu oluşturuluyor...")
+            try:
+                FindingStat.__table__.create(conn, checkfirst=True)
+                # Tablo uygulama açılışında (create_all) oluşup kısmen dolmuş olabilir:
+                # her seferinde baştan hesapla. SHARE kilidi bulgu yazımlarını commit'e kadar bekletir.
+                conn.execute(text("LOCK TABLE findings IN SHARE MODE"))
+                rows = rebuild_finding_stats(Session(bind=conn))
+                print(f"   ✅ finding_stats yeniden hesaplandı ({rows} satır)")
+            except Exception as e:
+                print(f"   ⚠️  finding_stats hatası: {e}")
+            
+            # 8. Composite indexes backing keyset (cursor) pagination
+            print("\n8️⃣  Sayfalama index'leri oluşturuluyor...")
+            try:
+                for table in (ActivityLog.__table__, Notification.__table__, Finding.__table__, Audit.__table__):
+                    for index in table.indexes:
+                        if len(index.columns) > 1:
+                            index.create(conn, checkfirst=True)
+                print("   ✅ Sayfalama index'leri oluşturuldu")
+            except Exception as e:
+                print(f"   ⚠️  Index hatası: {e}")
+            
+            # 9. Index backing the per-request access check
+            print("\n9️⃣  Erişim index'i oluşturuluyor...")
+            try:
+                for index in ProjectUser.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+                print("   ✅ Erişim index'i oluşturuldu")
+            except Exception as e:
+                print(f"   ⚠️  Index hatası: {e}")
+            
+            # 10. Content hash of evidence files
+            print("\n🔟 Evidence tablosuna sha256 kolonu ekleniyor...")
+            try:
+                conn.execute(text("""
+                    ALTER TABLE evidences 
+                    ADD COLUMN IF NOT EXISTS sha256 VARCHAR(64);
+                """))
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_evidences_sha256 
+                    ON evidences(sha256);
+                """))
+                print("   ✅ sha256 kolonu eklendi")
+            except Exception as e:
+                print(f"   ⚠️  sha256 zaten var veya hata: {e}")
+            
+            # 11. Content-addressed evidence blobs
+            print("\n1️⃣1️⃣ EvidenceBlob tablosu oluşturuluyor...")
+            try:
+                EvidenceBlob.__table__.create(conn, checkfirst=True)
+                print("   ✅ EvidenceBlob tablosu oluşturuldu")
+                print("   ℹ️  Mevcut dosyaları taşımak için: python scripts/migrate_evidence_blobs.py")
+            except Exception as e:
+                print(f"   ⚠️  EvidenceBlob tablosu zaten var veya hata: {e}")
+            
+            # 12. Index for deleting evidences by finding (and the FK cascade check)
+            print("\n1️⃣2️⃣ Evidence finding_id index'i oluşturuluyor...")
+            try:
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_evidences_finding_id 
+                    ON evidences(finding_id);
+                """))
+                print("   ✅ ix_evidences_finding_id oluşturuldu")
+            except Exception as e:
+                print(f"   ⚠️  Index hatası: {e}")
+            
+            # 13. Queue of files to be removed by the file reaper
+            print("\n1️⃣3️⃣ FileDeletion tablosu oluşturuluyor...")
+            try:
+                FileDeletion.__table__.create(conn, checkfirst=True)
+                print("   ✅ FileDeletion tablosu oluşturuldu")
+                print("   ℹ️  Yetim dosyaları görmek için: GET /api/v1/system/storage/reconcile")
+            except Exception as e:
+                print(f"   ⚠️  FileDeletion tablosu zaten var veya hata: {e}")
+            
+            # 14. One due-date reminder per user/finding (the scheduled scan inserts with NOT EXISTS)
+            print("\n1️⃣4️⃣ Son tarih bildirimleri için unique index oluşturuluyor...")
+            try:
+                result = conn.execute(text("""
+                    DELETE FROM notifications n
+                    USING notifications older
+                    WHERE n.type IN ('FINDING_DUE_SOON', 'FINDING_OVERDUE')
+                      AND older.type = n.type
+                      AND older.user_id = n.user_id
+                      AND older.related_entity_type IS NOT DISTINCT FROM n.related_entity_type
+                      AND older.related_entity_id IS NOT DISTINCT FROM n.related_entity_id
+                      AND older.id < n.id;
+                """))
+                if result.rowcount:
+                    print(f"   ℹ️  {result.rowcount} tekrarlanan bildirim silindi")
+                for index in Notification.__table__.indexes:
+                    if index.name == "uq_notifications_due_date":
+                        index.create(conn, checkfirst=True)
+                print("   ✅ uq_notifications_due_date oluşturuldu")
+            except Exception as e:
+                print(f"   ⚠️  Index hatası: {e}")
+            
             trans.commit()
             print("\n✅ Migration başarıyla tamamlandı!")
             
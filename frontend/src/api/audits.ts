@@ -39,6 +39,36 @@ export interface AuditUpdate {
   status?: AuditStatus
 }
 
+export interface ReportJob {
+  id: string
+  audit_id: number
+  language: string
+  status: 'queued' | 'running' | 'completed' | 'failed'
+  progress: number
+  stage?: string
+  cached: boolean
+  error?: string
+  created_at: string
+  finished_at?: string
+}
+
+const REPORT_POLL_INTERVAL_MS = 1000
+
+// Enqueue the report build, poll until it is done, then download the .docx
+const buildWordReport = async (id: number, onProgress?: (job: ReportJob) => void) => {
+  let { data: job } = await apiClient.post<ReportJob>(`/reports/audit/${id}/word/jobs`)
+  while (job.status === 'queued' || job.status === 'running') {
+    onProgress?.(job)
+    await new Promise((resolve) => setTimeout(resolve, REPORT_POLL_INTERVAL_MS))
+    job = (await apiClient.get<ReportJob>(`/reports/jobs/${job.id}`)).data
+  }
+  onProgress?.(job)
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Report generation failed')
+  }
+  return apiClient.get(`/reports/jobs/${job.id}/download`, { responseType: 'blob' })
+}
+
 export const auditsApi = {
   getAll: (projectId?: number) => {
     const params = projectId ? `?project_id=${projectId}` : ''
@@ -48,8 +78,16 @@ export const auditsApi = {
   create: (data: AuditCreate) => apiClient.post<Audit>('/audits', data),
   update: (id: number, data: AuditUpdate) => apiClient.put<Audit>(`/audits/${id}`, data),
   delete: (id: number) => apiClient.delete(`/audits/${id}`),
-  copy: (id: number, newName: string) => apiClient.post<Audit>(`/audits/${id}/copy?new_name=${encodeURIComponent(newName)}`),
-  generateWord: (id: number) => apiClient.get(`/reports/audit/${id}/word`, { responseType: 'blob' }),
-  downloadWordReport: (id: number) => apiClient.get(`/reports/audit/${id}/word`, { responseType: 'blob' }),
+  copy: (id: number, newName: string, options: { includeEvidences?: boolean; includeComments?: boolean } = {}) =>
+    apiClient.post<Audit>(`/audits/${id}/copy`, null, {
+      params: {
+        new_name: newName,
+        include_evidences: options.includeEvidences || false,
+        include_comments: options.includeComments || false,
+      },
+    }),
+  generateWord: (id: number, onProgress?: (job: ReportJob) => void) => buildWordReport(id, onProgress),
+  downloadWordReport: (id: number, onProgress?: (job: ReportJob) => void) => buildWordReport(id, onProgress),
+  getReportJob: (jobId: string) => apiClient.get<ReportJob>(`/reports/jobs/${jobId}`),
 }
 
@@ -15,6 +15,7 @@ export interface Evidence {
   file_path: string
   file_name: string
   file_size?: number
+  sha256?: string
   description?: string
   created_at: string
 }
@@ -74,10 +75,12 @@ export interface FindingCommentCreate {
 }
 
 export const findingsApi = {
-  getAll: (auditId?: number, assignedToUserId?: number) => {
+  // include: comma-separated relationships to embed ('comments,evidences' by default, '' for none)
+  getAll: (auditId?: number, assignedToUserId?: number, include?: string) => {
     const params = new URLSearchParams()
     if (auditId) params.append('audit_id', auditId.toString())
     if (assignedToUserId) params.append('assigned_to_user_id', assignedToUserId.toString())
+    if (include !== undefined) params.append('include', include)
     const queryString = params.toString()
     return apiClient.get<Finding[]>(`/findings${queryString ? `?${queryString}` : ''}`)
   },
@@ -98,6 +101,8 @@ export const findingsApi = {
     })
   },
   deleteEvidence: (evidenceId: number) => apiClient.delete(`/findings/evidences/${evidenceId}`),
+  getEvidenceThumbnail: (evidenceId: number) =>
+    apiClient.get<Blob>(`/findings/evidences/${evidenceId}/thumbnail`, { responseType: 'blob' }),
   // Comments
   getComments: (findingId: number) => apiClient.get<FindingComment[]>(`/findings/${findingId}/comments`),
   createComment: (findingId: number, data: FindingCommentCreate) => 
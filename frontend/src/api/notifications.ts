@@ -14,6 +14,14 @@ export interface Notification {
   created_at: string
 }
 
+export interface NotificationStreamHandlers {
+  onNotification?: (notification: Notification) => void
+  onUnreadCount?: (count: number) => void
+}
+
+// Delay before reopening a failed/closed stream (with a fresh ticket)
+const STREAM_RECONNECT_MS = 5000
+
 export const notificationsApi = {
   getAll: (read?: boolean, skip?: number, limit?: number) => {
     const params = new URLSearchParams()
@@ -28,6 +36,63 @@ export const notificationsApi = {
     apiClient.put<Notification>(`/notifications/${notificationId}/read`),
   markAllAsRead: () => apiClient.put<{ updated: number }>('/notifications/read-all'),
   delete: (notificationId: number) => apiClient.delete(`/notifications/${notificationId}`),
+  // Server-Sent Events: new notifications and unread count changes are pushed (no polling).
+  // The stream URL carries a short-lived ticket instead of the access token; when the stream
+  // drops it is reopened with a new ticket and resumes after the last notification received,
+  // unless the ticket is refused (4xx, e.g. the user was deactivated).
+  // Returns a function that closes the stream.
+  subscribe: (handlers: NotificationStreamHandlers) => {
+    if (typeof EventSource === 'undefined') return () => {}
+    let source: EventSource | null = null
+    let retryTimer: ReturnType<typeof setTimeout> | undefined
+    let lastEventId: string | undefined
+    let closed = false
+
+    const reconnect = () => {
+      source?.close()
+      source = null
+      if (!closed) retryTimer = setTimeout(open, STREAM_RECONNECT_MS)
+    }
+
+    const open = async () => {
+      let ticket: string
+      try {
+        ticket = (await apiClient.post<{ ticket: string }>('/notifications/stream/ticket')).data.ticket
+      } catch (error: any) {
+        // 4xx (inactive/deleted user, logged out): retrying cannot succeed, stay closed.
+        // Only network errors and 5xx are retried.
+        const status = error.response?.status
+        if (status !== undefined && status < 500) {
+          closed = true
+          return
+        }
+        reconnect()
+        return
+      }
+      if (closed) return
+      const params = new URLSearchParams({ ticket })
+      if (lastEventId) params.append('last_event_id', lastEventId)
+      const stream = new EventSource(`${apiClient.defaults.baseURL}/notifications/stream?${params}`)
+      stream.addEventListener('notification', (event) => {
+        const message = event as MessageEvent
+        lastEventId = message.lastEventId || lastEventId
+        handlers.onNotification?.(JSON.parse(message.data) as Notification)
+      })
+      stream.addEventListener('unread_count', (event) => {
+        handlers.onUnreadCount?.(JSON.parse((event as MessageEvent).data).count)
+      })
+      // The ticket in the URL expires, so the browser's own retry cannot be relied on
+      stream.onerror = reconnect
+      source = stream
+    }
+
+    open()
+    return () => {
+      closed = true
+      clearTimeout(retryTimer)
+      source?.close()
+    }
+  },
 }
 
 
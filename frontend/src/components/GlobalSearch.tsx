@@ -54,7 +54,7 @@ export default function GlobalSearch() {
         try {
             const [auditsRes, findingsRes, orgsRes, projectsRes] = await Promise.all([
                 auditsApi.getAll(),
-                findingsApi.getAll(),
+                findingsApi.getAll(undefined, undefined, ''),
                 organizationsApi.getAll(),
                 projectsApi.getAll()
             ])
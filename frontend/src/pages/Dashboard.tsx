@@ -73,14 +73,10 @@ export default function Dashboard() {
   useEffect(() => {
     loadCardPreferences()
     loadDashboardData()
-    loadUnreadCount()
 
-    // Refresh unread count every 30 seconds
-    const interval = setInterval(() => {
-      loadUnreadCount()
-    }, 30000)
-
-    return () => clearInterval(interval)
+    // Unread count is pushed by the server (sent on connect and whenever it changes)
+    if (!currentUser) return
+    return notificationsApi.subscribe({ onUnreadCount: setUnreadCount })
   }, [])
 
   const loadCardPreferences = () => {
@@ -153,7 +149,7 @@ export default function Dashboard() {
       // Use analytics API for better performance
       const [analyticsRes, findingsRes, auditsRes, templatesRes] = await Promise.all([
         analyticsApi.getDashboardStats(),
-        findingsApi.getAll(),
+        findingsApi.getAll(undefined, undefined, ''),
         auditsApi.getAll(),
         templatesApi.getAll(),
       ])
@@ -209,7 +205,7 @@ export default function Dashboard() {
         const [projectsRes, auditsRes, findingsRes, templatesRes] = await Promise.all([
           projectsApi.getAll(),
           auditsApi.getAll(),
-          findingsApi.getAll(),
+          findingsApi.getAll(undefined, undefined, ''),
           templatesApi.getAll(),
         ])
 
@@ -280,17 +276,6 @@ export default function Dashboard() {
     }
   }
 
-  const loadUnreadCount = async () => {
-    if (!currentUser) return
-
-    try {
-      const response = await notificationsApi.getUnreadCount()
-      setUnreadCount(response.data.count || 0)
-    } catch (error) {
-      console.error('Error loading unread count:', error)
-    }
-  }
-
   const severityColors = {
     critical: 'bg-error-100 text-error-800 border border-error-200',
     high: 'bg-warning-100 text-warning-800 border border-warning-200',
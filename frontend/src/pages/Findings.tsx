@@ -11,6 +11,32 @@ import { Plus, Edit, Trash2, AlertCircle, Upload, X, Image as ImageIcon, File, D
 import { useConfirmDialog } from '../store/confirmDialogStore'
 import { CardSkeleton } from '../components/ui/Skeleton'
 
+// Small preview from the thumbnail rendition; falls back to the icon when there is none
+function EvidenceThumbnail({ evidenceId }: { evidenceId: number }) {
+  const [url, setUrl] = useState<string | null>(null)
+
+  useEffect(() => {
+    let objectUrl: string | null = null
+    let cancelled = false
+    findingsApi.getEvidenceThumbnail(evidenceId)
+      .then((response) => {
+        if (cancelled) return
+        objectUrl = window.URL.createObjectURL(response.data)
+        setUrl(objectUrl)
+      })
+      .catch(() => setUrl(null))
+    return () => {
+      cancelled = true
+      if (objectUrl) window.URL.revokeObjectURL(objectUrl)
+    }
+  }, [evidenceId])
+
+  if (!url) {
+    return <ImageIcon className="h-4 w-4 text-info-600 dark:text-info-400" />
+  }
+  return <img src={url} alt="" className="h-10 w-10 rounded object-cover" />
+}
+
 export default function Findings() {
   const { t } = useTranslation()
   const { user: currentUser } = useAuthStore()
@@ -642,7 +668,7 @@ export default function Findings() {
                               <div key={evidence.id} className="flex items-center justify-between rounded border border-neutral-200 dark:border-neutral-700 bg-neutral-50 dark:bg-neutral-800 p-2">
                                 <div className="flex items-center space-x-2">
                                   {evidence.file_name.match(/\.(jpg|jpeg|png|gif|webp)$/i) ? (
-                                    <ImageIcon className="h-4 w-4 text-info-600 dark:text-info-400" />
+                                    <EvidenceThumbnail evidenceId={evidence.id} />
                                   ) : (
                                     <File className="h-4 w-4 text-neutral-600 dark:text-neutral-400" />
                                   )}
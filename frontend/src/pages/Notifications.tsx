@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useTranslation } from 'react-i18next'
 import { useNavigate } from 'react-router-dom'
 import { notificationsApi, Notification } from '../api/notifications'
@@ -11,12 +11,26 @@ export default function Notifications() {
   const [loading, setLoading] = useState(true)
   const [filter, setFilter] = useState<'all' | 'unread' | 'read'>('all')
   const [unreadCount, setUnreadCount] = useState(0)
+  const filterRef = useRef(filter)
 
   useEffect(() => {
+    filterRef.current = filter
     loadNotifications()
-    loadUnreadCount()
   }, [filter])
 
+  // New notifications and the unread count are pushed by the server
+  useEffect(() => {
+    return notificationsApi.subscribe({
+      onUnreadCount: setUnreadCount,
+      onNotification: (notification) => {
+        if (filterRef.current === 'read') return
+        setNotifications((current) =>
+          current.some((n) => n.id === notification.id) ? current : [notification, ...current]
+        )
+      },
+    })
+  }, [])
+
   const loadNotifications = async () => {
     try {
       setLoading(true)
@@ -30,20 +44,10 @@ export default function Notifications() {
     }
   }
 
-  const loadUnreadCount = async () => {
-    try {
-      const response = await notificationsApi.getUnreadCount()
-      setUnreadCount(response.data.count)
-    } catch (error) {
-      console.error('Error loading unread count:', error)
-    }
-  }
-
   const handleMarkAsRead = async (notificationId: number) => {
     try {
       await notificationsApi.markAsRead(notificationId)
       await loadNotifications()
-      await loadUnreadCount()
     } catch (error) {
       console.error('Error marking notification as read:', error)
     }
@@ -53,7 +57,6 @@ export default function Notifications() {
     try {
       await notificationsApi.markAllAsRead()
       await loadNotifications()
-      await loadUnreadCount()
     } catch (error) {
       console.error('Error marking all as read:', error)
     }
@@ -65,7 +68,6 @@ export default function Notifications() {
     try {
       await notificationsApi.delete(notificationId)
       await loadNotifications()
-      await loadUnreadCount()
     } catch (error) {
       console.error('Error deleting notification:', error)
       alert(t('notifications.deleteError'))